@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -318,6 +319,10 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# OCR worker processes per document (0 = one per CPU core); OCR is serial inside Celery prefork workers
+OCR_MAX_WORKERS = config('OCR_MAX_WORKERS', default=0, cast=int)
+OCR_CACHE_TTL = config('OCR_CACHE_TTL', default=86400, cast=int)  # Seconds to reuse OCR results per file hash
+
 # CERES specific settings
 CERES_SETTINGS = {
     'RISK_SCORE_THRESHOLDS': {
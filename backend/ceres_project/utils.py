@@ -1,10 +1,22 @@
 """
 Utility functions for CERES project
 """
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def success_response(data=None, message="Success", status_code=status.HTTP_200_OK, meta=None):
     """
     Standard success response format
@@ -29,11 +41,75 @@ def error_response(message="Error", errors=None, status_code=status.HTTP_400_BAD
     }
     return Response(response_data, status=status_code)
 
-def paginated_response(queryset, serializer_class, request, message="Success"):
+class CachedCountPaginator(Paginator):
+    """
+    Django paginator that caches the COUNT(*) of the object list
+    """
+    
+    def __init__(self, object_list, per_page, cache_key=None, timeout=60, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+    
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, self.timeout)
+        return count
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page number pagination whose total count is cached per user and filter set.
+    
+    Counts are versioned by `count_cache_prefix`; call
+    `invalidate_cached_counts(prefix)` when the underlying rows change.
+    """
+    count_cache_prefix = None
+    count_cache_timeout = 60  # 1 minute
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_cache_key = self.get_count_cache_key(request)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def django_paginator_class(self, object_list, per_page):
+        return CachedCountPaginator(
+            object_list, per_page,
+            cache_key=self.count_cache_key, timeout=self.count_cache_timeout,
+        )
+    
+    def get_count_cache_key(self, request):
+        if not self.count_cache_prefix:
+            return None
+        version_key = f"{self.count_cache_prefix}_count_version"
+        version = cache.get(version_key)
+        if version is None:
+            version = time.time_ns()
+            cache.set(version_key, version, None)
+        filters = sorted(
+            (key, values) for key, values in request.query_params.lists()
+            if key not in (self.page_query_param, self.page_size_query_param)
+        )
+        digest = hashlib.md5(repr((request.user.pk, filters)).encode()).hexdigest()
+        return f"{self.count_cache_prefix}_count_{version}_{digest}"
+
+
+def invalidate_cached_counts(prefix):
+    """
+    Invalidate every cached count stored under a CachedCountPagination prefix
+    """
+    cache.set(f"{prefix}_count_version", time.time_ns(), None)
+
+def paginated_response(queryset, serializer_class, request, message="Success",
+                       paginator_class=PageNumberPagination):
     """
     Standard paginated response format
     """
-    paginator = PageNumberPagination()
+    paginator = paginator_class()
     paginator.page_size = 20
     paginated_queryset = paginator.paginate_queryset(queryset, request)
     serializer = serializer_class(paginated_queryset, many=True, context={'request': request})
@@ -44,6 +120,36 @@ def paginated_response(queryset, serializer_class, request, message="Success"):
         "data": serializer.data
     })
 
+class ORJSONEncoder(json.JSONEncoder):
+    """
+    JSON encoder that serializes with orjson when installed
+    
+    Usable as a JSONField encoder; values orjson rejects fall back to the
+    standard library encoder.
+    """
+    
+    def encode(self, o):
+        if orjson is not None:
+            try:
+                return orjson.dumps(o).decode()
+            except TypeError:
+                pass
+        return super().encode(o)
+
+
+class ORJSONDecoder(json.JSONDecoder):
+    """
+    JSON decoder that parses with orjson when installed
+    """
+    
+    def decode(self, s, *args, **kwargs):
+        if orjson is not None:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+        return super().decode(s, *args, **kwargs)
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler for DRF
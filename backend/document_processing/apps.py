@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DocumentProcessingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'document_processing'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -2,17 +2,235 @@
 Forensic Analysis Service for document authenticity verification
 """
 import logging
+import re
 import time
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
 import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+    from PIL.ExifTags import TAGS
+    HAS_IMG = np is not None
+except ImportError:
+    HAS_IMG = False
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+HAS_PDF = pikepdf is not None or PyPDF2 is not None
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = np is not None
+except ImportError:
+    HAS_NUMBA = False
 
 logger = logging.getLogger('ceres')
 
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _block_variance_kernel(channel, block_rows, block_cols, size):
+        """Per-block variance of a 2D array, parallel over block rows"""
+        variances = np.empty(block_rows * block_cols, dtype=np.float32)
+        n = size * size
+        for by in prange(block_rows):
+            for bx in range(block_cols):
+                s = 0
+                sq = 0
+                for y in range(by * size, by * size + size):
+                    for x in range(bx * size, bx * size + size):
+                        value = np.int64(channel[y, x])
+                        s += value
+                        sq += value * value
+                variances[by * block_cols + bx] = (n * sq - s * s) / (n * n)
+        return variances
+
+
+def _block_variances(channel, block_rows: int, block_cols: int, size: int = 8):
+    """
+    Variance of each size x size block of a 2D uint8 array
+    
+    Uses the Numba kernel when available, otherwise integer sums over a
+    reshaped NumPy view.
+    """
+    if HAS_NUMBA:
+        return _block_variance_kernel(channel, block_rows, block_cols, size)
+    
+    blocks = channel[:block_rows * size, :block_cols * size].reshape(
+        block_rows, size, block_cols, size
+    )
+    block_sum = blocks.sum(axis=(1, 3), dtype=np.uint32)
+    block_sq_sum = (blocks.astype(np.uint16) ** 2).sum(axis=(1, 3), dtype=np.uint32)
+    
+    # var = (n * sum(x^2) - sum(x)^2) / n^2, exact in integer arithmetic
+    n = size * size
+    return (
+        n * block_sq_sum.astype(np.int64) - block_sum.astype(np.int64) ** 2
+    ).astype(np.float32) / (n * n)
+
+
+# IJG standard luminance quantization table (quality 50), zigzag order does not
+# matter since only the table sum is compared
+_IJG_LUMINANCE_TABLE_SUM = sum((
+    16, 11, 10, 16, 24, 40, 51, 61,
+    12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56,
+    14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77,
+    24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101,
+    72, 92, 95, 98, 112, 100, 103, 99,
+))
+
+# Start-of-frame markers carrying image dimensions (excludes DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _read_jpeg_header(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read dimensions and quantization tables from JPEG marker segments
+    
+    Walks the segments up to the start of scan without touching the
+    entropy-coded data. Returns None if the file is not a parseable JPEG.
+    """
+    quant_tables = {}
+    width = height = components = None
+    
+    with open(file_path, 'rb') as file:
+        if file.read(2) != b'\xff\xd8':
+            return None
+        
+        while True:
+            marker = file.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            
+            code = marker[1]
+            while code == 0xFF:  # Fill bytes before a marker
+                fill = file.read(1)
+                if not fill:
+                    return None
+                code = fill[0]
+            
+            if code == 0x01 or 0xD0 <= code <= 0xD7:  # Standalone markers
+                continue
+            if code in (0xD9, 0xDA):  # End of image / start of scan
+                break
+            
+            length_bytes = file.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack('>H', length_bytes)[0]
+            segment = file.read(length - 2)
+            if len(segment) < length - 2:
+                return None
+            
+            if code == 0xDB:  # DQT, possibly several tables per segment
+                offset = 0
+                while offset < len(segment):
+                    precision, table_id = segment[offset] >> 4, segment[offset] & 0x0F
+                    offset += 1
+                    if precision:
+                        quant_tables[table_id] = struct.unpack('>64H', segment[offset:offset + 128])
+                        offset += 128
+                    else:
+                        quant_tables[table_id] = tuple(segment[offset:offset + 64])
+                        offset += 64
+            elif code in _JPEG_SOF_MARKERS:
+                _, height, width, components = struct.unpack('>BHHB', segment[:6])
+    
+    if not quant_tables or not width or not height:
+        return None
+    
+    return {
+        'width': width,
+        'height': height,
+        'components': components,
+        'quant_tables': quant_tables,
+    }
+
+
+def _estimate_jpeg_quality(quant_tables: Dict[int, tuple]) -> float:
+    """Estimate the IJG quality setting (1-100) from the luminance table"""
+    table = quant_tables.get(0) or next(iter(quant_tables.values()))
+    scale = sum(table) * 100 / _IJG_LUMINANCE_TABLE_SUM
+    
+    if scale <= 100:
+        quality = (200 - scale) / 2
+    else:
+        quality = 5000 / scale
+    
+    return round(min(100.0, max(1.0, quality)), 1)
+
+
+def _contiguous_tiles(array, tile_rows: int, tile_cols: int, size: int):
+    """
+    Reblock the top-left grid of size x size tiles into one contiguous row
+    per tile, viewed as opaque byte strings so tiles compare exactly
+    """
+    channels = array.shape[2] if array.ndim == 3 else 1
+    tiles = np.ascontiguousarray(
+        array[:tile_rows * size, :tile_cols * size]
+        .reshape(tile_rows, size, tile_cols, size, channels)
+        .transpose(0, 2, 1, 3, 4)
+    ).reshape(tile_rows * tile_cols, -1)
+    return tiles.view(np.dtype((np.void, tiles.shape[1] * tiles.itemsize))).ravel()
+
+
+@dataclass
+class AnalysisScores:
+    """Per-analyzer scores of a forensic run; None marks analyzers that did not run"""
+    metadata: Optional[float] = None
+    compression: Optional[float] = None
+    pixel: Optional[float] = None
+    pdf_metadata: Optional[float] = None
+    pdf_structure: Optional[float] = None
+    file_properties: Optional[float] = None
+    
+    def completed(self) -> list:
+        """Scores of the analyzers that ran"""
+        values = (
+            self.metadata, self.compression, self.pixel,
+            self.pdf_metadata, self.pdf_structure, self.file_properties,
+        )
+        return [v for v in values if v is not None]
+
+
 class ForensicAnalysisService:
     """
     Service for analyzing document authenticity and detecting forgeries
     """
     
+    # Keyword scans compiled once into single alternations, one pass per field
+    EDITING_SOFTWARE = ['photoshop', 'gimp', 'paint.net', 'canva', 'pixlr']
+    EDITING_SOFTWARE_PATTERN = re.compile('|'.join(map(re.escape, EDITING_SOFTWARE)))
+    
+    SUSPICIOUS_CREATORS = ['fake', 'forge', 'generator', 'template']
+    SUSPICIOUS_CREATORS_PATTERN = re.compile('|'.join(map(re.escape, SUSPICIOUS_CREATORS)))
+    
+    # Keys under which the analyzers report their indicator lists
+    INDICATOR_KEYS = (
+        'suspicious_indicators',
+        'compression_indicators',
+        'pattern_indicators',
+        'structure_indicators',
+        'property_indicators',
+    )
+    
     def __init__(self):
         self.analysis_methods = [
             'metadata_analysis',
@@ -35,32 +253,38 @@ class ForensicAnalysisService:
         start_time = time.time()
         
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
+            # Single stat shared by every analyzer; raises FileNotFoundError if missing
+            stat_result = os.stat(file_path)
             
             analysis_results = {}
             risk_indicators = []
-            authenticity_scores = []
+            scores = AnalysisScores()
             
             # Perform different types of analysis
             file_ext = os.path.splitext(file_path)[1].lower()
             
             if file_ext in ['.jpg', '.jpeg', '.png']:
                 # Image-specific analysis
-                analysis_results.update(self._analyze_image_metadata(file_path))
-                analysis_results.update(self._analyze_image_compression(file_path))
-                analysis_results.update(self._analyze_pixel_patterns(file_path))
+                details, scores.metadata = self._analyze_image_metadata(file_path)
+                analysis_results.update(details)
+                details, scores.compression = self._analyze_image_compression(file_path, stat_result)
+                analysis_results.update(details)
+                details, scores.pixel = self._analyze_pixel_patterns(file_path)
+                analysis_results.update(details)
                 
             elif file_ext == '.pdf':
                 # PDF-specific analysis
-                analysis_results.update(self._analyze_pdf_metadata(file_path))
-                analysis_results.update(self._analyze_pdf_structure(file_path))
+                details, scores.pdf_metadata = self._analyze_pdf_metadata(file_path)
+                analysis_results.update(details)
+                details, scores.pdf_structure = self._analyze_pdf_structure(file_path)
+                analysis_results.update(details)
             
             # Common analysis for all file types
-            analysis_results.update(self._analyze_file_properties(file_path))
+            details, scores.file_properties = self._analyze_file_properties(file_path, stat_result)
+            analysis_results.update(details)
             
             # Calculate overall authenticity score
-            authenticity_score = self._calculate_authenticity_score(analysis_results)
+            authenticity_score = self._calculate_authenticity_score(scores)
             
             # Identify risk indicators
             risk_indicators = self._identify_risk_indicators(analysis_results)
@@ -84,12 +308,12 @@ class ForensicAnalysisService:
                 'analysis_time': time.time() - start_time
             }
     
-    def _analyze_image_metadata(self, file_path: str) -> Dict[str, Any]:
+    def _analyze_image_metadata(self, file_path: str) -> Tuple[Dict[str, Any], float]:
         """Analyze image metadata for signs of manipulation"""
+        if not HAS_IMG:
+            return self._missing_dependencies('metadata_analysis', 'metadata_score')
+        
         try:
-            from PIL import Image
-            from PIL.ExifTags import TAGS
-            
             image = Image.open(file_path)
             metadata = {}
             
@@ -112,9 +336,8 @@ class ForensicAnalysisService:
             
             # Check for editing software indicators
             software_field = metadata.get('Software', '').lower()
-            editing_software = ['photoshop', 'gimp', 'paint.net', 'canva', 'pixlr']
             
-            if any(editor in software_field for editor in editing_software):
+            if self.EDITING_SOFTWARE_PATTERN.search(software_field):
                 suspicious_indicators.append('Image editing software detected')
             
             # Check for inconsistent timestamps
@@ -122,14 +345,16 @@ class ForensicAnalysisService:
                 if metadata['DateTime'] != metadata['DateTimeOriginal']:
                     suspicious_indicators.append('Inconsistent timestamp metadata')
             
+            metadata_score = max(0, 100 - len(suspicious_indicators) * 20)
+            
             return {
                 'metadata_analysis': {
                     'metadata_fields': len(metadata),
                     'suspicious_indicators': suspicious_indicators,
-                    'metadata_score': max(0, 100 - len(suspicious_indicators) * 20),
+                    'metadata_score': metadata_score,
                     'raw_metadata': metadata
                 }
-            }
+            }, metadata_score
             
         except Exception as e:
             logger.warning(f"Metadata analysis failed: {e}")
@@ -138,47 +363,32 @@ class ForensicAnalysisService:
                     'error': str(e),
                     'metadata_score': 50  # Neutral score when analysis fails
                 }
-            }
+            }, 50
     
-    def _analyze_image_compression(self, file_path: str) -> Dict[str, Any]:
+    def _analyze_image_compression(self, file_path: str, stat_result: os.stat_result) -> Tuple[Dict[str, Any], float]:
         """Analyze compression artifacts and quality"""
         try:
-            from PIL import Image
-            import numpy as np
-            
-            image = Image.open(file_path)
-            
-            # Convert to numpy array for analysis
-            img_array = np.array(image)
-            
             # Calculate compression quality indicators
             compression_indicators = []
+            estimated_quality = None
             
-            # Check for JPEG compression artifacts
+            jpeg_header = None
             if file_path.lower().endswith(('.jpg', '.jpeg')):
-                # Look for blocking artifacts (8x8 DCT blocks)
-                if len(img_array.shape) >= 2:
-                    # Simple blocking artifact detection
-                    height, width = img_array.shape[:2]
-                    
-                    # Check for regular patterns that might indicate compression
-                    block_variance = []
-                    for y in range(0, height - 8, 8):
-                        for x in range(0, width - 8, 8):
-                            if len(img_array.shape) == 3:
-                                block = img_array[y:y+8, x:x+8, 0]  # Use first channel
-                            else:
-                                block = img_array[y:y+8, x:x+8]
-                            block_variance.append(np.var(block))
-                    
-                    if block_variance:
-                        avg_variance = np.mean(block_variance)
-                        if avg_variance < 10:  # Very low variance might indicate heavy compression
-                            compression_indicators.append('Heavy compression artifacts detected')
+                jpeg_header = _read_jpeg_header(file_path)
+            
+            if jpeg_header:
+                # Quantization tables give the compression level without decoding pixels
+                pixel_count = jpeg_header['width'] * jpeg_header['height'] * jpeg_header['components']
+                estimated_quality = _estimate_jpeg_quality(jpeg_header['quant_tables'])
+                
+                if estimated_quality < 50:
+                    compression_indicators.append('Heavy compression artifacts detected')
+            else:
+                pixel_count = self._decode_and_check_blocks(file_path, compression_indicators)
             
             # Check for unusual compression patterns
-            file_size = os.path.getsize(file_path)
-            pixel_count = img_array.size
+            file_size = stat_result.st_size
+            compression_ratio = 0
             
             if pixel_count > 0:
                 compression_ratio = file_size / pixel_count
@@ -195,9 +405,10 @@ class ForensicAnalysisService:
                     'compression_indicators': compression_indicators,
                     'compression_score': compression_score,
                     'file_size': file_size,
-                    'compression_ratio': compression_ratio if 'compression_ratio' in locals() else 0
+                    'compression_ratio': compression_ratio,
+                    'estimated_quality': estimated_quality
                 }
-            }
+            }, compression_score
             
         except Exception as e:
             logger.warning(f"Compression analysis failed: {e}")
@@ -206,14 +417,55 @@ class ForensicAnalysisService:
                     'error': str(e),
                     'compression_score': 50
                 }
-            }
+            }, 50
     
-    def _analyze_pixel_patterns(self, file_path: str) -> Dict[str, Any]:
+    def _decode_and_check_blocks(self, file_path: str, compression_indicators: list) -> int:
+        """
+        Pixel-level fallback when JPEG headers cannot be parsed
+        
+        PNGs only need their header for the pixel count; JPEGs are decoded
+        and checked for 8x8 blocking artifacts. Returns the sample count.
+        """
+        if not HAS_IMG:
+            raise ImportError("Pillow and NumPy are required for pixel-level compression analysis")
+        
+        image = Image.open(file_path)
+        
+        if not file_path.lower().endswith(('.jpg', '.jpeg')):
+            width, height = image.size
+            return width * height * len(image.getbands())
+        
+        # Convert to numpy array for analysis
+        img_array = np.array(image)
+        
+        # Look for blocking artifacts (8x8 DCT blocks)
+        if len(img_array.shape) >= 2:
+            # Simple blocking artifact detection
+            height, width = img_array.shape[:2]
+            
+            # Check for regular patterns that might indicate compression
+            block_rows = len(range(0, height - 8, 8))
+            block_cols = len(range(0, width - 8, 8))
+            
+            if block_rows and block_cols:
+                if len(img_array.shape) == 3:
+                    channel = img_array[:, :, 0]  # Use first channel
+                else:
+                    channel = img_array
+                
+                block_variance = _block_variances(channel, block_rows, block_cols)
+                avg_variance = float(block_variance.mean(dtype=np.float32))
+                if avg_variance < 10:  # Very low variance might indicate heavy compression
+                    compression_indicators.append('Heavy compression artifacts detected')
+        
+        return img_array.size
+    
+    def _analyze_pixel_patterns(self, file_path: str) -> Tuple[Dict[str, Any], float]:
         """Analyze pixel patterns for signs of manipulation"""
+        if not HAS_IMG:
+            return self._missing_dependencies('pixel_analysis', 'pattern_score')
+        
         try:
-            from PIL import Image
-            import numpy as np
-            
             image = Image.open(file_path)
             img_array = np.array(image)
             
@@ -226,24 +478,19 @@ class ForensicAnalysisService:
                 
                 # Sample small regions and look for exact duplicates
                 sample_size = min(32, height // 4, width // 4)
-                samples = []
                 
-                for y in range(0, height - sample_size, sample_size):
-                    for x in range(0, width - sample_size, sample_size):
-                        if len(img_array.shape) == 3:
-                            sample = img_array[y:y+sample_size, x:x+sample_size, :]
-                        else:
-                            sample = img_array[y:y+sample_size, x:x+sample_size]
-                        
-                        # Convert to hashable format for comparison
-                        sample_hash = hash(sample.tobytes())
-                        samples.append(sample_hash)
+                if sample_size:
+                    tile_rows = len(range(0, height - sample_size, sample_size))
+                    tile_cols = len(range(0, width - sample_size, sample_size))
+                else:
+                    tile_rows = tile_cols = 0  # Image too small to tile
                 
-                # Check for duplicate samples
-                unique_samples = len(set(samples))
-                total_samples = len(samples)
+                total_samples = tile_rows * tile_cols
                 
                 if total_samples > 0:
+                    samples = _contiguous_tiles(img_array, tile_rows, tile_cols, sample_size)
+                    unique_samples = len(np.unique(samples))
+                    
                     uniqueness_ratio = unique_samples / total_samples
                     if uniqueness_ratio < 0.8:  # Less than 80% unique samples
                         pattern_indicators.append('Potential cloning/duplication detected')
@@ -252,11 +499,11 @@ class ForensicAnalysisService:
             if len(img_array.shape) >= 2:
                 # Calculate local variance
                 if len(img_array.shape) == 3:
-                    gray = np.mean(img_array, axis=2)
+                    gray = img_array.mean(axis=2, dtype=np.float32)
                 else:
                     gray = img_array
                 
-                local_variance = np.var(gray)
+                local_variance = float(np.var(gray, dtype=np.float32))
                 
                 if local_variance < 100:  # Very low variance
                     pattern_indicators.append('Unnaturally uniform regions detected')
@@ -269,7 +516,7 @@ class ForensicAnalysisService:
                     'pattern_score': pattern_score,
                     'local_variance': local_variance if 'local_variance' in locals() else 0
                 }
-            }
+            }, pattern_score
             
         except Exception as e:
             logger.warning(f"Pixel pattern analysis failed: {e}")
@@ -278,50 +525,48 @@ class ForensicAnalysisService:
                     'error': str(e),
                     'pattern_score': 50
                 }
-            }
+            }, 50
     
-    def _analyze_pdf_metadata(self, file_path: str) -> Dict[str, Any]:
+    def _analyze_pdf_metadata(self, file_path: str) -> Tuple[Dict[str, Any], float]:
         """Analyze PDF metadata for authenticity indicators"""
+        if not HAS_PDF:
+            return self._missing_dependencies('pdf_metadata_analysis', 'metadata_score')
+        
         try:
-            import PyPDF2
+            metadata = self._read_pdf_metadata(file_path)
+            
+            suspicious_indicators = []
             
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                metadata = pdf_reader.metadata
+            if metadata:
+                # Check creation and modification dates
+                creation_date = metadata.get('/CreationDate')
+                mod_date = metadata.get('/ModDate')
                 
-                suspicious_indicators = []
+                if creation_date and mod_date:
+                    if creation_date != mod_date:
+                        suspicious_indicators.append('Document has been modified after creation')
                 
-                if metadata:
-                    # Check creation and modification dates
-                    creation_date = metadata.get('/CreationDate')
-                    mod_date = metadata.get('/ModDate')
-                    
-                    if creation_date and mod_date:
-                        if creation_date != mod_date:
-                            suspicious_indicators.append('Document has been modified after creation')
-                    
-                    # Check for suspicious creator/producer
-                    creator = str(metadata.get('/Creator', '')).lower()
-                    producer = str(metadata.get('/Producer', '')).lower()
-                    
-                    suspicious_creators = ['fake', 'forge', 'generator', 'template']
-                    if any(term in creator for term in suspicious_creators):
-                        suspicious_indicators.append('Suspicious creator software detected')
-                    
-                    if any(term in producer for term in suspicious_creators):
-                        suspicious_indicators.append('Suspicious producer software detected')
+                # Check for suspicious creator/producer
+                creator = str(metadata.get('/Creator', '')).lower()
+                producer = str(metadata.get('/Producer', '')).lower()
                 
-                metadata_score = max(0, 100 - len(suspicious_indicators) * 25)
+                if self.SUSPICIOUS_CREATORS_PATTERN.search(creator):
+                    suspicious_indicators.append('Suspicious creator software detected')
                 
-                return {
-                    'pdf_metadata_analysis': {
-                        'suspicious_indicators': suspicious_indicators,
-                        'metadata_score': metadata_score,
-                        'has_metadata': metadata is not None,
-                        'metadata_fields': len(metadata) if metadata else 0
-                    }
+                if self.SUSPICIOUS_CREATORS_PATTERN.search(producer):
+                    suspicious_indicators.append('Suspicious producer software detected')
+            
+            metadata_score = max(0, 100 - len(suspicious_indicators) * 25)
+            
+            return {
+                'pdf_metadata_analysis': {
+                    'suspicious_indicators': suspicious_indicators,
+                    'metadata_score': metadata_score,
+                    'has_metadata': metadata is not None,
+                    'metadata_fields': len(metadata) if metadata else 0
                 }
-                
+            }, metadata_score
+            
         except Exception as e:
             logger.warning(f"PDF metadata analysis failed: {e}")
             return {
@@ -329,48 +574,57 @@ class ForensicAnalysisService:
                     'error': str(e),
                     'metadata_score': 50
                 }
-            }
+            }, 50
+    
+    def _read_pdf_metadata(self, file_path: str):
+        """
+        Read the PDF document information dictionary
+        
+        pikepdf only resolves the trailer /Info entry, so it is preferred over
+        PyPDF2, which parses the whole cross-reference table up front.
+        """
+        if pikepdf is not None:
+            with pikepdf.open(file_path) as pdf:
+                info = pdf.trailer.get('/Info')
+                if info is None:
+                    return None
+                return {str(key): str(value) for key, value in info.items()}
+        
+        with open(file_path, 'rb') as file:
+            return PyPDF2.PdfReader(file).metadata
     
-    def _analyze_pdf_structure(self, file_path: str) -> Dict[str, Any]:
+    def _analyze_pdf_structure(self, file_path: str) -> Tuple[Dict[str, Any], float]:
         """Analyze PDF structure for signs of manipulation"""
+        if not HAS_PDF:
+            return self._missing_dependencies('pdf_structure_analysis', 'structure_score')
+        
         try:
-            import PyPDF2
+            num_pages, has_form_fields, has_annotations = self._read_pdf_structure(file_path)
             
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                structure_indicators = []
-                
-                # Check number of pages
-                num_pages = len(pdf_reader.pages)
-                if num_pages > 10:  # Unusually long for typical ID documents
-                    structure_indicators.append('Unusually high page count for document type')
-                
-                # Check for form fields (might indicate template usage)
-                if hasattr(pdf_reader, 'get_form_text_fields'):
-                    try:
-                        form_fields = pdf_reader.get_form_text_fields()
-                        if form_fields:
-                            structure_indicators.append('Form fields detected - possible template')
-                    except:
-                        pass
-                
-                # Check for annotations
-                for page in pdf_reader.pages:
-                    if '/Annots' in page:
-                        structure_indicators.append('Annotations detected - possible modifications')
-                        break
-                
-                structure_score = max(0, 100 - len(structure_indicators) * 20)
-                
-                return {
-                    'pdf_structure_analysis': {
-                        'structure_indicators': structure_indicators,
-                        'structure_score': structure_score,
-                        'page_count': num_pages
-                    }
+            structure_indicators = []
+            
+            # Check number of pages
+            if num_pages > 10:  # Unusually long for typical ID documents
+                structure_indicators.append('Unusually high page count for document type')
+            
+            # Check for form fields (might indicate template usage)
+            if has_form_fields:
+                structure_indicators.append('Form fields detected - possible template')
+            
+            # Check for annotations
+            if has_annotations:
+                structure_indicators.append('Annotations detected - possible modifications')
+            
+            structure_score = max(0, 100 - len(structure_indicators) * 20)
+            
+            return {
+                'pdf_structure_analysis': {
+                    'structure_indicators': structure_indicators,
+                    'structure_score': structure_score,
+                    'page_count': num_pages
                 }
-                
+            }, structure_score
+            
         except Exception as e:
             logger.warning(f"PDF structure analysis failed: {e}")
             return {
@@ -378,21 +632,58 @@ class ForensicAnalysisService:
                     'error': str(e),
                     'structure_score': 50
                 }
-            }
+            }, 50
     
-    def _analyze_file_properties(self, file_path: str) -> Dict[str, Any]:
+    def _read_pdf_structure(self, file_path: str):
+        """
+        Return (page_count, has_form_fields, has_annotations) for a PDF
+        
+        Uses pikepdf when installed, falling back to PyPDF2.
+        """
+        if pikepdf is not None:
+            with pikepdf.open(file_path) as pdf:
+                num_pages = len(pdf.pages)
+                
+                acro_form = pdf.Root.get('/AcroForm')
+                has_form_fields = bool(acro_form is not None and acro_form.get('/Fields'))
+                
+                has_annotations = False
+                for page in pdf.pages:
+                    if '/Annots' in page.obj:
+                        has_annotations = True
+                        break
+                
+                return num_pages, has_form_fields, has_annotations
+        
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            num_pages = len(pdf_reader.pages)
+            
+            has_form_fields = False
+            if hasattr(pdf_reader, 'get_form_text_fields'):
+                try:
+                    has_form_fields = bool(pdf_reader.get_form_text_fields())
+                except:
+                    pass
+            
+            has_annotations = False
+            for page in pdf_reader.pages:
+                if '/Annots' in page:
+                    has_annotations = True
+                    break
+            
+            return num_pages, has_form_fields, has_annotations
+    
+    def _analyze_file_properties(self, file_path: str, stat_result: os.stat_result) -> Tuple[Dict[str, Any], float]:
         """Analyze general file properties"""
         try:
-            import os
             from datetime import datetime
             
-            stat = os.stat(file_path)
-            
             property_indicators = []
             
             # Check file timestamps
-            creation_time = datetime.fromtimestamp(stat.st_ctime)
-            modification_time = datetime.fromtimestamp(stat.st_mtime)
+            creation_time = datetime.fromtimestamp(stat_result.st_ctime)
+            modification_time = datetime.fromtimestamp(stat_result.st_mtime)
             
             # Check if file was created and modified at exactly the same time
             time_diff = abs((creation_time - modification_time).total_seconds())
@@ -400,7 +691,7 @@ class ForensicAnalysisService:
                 property_indicators.append('Suspicious timestamp synchronization')
             
             # Check file size reasonableness
-            file_size = stat.st_size
+            file_size = stat_result.st_size
             if file_size < 1024:  # Very small file
                 property_indicators.append('Unusually small file size')
             elif file_size > 50 * 1024 * 1024:  # Very large file (>50MB)
@@ -416,7 +707,7 @@ class ForensicAnalysisService:
                     'creation_time': creation_time.isoformat(),
                     'modification_time': modification_time.isoformat()
                 }
-            }
+            }, property_score
             
         except Exception as e:
             logger.warning(f"File properties analysis failed: {e}")
@@ -425,35 +716,31 @@ class ForensicAnalysisService:
                     'error': str(e),
                     'property_score': 50
                 }
+            }, 50
+    
+    def _missing_dependencies(self, section: str, score_key: str) -> Tuple[Dict[str, Any], float]:
+        """Neutral result for an analyzer whose optional dependencies are not installed"""
+        return {
+            section: {
+                'error': 'Required analysis dependencies are not installed',
+                score_key: 50
             }
+        }, 50
     
-    def _calculate_authenticity_score(self, analysis_results: Dict[str, Any]) -> float:
-        """Calculate overall authenticity score from analysis results"""
-        scores = []
+    def _calculate_authenticity_score(self, scores: AnalysisScores) -> float:
+        """Calculate overall authenticity score from per-analyzer scores"""
+        values = scores.completed()
         
-        # Extract individual scores
-        for analysis_type, results in analysis_results.items():
-            if isinstance(results, dict):
-                for key, value in results.items():
-                    if key.endswith('_score') and isinstance(value, (int, float)):
-                        scores.append(value)
-        
-        if not scores:
+        if not values:
             return 50.0  # Neutral score if no analysis completed
         
-        # Calculate weighted average
-        return sum(scores) / len(scores)
+        return sum(values) / len(values)
     
     def _identify_risk_indicators(self, analysis_results: Dict[str, Any]) -> list:
         """Identify all risk indicators from analysis results"""
-        risk_indicators = []
-        
-        for analysis_type, results in analysis_results.items():
-            if isinstance(results, dict):
-                # Look for indicator lists
-                for key, value in results.items():
-                    if 'indicator' in key and isinstance(value, list):
-                        risk_indicators.extend(value)
-        
-        return list(set(risk_indicators))  # Remove duplicates
-
+        return list({
+            indicator
+            for results in analysis_results.values() if isinstance(results, dict)
+            for key in self.INDICATOR_KEYS
+            for indicator in results.get(key, ())
+        })
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document_processing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customerdocument',
+            index=models.Index(fields=['verification_status', '-created_at'], name='doc_status_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='customerdocument',
+            index=models.Index(condition=models.Q(('authenticity_score__isnull', False)), fields=['authenticity_score'], name='doc_auth_partial'),
+        ),
+        migrations.AddIndex(
+            model_name='documentprocessingtask',
+            index=models.Index(fields=['status', 'created_at'], name='task_pending_order'),
+        ),
+    ]
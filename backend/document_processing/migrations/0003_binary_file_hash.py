@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:30
+
+from django.db import migrations, models
+
+
+def hex_to_digest(apps, schema_editor):
+    CustomerDocument = apps.get_model('document_processing', 'CustomerDocument')
+    for document in CustomerDocument.objects.only('pk', 'file_hash').iterator():
+        CustomerDocument.objects.filter(pk=document.pk).update(
+            file_hash_digest=bytes.fromhex(document.file_hash)
+        )
+
+
+def digest_to_hex(apps, schema_editor):
+    CustomerDocument = apps.get_model('document_processing', 'CustomerDocument')
+    for document in CustomerDocument.objects.only('pk', 'file_hash_digest').iterator():
+        CustomerDocument.objects.filter(pk=document.pk).update(
+            file_hash=bytes(document.file_hash_digest).hex()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document_processing', '0002_document_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customerdocument',
+            name='file_hash_digest',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.RunPython(hex_to_digest, digest_to_hex),
+        migrations.RemoveField(
+            model_name='customerdocument',
+            name='file_hash',
+        ),
+        migrations.RenameField(
+            model_name='customerdocument',
+            old_name='file_hash_digest',
+            new_name='file_hash',
+        ),
+        migrations.AlterField(
+            model_name='customerdocument',
+            name='file_hash',
+            field=models.BinaryField(max_length=32, unique=True),
+        ),
+    ]
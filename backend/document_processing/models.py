@@ -4,6 +4,7 @@ Document Processing Models
 import uuid
 import hashlib
 from django.db import models
+from django.db.models import Q
 from django.core.validators import FileExtensionValidator
 from customer_enrollment.models import Customer
 
@@ -52,7 +53,7 @@ class CustomerDocument(models.Model):
     )
     file_name = models.CharField(max_length=255)
     file_size = models.PositiveIntegerField()
-    file_hash = models.CharField(max_length=128, unique=True)
+    file_hash = models.BinaryField(max_length=32, unique=True)  # Raw SHA-256 digest
     mime_type = models.CharField(max_length=100)
     
     # OCR and processing results
@@ -80,6 +81,12 @@ class CustomerDocument(models.Model):
             models.Index(fields=['customer', 'document_type']),
             models.Index(fields=['verification_status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['verification_status', '-created_at'], name='doc_status_recent'),
+            models.Index(
+                fields=['authenticity_score'],
+                condition=Q(authenticity_score__isnull=False),
+                name='doc_auth_partial',
+            ),
         ]
     
     def save(self, *args, **kwargs):
@@ -101,7 +108,12 @@ class CustomerDocument(models.Model):
         hash_sha256 = hashlib.sha256()
         for chunk in self.file.chunks():
             hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+        return hash_sha256.digest()
+    
+    @property
+    def file_hash_hex(self):
+        """Hex representation of the file hash for APIs and cache keys"""
+        return bytes(self.file_hash).hex() if self.file_hash else ''
     
     def __str__(self):
         return f"{self.document_type} for {self.customer}"
@@ -148,6 +160,7 @@ class DocumentProcessingTask(models.Model):
             models.Index(fields=['document', 'task_type']),
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['status', 'created_at'], name='task_pending_order'),
         ]
     
     def __str__(self):
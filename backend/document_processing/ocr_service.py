@@ -1,13 +1,257 @@
 """
 OCR Service for document text extraction
 """
+import hashlib
 import logging
+import mmap
+import multiprocessing
+import re
 import time
+from datetime import date
 from typing import Dict, Any
 import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.core.cache import cache
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 logger = logging.getLogger('ceres')
 
+# OCR output depends only on file content, so results are cached by content hash
+OCR_CACHE_TIMEOUT = 86400  # 24 hours
+
+# Scanned PDFs are rasterized in windows of this many pages per OCR worker
+OCR_PAGES_PER_WORKER = 4
+
+# Share of PDF pages with a text layer above which OCR is skipped
+PDF_TEXT_PAGE_RATIO = 0.2
+
+# Long-side pixel cap for images passed to Tesseract (~300 DPI for ID documents)
+OCR_MAX_IMAGE_DIMENSION = 2500
+
+
+# Field patterns in priority order: an earlier pattern wins over a later one.
+# Matching is case-insensitive on the original text (no lowercased copy) and
+# ASCII-only for \s, \d and \b, which is also how Hyperscan reads the bytes.
+FIELD_PATTERN_FLAGS = re.IGNORECASE | re.ASCII
+
+_FIELD_PATTERNS = (
+    ('name', (
+        r'name[:\s]+([a-zA-Z\s]+)',
+        r'full name[:\s]+([a-zA-Z\s]+)',
+        r'given name[:\s]+([a-zA-Z\s]+)',
+        r'surname[:\s]+([a-zA-Z\s]+)',
+    )),
+    ('date_of_birth', (
+        r'date of birth[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+        r'dob[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+        r'born[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+        r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+    )),
+    ('document_number', (
+        r'passport no[:\s]+([A-Z0-9]+)',
+        r'passport number[:\s]+([A-Z0-9]+)',
+        r'document no[:\s]+([A-Z0-9]+)',
+        r'id no[:\s]+([A-Z0-9]+)',
+        r'number[:\s]+([A-Z0-9]+)',
+    )),
+    ('nationality', (
+        r'nationality[:\s]+([a-zA-Z\s]+)',
+        r'citizen of[:\s]+([a-zA-Z\s]+)',
+        r'country[:\s]+([a-zA-Z\s]+)',
+    )),
+    ('expiry_date', (
+        r'expiry[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+        r'expires[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+        r'valid until[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
+    )),
+    ('gender', (
+        r'sex[:\s]+([MF])',
+        r'gender[:\s]+([a-zA-Z]+)',
+        r'\b(male|female)\b',
+    )),
+)
+
+
+def _build_field_scanner(field_patterns):
+    """
+    Combine all field patterns into one case-insensitive alternation
+    
+    Each pattern sits in its own lookahead, so matches consume no text and
+    every pattern is still tried at every position, as with separate
+    searches. Returns the compiled scanner and a map of group name to
+    (field, priority).
+    """
+    alternatives = []
+    groups = {}
+    for field, patterns in field_patterns:
+        for priority, pattern in enumerate(patterns):
+            group = f'{field}_{priority}'
+            groups[group] = (field, priority)
+            alternatives.append(f'(?=(?P<{group}>{pattern}))')
+    
+    return re.compile('|'.join(alternatives), FIELD_PATTERN_FLAGS), groups
+
+
+_FIELD_SCANNER, _FIELD_GROUPS = _build_field_scanner(_FIELD_PATTERNS)
+
+# Flat (field, compiled pattern) list; the index doubles as the Hyperscan id
+_FIELD_REGEXES = tuple(
+    (field, re.compile(pattern, FIELD_PATTERN_FLAGS))
+    for field, patterns in _FIELD_PATTERNS
+    for pattern in patterns
+)
+
+
+def _build_hyperscan_database(field_patterns):
+    """Compile the field patterns into a caseless Hyperscan database, if available"""
+    if hyperscan is None:
+        return None
+    
+    expressions = [pattern.encode('ascii') for _, patterns in field_patterns for pattern in patterns]
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan field database unavailable, using re: {e}")
+        return None
+
+
+_HS_DATABASE = _build_hyperscan_database(_FIELD_PATTERNS)
+_hs_local = threading.local()
+
+
+def _match_fields(text):
+    """
+    Return the captured value of the highest-priority match for each field
+    
+    When available, Hyperscan reports in one pass over the UTF-8 bytes which
+    patterns occur; only the winning pattern per field is then searched
+    with re to extract its capture. Otherwise the combined re scanner runs.
+    """
+    if _HS_DATABASE is None:
+        matches = {}
+        for match in _FIELD_SCANNER.finditer(text):
+            field, priority = _FIELD_GROUPS[match.lastgroup]
+            if field not in matches or priority < matches[field][0]:
+                matches[field] = (priority, match.group(match.lastindex + 1))
+        return {field: value for field, (_, value) in matches.items()}
+    
+    # Scratch space is per-thread; Hyperscan scratch cannot be shared
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DATABASE)
+    
+    matched_ids = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        matched_ids.add(pattern_id)
+    
+    _HS_DATABASE.scan(text.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+    
+    # Ids are ordered by field, then priority
+    values = {}
+    for pattern_id in sorted(matched_ids):
+        field, pattern = _FIELD_REGEXES[pattern_id]
+        if field not in values:
+            match = pattern.search(text)
+            if match:
+                values[field] = match.group(1)
+    return values
+
+
+def _normalize_date(date_str):
+    """
+    Convert a matched d/m/yyyy or m/d/yyyy date to ISO format
+    
+    Day-first is tried before month-first; mixed separators or impossible
+    dates give None.
+    """
+    separator = '/' if '/' in date_str else '-'
+    parts = date_str.split(separator)
+    if len(parts) != 3:
+        return None
+    
+    first, second, year = map(int, parts)
+    for day, month in ((first, second), (second, first)):
+        try:
+            return date(year, month, day).isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _ocr_max_workers() -> int:
+    """
+    Process count for page OCR
+    
+    Daemonic processes, such as Celery prefork pool children, may not start
+    children of their own, and the pool already fills the host, so OCR runs
+    serially there. Elsewhere OCR_MAX_WORKERS caps it (0 = one per CPU core).
+    """
+    from django.conf import settings
+    
+    if multiprocessing.current_process().daemon:
+        return 1
+    return getattr(settings, 'OCR_MAX_WORKERS', 0) or os.cpu_count() or 1
+
+
+def _mean_confidences(confidences, page_nums=None, page_count: int = 1):
+    """
+    Average the positive word confidences per page with NumPy
+    
+    Tesseract reports -1 for non-word rows; values truncate like int().
+    Without page_nums all rows belong to a single page.
+    """
+    import numpy as np
+    
+    conf = np.asarray(confidences, dtype=np.float64).astype(np.int32)
+    if page_nums is None:
+        pages = np.zeros(conf.shape, dtype=np.intp)
+    else:
+        pages = np.asarray(page_nums, dtype=np.intp) - 1
+    
+    mask = conf > 0
+    totals = np.bincount(pages[mask], weights=conf[mask], minlength=page_count)
+    counts = np.bincount(pages[mask], minlength=page_count)
+    return np.divide(totals, counts, out=np.zeros(page_count), where=counts > 0).tolist()
+
+
+def _ocr_page_list(list_path: str, page_count: int):
+    """
+    OCR every image named in a tesseract list file with a single run
+    
+    Returns (page_text, page_confidence) for each listed page, in order.
+    """
+    import pytesseract
+    
+    ocr_data = pytesseract.image_to_data(list_path, output_type=pytesseract.Output.DICT)
+    
+    # Rows carry a 1-based page_num for the image they came from
+    page_words = [[] for _ in range(page_count)]
+    for page_num, word in zip(ocr_data['page_num'], ocr_data['text']):
+        if word.strip():
+            page_words[page_num - 1].append(word)
+    
+    page_confidences = _mean_confidences(ocr_data['conf'], ocr_data['page_num'], page_count)
+    
+    return [
+        (" ".join(words), confidence)
+        for words, confidence in zip(page_words, page_confidences)
+    ]
+
+
 class OCRService:
     """
     Service for extracting text from documents using OCR
@@ -16,12 +260,13 @@ class OCRService:
     def __init__(self):
         self.supported_formats = ['.pdf', '.jpg', '.jpeg', '.png']
         
-    def extract_text(self, file_path: str) -> Dict[str, Any]:
+    def extract_text(self, file_path: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Extract text from document file
         
         Args:
             file_path: Path to the document file
+            force_refresh: Ignore any cached result and re-run extraction
             
         Returns:
             Dictionary containing extracted text and metadata
@@ -38,16 +283,26 @@ class OCRService:
             if file_ext not in self.supported_formats:
                 raise ValueError(f"Unsupported file format: {file_ext}")
             
-            # Extract text based on file type
-            if file_ext == '.pdf':
-                result = self._extract_from_pdf(file_path)
-            else:
-                result = self._extract_from_image(file_path)
+            # Map the file once: the same pages feed the content hash and PyPDF2
+            with open(file_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                # Re-submitted documents reuse the result before any decode work
+                cache_key = f"ocr_{file_ext[1:]}_{hashlib.sha256(content).hexdigest()}"
+                if not force_refresh:
+                    cached_result = cache.get(cache_key)
+                    if cached_result is not None:
+                        return cached_result
+                
+                # Extract text based on file type
+                if file_ext == '.pdf':
+                    result = self._extract_from_pdf(file_path, content)
+                else:
+                    result = self._extract_from_image(file_path)
             
             processing_time = time.time() - start_time
             
             # Structure the result
-            return {
+            ocr_result = {
                 'raw_text': result.get('text', ''),
                 'structured_data': self._structure_extracted_data(result.get('text', ''), file_ext),
                 'confidence': result.get('confidence', 0),
@@ -55,6 +310,12 @@ class OCRService:
                 'method': result.get('method', 'unknown')
             }
             
+            if result.get('method') != 'failed':
+                from django.conf import settings
+                cache.set(cache_key, ocr_result, getattr(settings, 'OCR_CACHE_TTL', OCR_CACHE_TIMEOUT))
+            
+            return ocr_result
+            
         except Exception as e:
             logger.error(f"OCR extraction failed for {file_path}: {e}")
             return {
@@ -65,59 +326,71 @@ class OCRService:
                 'error': str(e)
             }
     
-    def _extract_from_pdf(self, file_path: str) -> Dict[str, Any]:
-        """Extract text from PDF file"""
+    def _extract_from_pdf(self, file_path: str, content: mmap.mmap) -> Dict[str, Any]:
+        """Extract text from PDF file, parsing the already-mapped content"""
         try:
             # Try using PyPDF2 first for text-based PDFs
             import PyPDF2
             
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                
-                if text.strip():
-                    return {
-                        'text': text,
-                        'confidence': 0.95,
-                        'method': 'pypdf2'
-                    }
+            # The mapping is file-like and served from the page cache, so
+            # PyPDF2's small seeks/reads cost no syscalls
+            content.seek(0)
+            pdf_reader = PyPDF2.PdfReader(content)
+            text_parts = [page.extract_text() for page in pdf_reader.pages]
+            text_pages = sum(1 for page_text in text_parts if page_text.strip())
+            text = "".join(f"{page_text}\n" for page_text in text_parts)
+            
+            # A text layer on most pages makes OCR far more expensive than it
+            # is worth; only mostly-scanned PDFs fall through to Tesseract
+            page_count = len(text_parts)
+            if page_count and text_pages / page_count >= PDF_TEXT_PAGE_RATIO:
+                return {
+                    'text': text,
+                    'confidence': 0.95,
+                    'method': 'pypdf2' if text_pages == page_count else 'pypdf2_partial'
+                }
         except Exception as e:
             logger.warning(f"PyPDF2 extraction failed, falling back to OCR: {e}")
         
         # Fall back to OCR for scanned PDFs
         try:
             # Convert PDF to images and OCR each page
-            from pdf2image import convert_from_path
-            import pytesseract
+            from pdf2image import convert_from_path, pdfinfo_from_path
             
-            images = convert_from_path(file_path)
-            full_text = ""
-            total_confidence = 0
+            page_count = pdfinfo_from_path(file_path)['Pages']
+            worker_count = max(1, min(_ocr_max_workers(), page_count))
+            window_size = worker_count * OCR_PAGES_PER_WORKER
+            page_results = []
             
-            for i, image in enumerate(images):
-                # OCR the image
-                ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-                
-                # Extract text and confidence
-                page_text = " ".join([
-                    word for word in ocr_data['text'] 
-                    if word.strip()
-                ])
-                
-                # Calculate average confidence for this page
-                confidences = [
-                    int(conf) for conf in ocr_data['conf'] 
-                    if int(conf) > 0
-                ]
-                page_confidence = sum(confidences) / len(confidences) if confidences else 0
-                
-                full_text += f"[Page {i+1}]\n{page_text}\n\n"
-                total_confidence += page_confidence
+            executor = ProcessPoolExecutor(max_workers=worker_count) if worker_count > 1 else None
+            try:
+                # Pages are rasterized a window at a time, so temporary storage
+                # (often tmpfs, i.e. RAM) holds one window rather than the whole
+                # document; on macOS large windows may need a higher `ulimit -n`
+                for first_page in range(1, page_count + 1, window_size):
+                    with tempfile.TemporaryDirectory() as output_folder:
+                        page_paths = convert_from_path(
+                            file_path,
+                            first_page=first_page,
+                            last_page=min(first_page + window_size - 1, page_count),
+                            thread_count=max(1, (os.cpu_count() or 2) - 1),
+                            output_folder=output_folder,
+                            paths_only=True,
+                        )
+                        page_results.extend(
+                            self._ocr_page_paths(page_paths, output_folder, worker_count, executor)
+                        )
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            
+            full_text = "".join(
+                f"[Page {i+1}]\n{page_text}\n\n"
+                for i, (page_text, _) in enumerate(page_results)
+            )
+            total_confidence = sum(page_confidence for _, page_confidence in page_results)
             
-            avg_confidence = total_confidence / len(images) if images else 0
+            avg_confidence = total_confidence / len(page_results) if page_results else 0
             
             return {
                 'text': full_text,
@@ -134,18 +407,69 @@ class OCRService:
                 'error': str(e)
             }
     
+    def _ocr_page_paths(self, page_paths, output_folder, worker_count, executor=None):
+        """
+        OCR rendered pages, returning (page_text, page_confidence) per page
+        
+        One tesseract run per worker over a list file of page images amortizes
+        its startup; workers split the pages into contiguous runs.
+        """
+        worker_count = min(worker_count, len(page_paths))
+        list_jobs = []
+        for index in range(worker_count):
+            start = index * len(page_paths) // worker_count
+            end = (index + 1) * len(page_paths) // worker_count
+            chunk = page_paths[start:end]
+            list_path = os.path.join(output_folder, f'pages-{index}.txt')
+            with open(list_path, 'w') as list_file:
+                list_file.write("\n".join(chunk))
+            list_jobs.append((list_path, len(chunk)))
+        
+        if executor is not None and worker_count > 1:
+            chunk_results = list(executor.map(_ocr_page_list, *zip(*list_jobs)))
+        else:
+            chunk_results = [_ocr_page_list(*job) for job in list_jobs]
+        
+        return [result for results in chunk_results for result in results]
+    
+    def _preprocess_image(self, file_path: str):
+        """
+        Load an image for Tesseract: grayscale, at most OCR_MAX_IMAGE_DIMENSION
+        on the long side, and adaptively binarized when OpenCV is available
+        
+        Tesseract's cost scales with pixel count, and clean binary input
+        avoids its slower fallback passes on noisy scans.
+        """
+        try:
+            import cv2
+        except ImportError:
+            cv2 = None
+        
+        if cv2 is not None:
+            image = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+            if image is not None:
+                scale = OCR_MAX_IMAGE_DIMENSION / max(image.shape)
+                if scale < 1:
+                    image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                return cv2.adaptiveThreshold(
+                    image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+                )
+        
+        from PIL import Image
+        
+        image = Image.open(file_path)
+        image.draft('L', (OCR_MAX_IMAGE_DIMENSION, OCR_MAX_IMAGE_DIMENSION))  # JPEG DCT-domain downscale
+        image = image.convert('L')
+        image.thumbnail((OCR_MAX_IMAGE_DIMENSION, OCR_MAX_IMAGE_DIMENSION), Image.LANCZOS)
+        return image
+    
     def _extract_from_image(self, file_path: str) -> Dict[str, Any]:
         """Extract text from image file"""
         try:
             import pytesseract
-            from PIL import Image
             
             # Open and preprocess image
-            image = Image.open(file_path)
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            image = self._preprocess_image(file_path)
             
             # OCR configuration for better accuracy
             custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,;:!?()[]{}"\'-/\\ '
@@ -160,11 +484,7 @@ class OCRService:
             ])
             
             # Calculate average confidence
-            confidences = [
-                int(conf) for conf in ocr_data['conf'] 
-                if int(conf) > 0
-            ]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            avg_confidence = _mean_confidences(ocr_data['conf'])[0]
             
             return {
                 'text': text,
@@ -189,120 +509,31 @@ class OCRService:
             return {}
         
         structured_data = {}
-        text_lower = text.lower()
         
-        # Extract common document fields using regex patterns
-        import re
+        # Single pass over the text, keeping the highest-priority match per field
+        values = _match_fields(text)
         
-        # Name patterns
-        name_patterns = [
-            r'name[:\s]+([a-zA-Z\s]+)',
-            r'full name[:\s]+([a-zA-Z\s]+)',
-            r'given name[:\s]+([a-zA-Z\s]+)',
-            r'surname[:\s]+([a-zA-Z\s]+)'
-        ]
+        if 'name' in values:
+            structured_data['name'] = values['name'].strip().title()
         
-        for pattern in name_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                structured_data['name'] = match.group(1).strip().title()
-                break
+        for field in ('date_of_birth', 'expiry_date'):
+            if field in values:
+                normalized_date = _normalize_date(values[field])
+                if normalized_date:
+                    structured_data[field] = normalized_date
         
-        # Date patterns
-        date_patterns = [
-            r'date of birth[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'dob[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'born[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})'
-        ]
+        if 'document_number' in values:
+            structured_data['document_number'] = values['document_number'].strip().upper()
         
-        for pattern in date_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                date_str = match.group(1)
-                # Normalize date format
-                try:
-                    from datetime import datetime
-                    # Try different date formats
-                    for fmt in ['%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y']:
-                        try:
-                            parsed_date = datetime.strptime(date_str, fmt)
-                            structured_data['date_of_birth'] = parsed_date.strftime('%Y-%m-%d')
-                            break
-                        except ValueError:
-                            continue
-                except:
-                    pass
-                break
-        
-        # Document number patterns
-        doc_number_patterns = [
-            r'passport no[:\s]+([A-Z0-9]+)',
-            r'passport number[:\s]+([A-Z0-9]+)',
-            r'document no[:\s]+([A-Z0-9]+)',
-            r'id no[:\s]+([A-Z0-9]+)',
-            r'number[:\s]+([A-Z0-9]+)'
-        ]
-        
-        for pattern in doc_number_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                structured_data['document_number'] = match.group(1).strip().upper()
-                break
-        
-        # Nationality patterns
-        nationality_patterns = [
-            r'nationality[:\s]+([a-zA-Z\s]+)',
-            r'citizen of[:\s]+([a-zA-Z\s]+)',
-            r'country[:\s]+([a-zA-Z\s]+)'
-        ]
-        
-        for pattern in nationality_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                structured_data['nationality'] = match.group(1).strip().title()
-                break
-        
-        # Expiry date patterns
-        expiry_patterns = [
-            r'expiry[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'expires[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-            r'valid until[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})'
-        ]
-        
-        for pattern in expiry_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                date_str = match.group(1)
-                try:
-                    from datetime import datetime
-                    for fmt in ['%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y']:
-                        try:
-                            parsed_date = datetime.strptime(date_str, fmt)
-                            structured_data['expiry_date'] = parsed_date.strftime('%Y-%m-%d')
-                            break
-                        except ValueError:
-                            continue
-                except:
-                    pass
-                break
-        
-        # Gender patterns
-        gender_patterns = [
-            r'sex[:\s]+([MF])',
-            r'gender[:\s]+([a-zA-Z]+)',
-            r'\b(male|female)\b'
-        ]
+        if 'nationality' in values:
+            structured_data['nationality'] = values['nationality'].strip().title()
         
-        for pattern in gender_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                gender = match.group(1).strip().lower()
-                if gender in ['m', 'male']:
-                    structured_data['gender'] = 'male'
-                elif gender in ['f', 'female']:
-                    structured_data['gender'] = 'female'
-                break
+        if 'gender' in values:
+            gender = values['gender'].strip().lower()
+            if gender in ['m', 'male']:
+                structured_data['gender'] = 'male'
+            elif gender in ['f', 'female']:
+                structured_data['gender'] = 'female'
         
         return structured_data
 
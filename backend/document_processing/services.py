@@ -6,12 +6,46 @@ import json
 from datetime import datetime
 from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from .models import CustomerDocument, DocumentProcessingTask
 from .ocr_service import OCRService
 from .forensic_service import ForensicAnalysisService
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger('ceres')
 
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _lcs_length(a, b):
+        """Longest common subsequence length of two code point arrays (two-row DP)"""
+        previous = np.zeros(len(b) + 1, dtype=np.int32)
+        current = np.zeros(len(b) + 1, dtype=np.int32)
+        for i in range(len(a)):
+            for j in range(len(b)):
+                if a[i] == b[j]:
+                    current[j + 1] = previous[j] + 1
+                else:
+                    current[j + 1] = max(previous[j + 1], current[j])
+            previous, current = current, previous
+        return previous[len(b)]
+
+# Forensic results are cached by file hash. file_hash is unique per document, so
+# this only spares reprocessing the same document (task retries, re-runs); the
+# cached file-properties section keeps the timestamps seen at first analysis
+FORENSIC_CACHE_TIMEOUT = 86400  # 24 hours
+
 class DocumentProcessingService:
     """
     Service for coordinating document processing tasks
@@ -27,15 +61,15 @@ class DocumentProcessingService:
         """
         logger.info(f"Starting document processing for {document.id}")
         
-        # Update document status
-        document.verification_status = 'processing'
-        document.save()
-        
-        # Create processing tasks
-        tasks = [
-            self._create_task(document, 'ocr', {'priority': 'high'}),
-            self._create_task(document, 'categorization', {'auto_detect': True}),
-        ]
+        # Update document status and create processing tasks in one transaction
+        with transaction.atomic():
+            document.verification_status = 'processing'
+            document.save(update_fields=['verification_status', 'updated_at'])
+            
+            tasks = DocumentProcessingTask.objects.bulk_create([
+                DocumentProcessingTask(document=document, task_type='ocr', task_data={'priority': 'high'}),
+                DocumentProcessingTask(document=document, task_type='categorization', task_data={'auto_detect': True}),
+            ])
         
         # Start OCR processing
         self._process_ocr(document, tasks[0])
@@ -53,9 +87,12 @@ class DocumentProcessingService:
         
         return task
     
-    def validate_document(self, document: CustomerDocument):
+    def validate_document(self, document: CustomerDocument, commit: bool = True):
         """
         Validate document data against customer information
+        
+        With commit=False the validation fields are only set on the instance,
+        leaving the caller to persist them with its own update.
         """
         logger.info(f"Validating document {document.id}")
         
@@ -139,7 +176,8 @@ class DocumentProcessingService:
         else:
             document.verification_status = 'rejected'
         
-        document.save()
+        if commit:
+            document.save(update_fields=['verification_details', 'verification_status', 'updated_at'])
         
         # Create validation task record
         task = self._create_task(document, 'validation', {
@@ -193,11 +231,10 @@ class DocumentProcessingService:
 
             raw_text = ocr_result.get('raw_text', '')
 
-            # Update document with OCR results
+            # Update document with OCR results; persisted together with validation
             document.ocr_data = {'raw_text': raw_text}
             document.extracted_data = ocr_result.get('structured_data', {})
             document.processed_at = timezone.now()
-            document.save()
 
             # Complete task
             self._complete_task(task, {
@@ -206,8 +243,12 @@ class DocumentProcessingService:
                 'text_blocks_found': len(raw_text.split())
             })
             
-            # Start validation after OCR
-            self.validate_document(document)
+            # Start validation after OCR, then write both phases in one UPDATE
+            self.validate_document(document, commit=False)
+            document.save(update_fields=[
+                'ocr_data', 'extracted_data', 'processed_at',
+                'verification_status', 'verification_details', 'updated_at',
+            ])
             
         except Exception as e:
             logger.error(f"OCR processing failed for document {document.id}: {e}")
@@ -222,8 +263,16 @@ class DocumentProcessingService:
             task.started_at = timezone.now()
             task.save()
             
-            # Perform forensic analysis
-            forensic_result = self.forensic_service.analyze_document(document.file.path)
+            # Reuse the results of an earlier analysis of this document
+            cache_key = f"forensic_{document.file_hash_hex}"
+            forensic_result = cache.get(cache_key) if document.file_hash else None
+            
+            if forensic_result is None:
+                # Perform forensic analysis
+                forensic_result = self.forensic_service.analyze_document(document.file.path)
+                
+                if document.file_hash and 'error' not in forensic_result.get('analysis_details', {}):
+                    cache.set(cache_key, forensic_result, FORENSIC_CACHE_TIMEOUT)
             
             # Update document with forensic results
             document.forensic_analysis = forensic_result.get('analysis_details', {})
@@ -242,7 +291,19 @@ class DocumentProcessingService:
             self._fail_task(task, str(e))
     
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
-        """Calculate similarity between two names"""
+        """Calculate similarity between two names (0-1)"""
+        if fuzz is not None:
+            return fuzz.ratio(name1, name2) / 100.0
+        
+        if HAS_NUMBA:
+            # Same normalized Indel similarity as fuzz.ratio: 2 * LCS / total length
+            total_length = len(name1) + len(name2)
+            if not total_length:
+                return 1.0
+            a = np.frombuffer(name1.encode('utf-32-le'), dtype=np.uint32)
+            b = np.frombuffer(name2.encode('utf-32-le'), dtype=np.uint32)
+            return 2.0 * _lcs_length(a, b) / total_length
+        
         from difflib import SequenceMatcher
         return SequenceMatcher(None, name1, name2).ratio()
 
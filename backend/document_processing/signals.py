@@ -0,0 +1,16 @@
+"""
+Document Processing Signals
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ceres_project.utils import invalidate_cached_counts
+from .models import CustomerDocument
+
+
+@receiver(post_save, sender=CustomerDocument)
+@receiver(post_delete, sender=CustomerDocument)
+def invalidate_document_counts(sender, **kwargs):
+    """Drop cached document list counts when documents change"""
+    invalidate_cached_counts("documents")
@@ -0,0 +1,32 @@
+"""
+Celery tasks for document processing.
+Runs OCR and validation outside the upload request.
+"""
+
+from celery import shared_task
+import logging
+
+from .models import CustomerDocument
+from .services import DocumentProcessingService
+
+logger = logging.getLogger("ceres")
+
+
+@shared_task
+def process_document(document_id: str):
+    """
+    Run the document processing pipeline (OCR + validation) for an uploaded document.
+    
+    Not retried: pipeline failures are recorded on the DocumentProcessingTask
+    and the document is flagged for manual review.
+    
+    Args:
+        document_id: ID of the CustomerDocument to process
+    """
+    try:
+        document = CustomerDocument.objects.select_related("customer").get(id=document_id)
+    except CustomerDocument.DoesNotExist:
+        logger.error(f"Document {document_id} not found for processing")
+        return
+    
+    DocumentProcessingService().start_document_processing(document)
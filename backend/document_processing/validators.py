@@ -3,11 +3,44 @@ Enhanced file validation utilities for CERES document processing
 """
 import magic
 import hashlib
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from PIL import Image
 import PyPDF2
 import io
+import mmap
+import re
+from contextlib import contextmanager
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# One libmagic cookie per process, so the magic database is loaded once
+# (Magic.from_buffer serialises access with its own lock)
+_MAGIC = magic.Magic(mime=True)
+
+# Leading bytes of the accepted formats; files matching one skip libmagic
+MAGIC_PREFIXES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'II*\x00', 'image/tiff'),
+    (b'MM\x00*', 'image/tiff'),
+    (b'BM', 'image/bmp'),
+)
+
+# Maximum image resolution (memory protection), checked against the image header
+MAX_IMAGE_PIXELS = 50 * 1024 * 1024  # 50 megapixels
+
+# Content hash used for the validation cache: BLAKE3 when installed, otherwise
+# SHA-256 (hardware-accelerated on SHA-NI CPUs, where it beats hashlib's BLAKE2b)
+HASH_ALGORITHM = 'blake3' if blake3 is not None else 'sha256'
+
+# Content validation depends only on the file bytes, so results are cached by hash
+VALIDATION_CACHE_TIMEOUT = 3600  # 1 hour
 
 class DocumentValidator:
     """
@@ -33,6 +66,21 @@ class DocumentValidator:
     # Minimum image dimensions
     MIN_IMAGE_DIMENSIONS = (300, 300)  # 300x300 pixels
     
+    # Executable/script signatures, matched in a single pass over the file prefix
+    EXECUTABLE_SIGNATURES = re.compile(
+        rb'MZ'  # Windows executable
+        rb'|\x7fELF'  # Linux executable
+        rb'|\xfe\xed\xfa'  # macOS executable
+        rb'|<script'  # JavaScript
+        rb'|<\?php'  # PHP
+    )
+    
+    # Suspicious file name extensions (frozenset for a single hash lookup)
+    SUSPICIOUS_EXTENSIONS = frozenset({
+        '.exe', '.bat', '.cmd', '.com', '.scr', '.pif',
+        '.js', '.vbs', '.jar', '.php', '.asp', '.jsp'
+    })
+    
     @classmethod
     def validate_file_upload(cls, uploaded_file):
         """
@@ -45,7 +93,10 @@ class DocumentValidator:
             ValidationError: If file validation fails
             
         Returns:
-            dict: Validation results and metadata
+            dict: Validation results and metadata. 'content_hash' is the
+            hex digest under 'hash_algorithm' (HASH_ALGORITHM), used to key
+            the validation cache; it is not comparable with the SHA-256
+            CustomerDocument.file_hash.
         """
         try:
             # Reset file pointer
@@ -54,17 +105,34 @@ class DocumentValidator:
             # 1. File size validation
             cls._validate_file_size(uploaded_file)
             
-            # 2. MIME type validation
-            file_type = cls._validate_mime_type(uploaded_file)
-            
-            # 3. File content validation
-            cls._validate_file_content(uploaded_file, file_type)
+            # 2. Read the (size-capped) file once, hashing it in the same pass;
+            # every check below shares this content, and re-uploads skip the parsers
+            with cls._open_content(uploaded_file) as (content, content_hash):
+                file_start = content.read(1024)
+                content.seek(0)
+                cache_key = f"docval_{HASH_ALGORITHM}_{content_hash}"
+                cached = cache.get(cache_key)
+                
+                if cached:
+                    file_type, mime_type = cached['file_type'], cached['mime_type']
+                else:
+                    mime_type = cls._detect_mime_type(file_start)
+                    
+                    # 3. MIME type validation
+                    file_type = cls._validate_mime_type(mime_type)
+                    
+                    # 4. File content validation
+                    cls._validate_file_content(content, uploaded_file.size, file_type)
             
-            # 4. Security validation
-            cls._validate_file_security(uploaded_file)
+            # 5. Security validation (always run: the file name is not part of the hash)
+            cls._validate_file_security(file_start, uploaded_file.name)
             
-            # 5. Calculate file hash
-            file_hash = cls._calculate_file_hash(uploaded_file)
+            if not cached:
+                cache.set(
+                    cache_key,
+                    {'file_type': file_type, 'mime_type': mime_type},
+                    VALIDATION_CACHE_TIMEOUT,
+                )
             
             # Reset file pointer for further processing
             uploaded_file.seek(0)
@@ -72,9 +140,10 @@ class DocumentValidator:
             return {
                 'valid': True,
                 'file_type': file_type,
-                'file_hash': file_hash,
+                'content_hash': content_hash,
+                'hash_algorithm': HASH_ALGORITHM,
                 'file_size': uploaded_file.size,
-                'mime_type': cls._get_mime_type(uploaded_file),
+                'mime_type': mime_type,
             }
             
         except ValidationError:
@@ -92,16 +161,17 @@ class DocumentValidator:
             )
     
     @classmethod
-    def _validate_mime_type(cls, uploaded_file):
-        """Validate MIME type using python-magic"""
+    def _detect_mime_type(cls, file_start):
+        """Detect MIME type from known magic bytes, falling back to libmagic"""
+        for prefix, mime_type in MAGIC_PREFIXES:
+            if file_start.startswith(prefix):
+                return mime_type
+        return _MAGIC.from_buffer(file_start)
+    
+    @classmethod
+    def _validate_mime_type(cls, mime_type):
+        """Validate the MIME type detected by python-magic"""
         try:
-            # Read first 1024 bytes for MIME detection
-            file_start = uploaded_file.read(1024)
-            uploaded_file.seek(0)
-            
-            # Detect MIME type
-            mime_type = magic.from_buffer(file_start, mime=True)
-            
             if mime_type not in cls.ALLOWED_MIME_TYPES:
                 raise ValidationError(
                     f"File type '{mime_type}' is not allowed. "
@@ -114,15 +184,13 @@ class DocumentValidator:
             raise ValidationError(f"MIME type validation failed: {str(e)}")
     
     @classmethod
-    def _validate_file_content(cls, uploaded_file, file_type):
+    def _validate_file_content(cls, stream, file_size, file_type):
         """Validate file content based on type"""
         try:
-            uploaded_file.seek(0)
-            
             if file_type == 'pdf':
-                cls._validate_pdf_content(uploaded_file)
+                cls._validate_pdf_content(stream, file_size)
             elif file_type == 'image':
-                cls._validate_image_content(uploaded_file)
+                cls._validate_image_content(stream, file_size)
                 
         except ValidationError:
             raise
@@ -130,25 +198,31 @@ class DocumentValidator:
             raise ValidationError(f"Content validation failed: {str(e)}")
     
     @classmethod
-    def _validate_pdf_content(cls, uploaded_file):
+    def _validate_pdf_content(cls, stream, file_size):
         """Validate PDF file content"""
         try:
             # Check if file size is appropriate for PDF
-            if uploaded_file.size > cls.MAX_FILE_SIZES['pdf']:
+            if file_size > cls.MAX_FILE_SIZES['pdf']:
                 raise ValidationError(f"PDF file too large (max {cls.MAX_FILE_SIZES['pdf']} bytes)")
             
-            # Try to read PDF
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
+            # Cheap structural sniff: header, and a trailer pointing at the xref
+            header = stream.read(8)
+            stream.seek(max(file_size - 1024, 0))
+            tail = stream.read()
+            stream.seek(0)
+            if not header.startswith(b'%PDF-') or b'%%EOF' not in tail or b'startxref' not in tail:
+                raise ValidationError("PDF file appears to be corrupted")
+            
+            # Try to read PDF (xref and page tree only; no content streams are decoded)
+            pdf_reader = PyPDF2.PdfReader(stream, strict=False)
             
             # Check if PDF has pages
             if len(pdf_reader.pages) == 0:
                 raise ValidationError("PDF file contains no pages")
             
-            # Check if PDF is not corrupted
+            # Check the first page dictionary resolves (no content stream decoding)
             try:
-                # Try to read first page
-                first_page = pdf_reader.pages[0]
-                text = first_page.extract_text()
+                pdf_reader.pages[0].mediabox
             except Exception:
                 raise ValidationError("PDF file appears to be corrupted")
                 
@@ -158,22 +232,15 @@ class DocumentValidator:
             raise ValidationError(f"PDF validation failed: {str(e)}")
     
     @classmethod
-    def _validate_image_content(cls, uploaded_file):
+    def _validate_image_content(cls, stream, file_size):
         """Validate image file content"""
         try:
             # Check if file size is appropriate for image
-            if uploaded_file.size > cls.MAX_FILE_SIZES['image']:
+            if file_size > cls.MAX_FILE_SIZES['image']:
                 raise ValidationError(f"Image file too large (max {cls.MAX_FILE_SIZES['image']} bytes)")
             
-            # Try to open image
-            image = Image.open(uploaded_file)
-            
-            # Verify image
-            image.verify()
-            
-            # Reset file pointer and reopen for dimension check
-            uploaded_file.seek(0)
-            image = Image.open(uploaded_file)
+            # Open image; only the header is parsed here
+            image = Image.open(stream)
             
             # Check minimum dimensions
             width, height = image.size
@@ -186,9 +253,11 @@ class DocumentValidator:
                 )
             
             # Check if image is not too large (memory protection)
-            max_pixels = 50 * 1024 * 1024  # 50 megapixels
-            if width * height > max_pixels:
+            if width * height > MAX_IMAGE_PIXELS:
                 raise ValidationError("Image resolution is too high")
+            
+            # Verify image last; the object is unusable afterwards
+            image.verify()
                 
         except ValidationError:
             raise
@@ -196,38 +265,18 @@ class DocumentValidator:
             raise ValidationError(f"Image validation failed: {str(e)}")
     
     @classmethod
-    def _validate_file_security(cls, uploaded_file):
+    def _validate_file_security(cls, file_start, file_name):
         """Security validation to prevent malicious files"""
         try:
-            uploaded_file.seek(0)
-            
-            # Check for suspicious file signatures
-            file_start = uploaded_file.read(1024)
-            uploaded_file.seek(0)
-            
             # Check for executable signatures
-            executable_signatures = [
-                b'MZ',  # Windows executable
-                b'\x7fELF',  # Linux executable
-                b'\xfe\xed\xfa',  # macOS executable
-                b'<script',  # JavaScript
-                b'<?php',  # PHP
-            ]
-            
-            for signature in executable_signatures:
-                if signature in file_start:
-                    raise ValidationError("File contains suspicious content")
+            if cls.EXECUTABLE_SIGNATURES.search(file_start):
+                raise ValidationError("File contains suspicious content")
             
             # Check file name for suspicious extensions
-            filename = uploaded_file.name.lower()
-            suspicious_extensions = [
-                '.exe', '.bat', '.cmd', '.com', '.scr', '.pif',
-                '.js', '.vbs', '.jar', '.php', '.asp', '.jsp'
-            ]
-            
-            for ext in suspicious_extensions:
-                if filename.endswith(ext):
-                    raise ValidationError(f"File extension '{ext}' is not allowed")
+            _, dot, ext = file_name.lower().rpartition('.')
+            ext = dot + ext
+            if dot and ext in cls.SUSPICIOUS_EXTENSIONS:
+                raise ValidationError(f"File extension '{ext}' is not allowed")
                     
         except ValidationError:
             raise
@@ -235,23 +284,27 @@ class DocumentValidator:
             raise ValidationError(f"Security validation failed: {str(e)}")
     
     @classmethod
-    def _calculate_file_hash(cls, uploaded_file):
-        """Calculate SHA-256 hash of the file"""
-        uploaded_file.seek(0)
-        hash_sha256 = hashlib.sha256()
+    @contextmanager
+    def _open_content(cls, uploaded_file):
+        """
+        Yield a seekable stream over the file contents and their content hash,
+        read in a single pass. Disk-backed uploads are memory-mapped instead of
+        being copied into memory.
+        """
+        hasher = blake3.blake3() if blake3 is not None else hashlib.sha256()
         
-        for chunk in iter(lambda: uploaded_file.read(4096), b""):
-            hash_sha256.update(chunk)
+        if hasattr(uploaded_file, 'temporary_file_path') and uploaded_file.size:
+            with open(uploaded_file.temporary_file_path(), 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                hasher.update(content)
+                yield content, hasher.hexdigest()
+            return
         
-        return hash_sha256.hexdigest()
-    
-    @classmethod
-    def _get_mime_type(cls, uploaded_file):
-        """Get MIME type of the file"""
-        uploaded_file.seek(0)
-        file_start = uploaded_file.read(1024)
-        uploaded_file.seek(0)
-        return magic.from_buffer(file_start, mime=True)
+        parts = []
+        for chunk in uploaded_file.chunks():
+            hasher.update(chunk)
+            parts.append(chunk)
+        yield io.BytesIO(b''.join(parts)), hasher.hexdigest()
 
 def validate_document_upload(uploaded_file):
     """
@@ -266,4 +319,3 @@ def validate_document_upload(uploaded_file):
             return Response({'error': str(e)}, status=400)
     """
     return DocumentValidator.validate_file_upload(uploaded_file)
-
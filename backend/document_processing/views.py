@@ -9,8 +9,10 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction
+from functools import lru_cache
 import logging
 import mimetypes
+import os
 
 from customer_enrollment.models import Customer, EnrollmentSession
 from .models import CustomerDocument, DocumentProcessingTask, DocumentTemplate
@@ -24,11 +26,39 @@ from .serializers import (
     DocumentTemplateSerializer,
 )
 from .services import DocumentProcessingService
-from ceres_project.utils import success_response, paginated_response
+from .tasks import process_document
+from ceres_project.utils import (
+    CachedCountPagination,
+    success_response,
+    paginated_response,
+)
 
 logger = logging.getLogger("ceres")
 
 
+@lru_cache(maxsize=64)
+def _guess_mime_for_extension(extension):
+    """MIME type for a file extension, cached (uploads share a handful of types)"""
+    return mimetypes.guess_type(f"file{extension}")[0] or "application/octet-stream"
+
+
+def guess_mime_type(file_name):
+    """Guess the MIME type of an uploaded file from its name"""
+    return _guess_mime_for_extension(os.path.splitext(file_name)[1].lower())
+
+
+# Model columns rendered by CustomerDocumentSerializer ("file" backs file_url)
+DOCUMENT_LIST_FIELDS = [
+    field for field in CustomerDocumentSerializer.Meta.fields if field != "file_url"
+] + ["file"]
+
+
+class DocumentListPagination(CachedCountPagination):
+    """Document list pagination with a cached total count"""
+
+    count_cache_prefix = "documents"
+
+
 class DocumentViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing customer documents
@@ -55,12 +85,23 @@ class DocumentViewSet(viewsets.ModelViewSet):
         if verification_status:
             queryset = queryset.filter(verification_status=verification_status)
 
-        return queryset.order_by("-created_at")
+        return queryset.select_related("customer").order_by("-created_at")
 
     def list(self, request, *args, **kwargs):
         """List documents with pagination"""
-        queryset = self.filter_queryset(self.get_queryset())
-        return paginated_response(queryset, self.get_serializer_class(), request)
+        # Only load the columns the list serializer renders (skips the JSON
+        # blobs and the customer join, which only detail actions need)
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .only(*DOCUMENT_LIST_FIELDS)
+        )
+        return paginated_response(
+            queryset,
+            self.get_serializer_class(),
+            request,
+            paginator_class=DocumentListPagination,
+        )
 
     def create(self, request, *args, **kwargs):
         """Upload a new document"""
@@ -96,27 +137,22 @@ class DocumentViewSet(viewsets.ModelViewSet):
             # Create document
             document = serializer.save(
                 customer=customer,
-                mime_type=mimetypes.guess_type(serializer.validated_data["file"].name)[
-                    0
-                ]
-                or "application/octet-stream",
+                mime_type=guess_mime_type(serializer.validated_data["file"].name),
             )
 
-            # Update enrollment session if exists
-            active_session = EnrollmentSession.objects.filter(
+            # Update enrollment session if exists (single UPDATE, no fetch)
+            EnrollmentSession.objects.filter(
                 customer=customer,
                 status__in=["personal_data_completed", "documents_uploaded"],
-            ).first()
-
-            if active_session:
-                active_session.status = "documents_uploaded"
-                active_session.current_step = "review"
-                active_session.completion_percentage = 75
-                active_session.save()
+            ).update(
+                status="documents_uploaded",
+                current_step="review",
+                completion_percentage=75,
+                last_activity_at=timezone.now(),
+            )
 
-            # Start processing tasks
-            processing_service = DocumentProcessingService()
-            processing_service.start_document_processing(document)
+            # Run OCR + validation on a worker once the document is committed
+            transaction.on_commit(lambda: process_document.delay(str(document.id)))
 
         logger.info(
             f"Document uploaded for customer {customer.id}",
@@ -142,8 +178,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
         document = self.get_object()
 
         # Get processing tasks
-        tasks = DocumentProcessingTask.objects.filter(document=document).order_by(
-            "-created_at"
+        tasks = (
+            DocumentProcessingTask.objects.filter(document=document)
+            .only(*DocumentProcessingTaskSerializer.Meta.fields)
+            .order_by("-created_at")
         )
         task_serializer = DocumentProcessingTaskSerializer(tasks, many=True)
 
@@ -195,7 +233,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
             f"Document validation requested for {document.id}",
             extra={
                 "document_id": str(document.id),
-                "customer_id": str(document.customer.id),
+                "customer_id": str(document.customer_id),
             },
         )
 
@@ -249,7 +287,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
             f"Document reprocessing started for {document.id}",
             extra={
                 "document_id": str(document.id),
-                "customer_id": str(document.customer.id),
+                "customer_id": str(document.customer_id),
             },
         )
 
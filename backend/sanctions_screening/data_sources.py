@@ -5,14 +5,89 @@ import asyncio
 import aiohttp
 import logging
 import json
-import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from urllib.parse import quote_plus
 import hashlib
+import weakref
+from collections import Counter, defaultdict
+from string import Template
+from types import MappingProxyType
+from django.core.cache import cache
+
+from .sources.xml_parsing import iter_xml_records, local_name, xml_namespace
+
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+except ImportError:
+    fuzz = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 logger = logging.getLogger('ceres')
 
+# Shared immutable defaults for fields missing from API results
+_EMPTY = ()
+_EMPTY_DICT = MappingProxyType({})
+
+if HAS_NUMBA:
+    @njit(parallel=True, nogil=True, cache=True)
+    def _indel_ratio_batch(query, codes, offsets, rows):
+        """
+        Score a query against many names (code points stored back to back, row i
+        at codes[offsets[i]:offsets[i + 1]]) with the same normalized Indel
+        similarity as rapidfuzz's fuzz.ratio: 200 * LCS / total length
+        """
+        scores = np.empty(len(rows), dtype=np.float64)
+        for k in prange(len(rows)):
+            start = offsets[rows[k]]
+            length = offsets[rows[k] + 1] - start
+            total = len(query) + length
+            if total == 0:
+                scores[k] = 100.0
+                continue
+            previous = np.zeros(length + 1, dtype=np.int32)
+            current = np.zeros(length + 1, dtype=np.int32)
+            for i in range(len(query)):
+                for j in range(length):
+                    if query[i] == codes[start + j]:
+                        current[j + 1] = previous[j] + 1
+                    else:
+                        current[j + 1] = max(previous[j + 1], current[j])
+                previous, current = current, previous
+            scores[k] = 200.0 * previous[length] / total
+        return scores
+
+def normalize_query_name(name: str) -> str:
+    """
+    Canonical form of a query name for confidence scoring, computed once per search
+    """
+    if fuzz is not None:
+        return fuzz_utils.default_process(name)
+    return name.strip().upper()
+
+async def read_json(response: aiohttp.ClientResponse) -> Any:
+    """
+    Decode a JSON response body, with orjson when installed
+    
+    Unlike response.json(), this does not require an application/json content
+    type (WikiData answers with application/sparql-results+json).
+    """
+    body = await response.read()
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
 class DataSourceManager:
     """
     Manager for all external data sources integration
@@ -54,60 +129,172 @@ class DataSourceManager:
         }
         
         self.session = None
+        self._session_loop = None
+        self._semaphore = None
+        self._selected_sources = {}
+    
+    # Maximum number of sources queried at the same time
+    max_concurrent_searches = 8
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={'User-Agent': 'CERES-Compliance-System/1.0'}
-        )
+        await self.get_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
+        await self.close()
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        HTTP session for the running event loop, opened on first use and then
+        kept open so connections (and their TLS sessions) are reused
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is not None and not self.session.closed and self._session_loop is loop:
+            return self.session
+        
+        if self.session is not None:
+            # Opened in an earlier event loop, whose connections cannot be reused
+            await self._discard_session()
+        
+        # Bounded pool with keep-alive and cached DNS, shared by every source
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=10,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30, connect=5, sock_read=10),
+            headers={'User-Agent': 'CERES-Compliance-System/1.0'},
+            raise_for_status=False,
+        )
+        self._session_loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_searches)
+        return self.session
+    
+    async def close(self):
+        """
+        Close the HTTP session
+        """
         if self.session:
-            await self.session.close()
+            await self._discard_session()
+    
+    async def _discard_session(self):
+        """Close and drop the current HTTP session and its connector"""
+        session, self.session, self._session_loop = self.session, None, None
+        try:
+            await session.close()
+        except Exception as e:
+            # The loop the session was opened in may already be closed
+            logger.warning(f"Failed to close stale HTTP session: {e}")
     
     async def search_all_sources(self, query_name: str, source_types: List[str] = None) -> Dict[str, Any]:
         """
         Search across all configured sources
         """
+        results = {}
+        async for source_code, result in self.stream_all_sources(query_name, source_types):
+            results[source_code] = result
+        return results
+    
+    async def stream_all_sources(self, query_name: str,
+                                 source_types: List[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Search across all configured sources, yielding (source_code, result)
+        pairs as each source finishes so callers can render results progressively
+        """
         if source_types is None:
             source_types = ['sanctions', 'pep', 'corporate']
         
-        results = {}
-        tasks = []
-        
-        for source_code, source in self.sources.items():
-            if any(st in source.source_type for st in source_types):
-                if source.is_enabled:
-                    task = self._search_source_safe(source_code, source, query_name)
-                    tasks.append(task)
+        await self.get_session()
+        normalized_query = normalize_query_name(query_name)
         
-        # Execute all searches concurrently
-        search_results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for i, result in enumerate(search_results):
-            source_code = list(self.sources.keys())[i]
-            if isinstance(result, Exception):
-                logger.error(f"Search failed for {source_code}: {result}")
-                results[source_code] = {
+        async def search_source(source_code, source):
+            try:
+                return source_code, await self._search_source_safe(
+                    source_code, source, query_name, normalized_query
+                )
+            except Exception as e:
+                logger.error(f"Search failed for {source_code}: {e}")
+                return source_code, {
                     'success': False,
-                    'error': str(result),
+                    'error': str(e),
                     'matches': []
                 }
-            else:
-                results[source_code] = result
         
-        return results
+        # Execute all searches concurrently
+        tasks = [
+            asyncio.create_task(search_source(source_code, source))
+            for source_code, source in self._get_selected_sources(source_types)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave searches running
+            for task in tasks:
+                task.cancel()
     
-    async def _search_source_safe(self, source_code: str, source, query_name: str) -> Dict[str, Any]:
+    def _get_selected_sources(self, source_types: List[str]) -> List[tuple]:
+        """
+        Enabled sources of the given types, computed once per source type combination
+        """
+        key = frozenset(source_types)
+        selected = self._selected_sources.get(key)
+        if selected is None:
+            selected = [
+                (source_code, source) for source_code, source in self.sources.items()
+                if source.source_type in key and source.is_enabled
+            ]
+            self._selected_sources[key] = selected
+        return selected
+    
+    def set_source_enabled(self, source_code: str, enabled: bool):
+        """
+        Enable or disable a source
+        """
+        self.sources[source_code].is_enabled = enabled
+        self._selected_sources.clear()
+    
+    async def _search_source_safe(self, source_code: str, source, query_name: str,
+                                  normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Safely search a single source with error handling
+        
+        Successful results are cached per source and normalized query for the
+        source's result_cache_ttl, so repeated screenings skip the upstream call.
         """
+        normalized_query = normalized_query or normalize_query_name(query_name)
+        cache_key = (
+            f"sanctions_source_{source_code}_"
+            f"{hashlib.sha1(normalized_query.encode('utf-8')).hexdigest()}"
+        )
+        
         try:
-            return await source.search(query_name, self.session)
+            cached_result = await cache.aget(cache_key)
+            if cached_result is not None:
+                return cached_result
+            
+            async with self._semaphore:
+                # Per-source budget, so one slow API cannot hold up the others
+                result = await asyncio.wait_for(
+                    source.search(query_name, self.session, normalized_query),
+                    timeout=source.timeout
+                )
+            if result.get('success'):
+                await cache.aset(cache_key, result, source.result_cache_ttl)
+            return result
+        except asyncio.TimeoutError:
+            logger.error(f"Search timed out for {source_code} after {source.timeout}s")
+            return {
+                'success': False,
+                'error': f"Timed out after {source.timeout}s",
+                'matches': []
+            }
         except Exception as e:
             logger.error(f"Error searching {source_code}: {e}")
             return {
@@ -121,6 +308,9 @@ class BaseDataSource:
     Base class for all data sources
     """
     
+    __slots__ = ('source_type', 'name', 'code', 'is_enabled', 'base_url',
+                 'rate_limit', 'cache_ttl', 'timeout')
+    
     def __init__(self):
         self.source_type = 'unknown'
         self.name = 'Unknown Source'
@@ -129,10 +319,20 @@ class BaseDataSource:
         self.base_url = ''
         self.rate_limit = 10  # requests per second
         self.cache_ttl = 3600  # 1 hour
+        self.timeout = 15  # seconds per search
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    @property
+    def result_cache_ttl(self) -> int:
+        """Seconds a successful search result is reused"""
+        return self.cache_ttl
+    
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search for a name in this data source
+        
+        normalized_query is the query already passed through normalize_query_name,
+        shared by all sources in a search; it is computed here when omitted.
         """
         raise NotImplementedError("Subclasses must implement search method")
     
@@ -142,12 +342,198 @@ class BaseDataSource:
         """
         return name.strip().upper()
     
-    def _calculate_confidence(self, query_name: str, matched_name: str) -> float:
+    def _calculate_confidence(self, normalized_query: str, matched_name: str) -> float:
         """
-        Calculate confidence score for a match
+        Calculate confidence score for a match against a normalized query name
         """
+        if fuzz is not None:
+            return fuzz.ratio(normalized_query, fuzz_utils.default_process(matched_name))
+        
         from difflib import SequenceMatcher
-        return SequenceMatcher(None, query_name.upper(), matched_name.upper()).ratio() * 100
+        return SequenceMatcher(None, normalized_query, matched_name.upper()).ratio() * 100
+
+class LocalListIndex:
+    """
+    In-memory snapshot of a downloaded list, searched without network access
+    
+    Names (primary names and aliases, one row each) are held pre-normalized in a
+    flat list parallel to their entries, so a query is scored in one rapidfuzz pass.
+    Large lists also get a character 3-gram inverted index, so only the rows
+    sharing the most 3-grams with the query are scored. Without rapidfuzz, names
+    are also packed into a code point array for the parallel Numba scorer.
+    """
+    
+    PREFILTER_MIN_ROWS = 2000
+    PREFILTER_CANDIDATES = 200
+    
+    def __init__(self, rows: List[Tuple[str, Dict[str, Any]]]):
+        self.labels = [name for name, _ in rows]
+        self.names = [normalize_query_name(name) for name in self.labels]
+        self.entries = [entry for _, entry in rows]
+        self.loaded_at = datetime.now()
+        
+        self.postings = None
+        if len(self.names) >= self.PREFILTER_MIN_ROWS:
+            self.postings = defaultdict(list)
+            for row, name in enumerate(self.names):
+                for gram in self._trigrams(name):
+                    self.postings[gram].append(row)
+        
+        self.codes = None
+        if fuzz is None and HAS_NUMBA:
+            encoded = [self._code_points(name) for name in self.names]
+            self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(points) for points in encoded], out=self.offsets[1:])
+            self.codes = np.concatenate(encoded) if encoded else np.zeros(0, dtype=np.uint32)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    @staticmethod
+    def _code_points(name: str):
+        return np.frombuffer(name.encode('utf-32-le'), dtype=np.uint32)
+    
+    @staticmethod
+    def _trigrams(name: str) -> set:
+        padded = f" {name} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def _candidates(self, normalized_query: str) -> Optional[List[int]]:
+        """
+        Rows sharing the most 3-grams with the query, or None to scan every row
+        """
+        if self.postings is None:
+            return None
+        overlap = Counter()
+        for gram in self._trigrams(normalized_query):
+            rows = self.postings.get(gram)
+            if rows:
+                overlap.update(rows)
+        return [row for row, _ in overlap.most_common(self.PREFILTER_CANDIDATES)]
+    
+    def search(self, normalized_query: str, score_cutoff: float, limit: int) -> List[Tuple[int, float]]:
+        """
+        Return (row, score) pairs for the best matching names, highest score first
+        """
+        candidates = self._candidates(normalized_query)
+        if candidates is None:
+            choices = self.names
+        else:
+            choices = {row: self.names[row] for row in candidates}
+        
+        if fuzz is not None:
+            hits = process.extract(
+                normalized_query, choices, scorer=fuzz.ratio, processor=None,
+                score_cutoff=score_cutoff, limit=limit
+            )
+            return [(row, score) for _, score, row in hits]
+        
+        if self.codes is not None:
+            rows = np.arange(len(self.names)) if candidates is None else np.array(candidates, dtype=np.int64)
+            scores = _indel_ratio_batch(self._code_points(normalized_query), self.codes, self.offsets, rows)
+            keep = np.flatnonzero(scores >= score_cutoff)
+            keep = keep[np.argsort(-scores[keep], kind='stable')][:limit]
+            return [(int(rows[k]), float(scores[k])) for k in keep]
+        
+        from difflib import SequenceMatcher
+        matcher = SequenceMatcher(b=normalized_query)
+        scored = []
+        rows = choices.items() if candidates is not None else enumerate(choices)
+        for row, name in rows:
+            matcher.set_seq1(name)
+            score = matcher.ratio() * 100
+            if score >= score_cutoff:
+                scored.append((row, score))
+        scored.sort(key=lambda hit: hit[1], reverse=True)
+        return scored[:limit]
+
+class LocalListSource(BaseDataSource):
+    """
+    Base class for sources published as downloadable lists
+    
+    The list is downloaded and parsed once into a LocalListIndex, refreshed after
+    cache_ttl seconds; searches then run locally instead of over HTTP.
+    """
+    
+    __slots__ = ('list_url', 'index', '_refresh_locks')
+    
+    score_cutoff = 70
+    max_results = 50
+    
+    # Results outlive the list snapshot they came from (the cache key does not
+    # track it), so they are reused for minutes rather than the list's cache_ttl
+    result_cache_ttl = 300
+    
+    def __init__(self):
+        super().__init__()
+        self.cache_ttl = 86400  # 24 hours
+        self.timeout = 30  # first search includes the list download
+        self.index: Optional[LocalListIndex] = None
+        # One lock per event loop: a manager may be used from several loops
+        self._refresh_locks = weakref.WeakKeyDictionary()
+    
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search the local snapshot of the list
+        """
+        normalized_query = normalized_query or normalize_query_name(query_name)
+        index = await self._get_index(session)
+        
+        # Scoring is CPU bound; run it in a thread so other sources' I/O proceeds
+        hits = await asyncio.to_thread(index.search, normalized_query, self.score_cutoff, self.max_results)
+        
+        # Keep the best scoring name (primary or alias) per entity
+        best = {}
+        for row, score in hits:
+            entry = index.entries[row]
+            current = best.get(entry['entity_id'])
+            if current is None or score > current['confidence']:
+                best[entry['entity_id']] = {
+                    **entry, 'matched_name': index.labels[row], 'confidence': score
+                }
+        
+        matches = sorted(best.values(), key=lambda match: match['confidence'], reverse=True)
+        return {
+            'success': True,
+            'source': self.code,
+            'matches': matches,
+            'total_results': len(matches)
+        }
+    
+    async def _get_index(self, session: aiohttp.ClientSession) -> LocalListIndex:
+        """
+        Return the list snapshot, downloading it when missing or stale
+        """
+        if not self._index_is_fresh():
+            loop = asyncio.get_running_loop()
+            refresh_lock = self._refresh_locks.get(loop)
+            if refresh_lock is None:
+                refresh_lock = self._refresh_locks[loop] = asyncio.Lock()
+            async with refresh_lock:
+                if not self._index_is_fresh():
+                    async with session.get(self.list_url) as response:
+                        if response.status != 200:
+                            raise Exception(f"{self.name} download returned status {response.status}")
+                        content = await response.read()
+                    
+                    # Parsing is CPU bound; keep it off the event loop
+                    rows = await asyncio.to_thread(self._parse_list, content)
+                    self.index = LocalListIndex(rows)
+                    logger.info(f"Loaded {len(self.index)} names from {self.name}")
+        return self.index
+    
+    def _index_is_fresh(self) -> bool:
+        return (
+            self.index is not None
+            and datetime.now() - self.index.loaded_at < timedelta(seconds=self.cache_ttl)
+        )
+    
+    def _parse_list(self, content: bytes) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse the downloaded list into (name, entry) rows
+        """
+        raise NotImplementedError("Subclasses must implement _parse_list method")
 
 # OFAC Sources
 class OFACSDNSource(BaseDataSource):
@@ -155,41 +541,44 @@ class OFACSDNSource(BaseDataSource):
     OFAC Specially Designated Nationals (SDN) List
     """
     
+    __slots__ = ('search_url_prefix',)
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
         self.name = 'OFAC SDN List'
         self.code = 'ofac_sdn'
         self.base_url = 'https://sanctionssearch.ofac.treas.gov/api'
+        # Static query parameters are encoded once; only the name varies per call
+        self.search_url_prefix = f"{self.base_url}/search?type=individual&maxResults=50&name="
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search OFAC SDN list
         """
-        search_url = f"{self.base_url}/search"
-        params = {
-            'name': query_name,
-            'type': 'individual',
-            'maxResults': 50
-        }
+        normalized_query = normalized_query or normalize_query_name(query_name)
+        search_url = self.search_url_prefix + quote_plus(query_name)
         
-        async with session.get(search_url, params=params) as response:
+        async with session.get(search_url) as response:
             if response.status == 200:
-                data = await response.json()
+                data = await read_json(response)
                 matches = []
                 
-                for item in data.get('results', []):
-                    confidence = self._calculate_confidence(query_name, item.get('name', ''))
+                for item in data.get('results') or _EMPTY:
+                    get = item.get
+                    name = get('name')
+                    entity_id = get('id')
                     
                     matches.append({
-                        'name': item.get('name'),
-                        'entity_id': item.get('id'),
-                        'confidence': confidence,
-                        'entity_type': item.get('type'),
-                        'programs': item.get('programs', []),
-                        'addresses': item.get('addresses', []),
-                        'dates_of_birth': item.get('datesOfBirth', []),
-                        'source_url': f"https://sanctionssearch.ofac.treas.gov/Details/{item.get('id')}"
+                        'name': name,
+                        'entity_id': entity_id,
+                        'confidence': self._calculate_confidence(normalized_query, name or ''),
+                        'entity_type': get('type'),
+                        'programs': get('programs') or _EMPTY,
+                        'addresses': get('addresses') or _EMPTY,
+                        'dates_of_birth': get('datesOfBirth') or _EMPTY,
+                        'source_url': f"https://sanctionssearch.ofac.treas.gov/Details/{entity_id}"
                     })
                 
                 return {
@@ -201,61 +590,113 @@ class OFACSDNSource(BaseDataSource):
             else:
                 raise Exception(f"OFAC API returned status {response.status}")
 
-class OFACConsolidatedSource(BaseDataSource):
+class OFACConsolidatedSource(LocalListSource):
     """
-    OFAC Consolidated Sanctions List
+    OFAC Consolidated Sanctions List (non-SDN lists)
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
         self.name = 'OFAC Consolidated List'
         self.code = 'ofac_consolidated'
         self.base_url = 'https://www.treasury.gov/ofac/downloads'
+        self.list_url = f"{self.base_url}/consolidated/consolidated.xml"
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    def _parse_list(self, content: bytes) -> List[Tuple[str, Dict[str, Any]]]:
         """
-        Search OFAC Consolidated list (requires downloading and parsing XML)
+        Parse the consolidated XML (sdnList schema) into name rows
         """
-        # This would typically involve downloading the consolidated XML file
-        # and parsing it locally for better performance
+        rows = []
         
-        # For now, return a placeholder implementation
-        return {
-            'success': True,
-            'source': self.code,
-            'matches': [],
-            'total_results': 0,
-            'note': 'Consolidated list search requires local XML parsing'
-        }
+        for item in iter_xml_records(content, 'sdnEntry'):
+            ns = xml_namespace(item)
+            uid = (item.findtext(f'{ns}uid') or '').strip()
+            name = self._entry_name(item, ns)
+            if not uid or not name:
+                continue
+            
+            entry = {
+                'name': name,
+                'entity_id': uid,
+                'entity_type': item.findtext(f'{ns}sdnType') or '',
+                'programs': [program.text.strip() for program in item.iter(f'{ns}program') if program.text],
+                'source_url': f"https://sanctionssearch.ofac.treas.gov/Details.aspx?id={uid}"
+            }
+            rows.append((name, entry))
+            
+            for aka in item.iter(f'{ns}aka'):
+                alias = self._entry_name(aka, ns)
+                if alias:
+                    rows.append((alias, entry))
+        
+        return rows
+    
+    @staticmethod
+    def _entry_name(item, ns: str) -> str:
+        first_name = (item.findtext(f'{ns}firstName') or '').strip()
+        last_name = (item.findtext(f'{ns}lastName') or '').strip()
+        return f"{first_name} {last_name}".strip()
 
 # UN Sources
-class UNConsolidatedSource(BaseDataSource):
+class UNConsolidatedSource(LocalListSource):
     """
     UN Security Council Consolidated List
     """
     
+    __slots__ = ()
+    
+    NAME_PARTS = ('FIRST_NAME', 'SECOND_NAME', 'THIRD_NAME', 'FOURTH_NAME')
+    
+    # Record tag -> (entity type, alias tag)
+    RECORD_TAGS = {
+        'INDIVIDUAL': ('individual', 'INDIVIDUAL_ALIAS'),
+        'ENTITY': ('entity', 'ENTITY_ALIAS'),
+    }
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
         self.name = 'UN Consolidated List'
         self.code = 'un_consolidated'
         self.base_url = 'https://scsanctions.un.org/resources'
+        self.list_url = f"{self.base_url}/xml/en/consolidated.xml"
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    def _parse_list(self, content: bytes) -> List[Tuple[str, Dict[str, Any]]]:
         """
-        Search UN Consolidated list
+        Parse the consolidated XML (individuals and entities) into name rows
         """
-        # UN provides XML downloads that need to be parsed locally
-        # This is a simplified implementation
+        rows = []
         
-        return {
-            'success': True,
-            'source': self.code,
-            'matches': [],
-            'total_results': 0,
-            'note': 'UN list search requires XML download and parsing'
-        }
+        for item in iter_xml_records(content, *self.RECORD_TAGS):
+            ns = xml_namespace(item)
+            entity_type, alias_tag = self.RECORD_TAGS[local_name(item.tag)]
+            data_id = (item.findtext(f'{ns}DATAID') or '').strip()
+            name = ' '.join(
+                part for part in ((item.findtext(f'{ns}{field}') or '').strip() for field in self.NAME_PARTS) if part
+            )
+            if not data_id or not name:
+                continue
+            
+            list_type = (item.findtext(f'{ns}UN_LIST_TYPE') or '').strip()
+            entry = {
+                'name': name,
+                'entity_id': data_id,
+                'entity_type': entity_type,
+                'programs': [list_type] if list_type else [],
+                'reference_number': (item.findtext(f'{ns}REFERENCE_NUMBER') or '').strip(),
+                'source_url': self.list_url
+            }
+            rows.append((name, entry))
+            
+            for alias in item.iter(f'{ns}{alias_tag}'):
+                alias_name = (alias.findtext(f'{ns}ALIAS_NAME') or '').strip()
+                if alias_name:
+                    rows.append((alias_name, entry))
+        
+        return rows
 
 # EU Sources
 class EUSanctionsSource(BaseDataSource):
@@ -263,6 +704,8 @@ class EUSanctionsSource(BaseDataSource):
     EU Financial Sanctions Database
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
@@ -270,7 +713,8 @@ class EUSanctionsSource(BaseDataSource):
         self.code = 'eu_sanctions'
         self.base_url = 'https://webgate.ec.europa.eu/fsd/fsf'
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search EU sanctions database
         """
@@ -288,6 +732,8 @@ class UKOFSISource(BaseDataSource):
     UK Office of Financial Sanctions Implementation
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
@@ -295,7 +741,8 @@ class UKOFSISource(BaseDataSource):
         self.code = 'uk_ofsi'
         self.base_url = 'https://ofsistorage.blob.core.windows.net/publishlive'
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search UK OFSI consolidated list
         """
@@ -309,6 +756,8 @@ class UKOFSISource(BaseDataSource):
 
 # Additional country sources (simplified implementations)
 class DFATAustraliaSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
@@ -316,6 +765,8 @@ class DFATAustraliaSource(BaseDataSource):
         self.code = 'dfat_au'
 
 class SECOSwitzerlandSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
@@ -323,6 +774,8 @@ class SECOSwitzerlandSource(BaseDataSource):
         self.code = 'seco_ch'
 
 class FINTRACCanadaSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
@@ -330,6 +783,8 @@ class FINTRACCanadaSource(BaseDataSource):
         self.code = 'fintrac_ca'
 
 class BancoCentralBrazilSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'sanctions'
@@ -342,6 +797,8 @@ class OpenSanctionsPEPSource(BaseDataSource):
     OpenSanctions PEP Database
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'pep'
@@ -349,10 +806,12 @@ class OpenSanctionsPEPSource(BaseDataSource):
         self.code = 'opensanctions_pep'
         self.base_url = 'https://api.opensanctions.org'
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search OpenSanctions PEP database
         """
+        normalized_query = normalized_query or normalize_query_name(query_name)
         search_url = f"{self.base_url}/search/default"
         params = {
             'q': query_name,
@@ -364,24 +823,24 @@ class OpenSanctionsPEPSource(BaseDataSource):
         try:
             async with session.get(search_url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await read_json(response)
                     matches = []
                     
-                    for item in data.get('results', []):
-                        properties = item.get('properties', {})
-                        name = properties.get('name', [''])[0] if properties.get('name') else ''
-                        
-                        confidence = self._calculate_confidence(query_name, name)
+                    for item in data.get('results') or _EMPTY:
+                        properties = item.get('properties') or _EMPTY_DICT
+                        names = properties.get('name')
+                        name = names[0] if names else ''
+                        entity_id = item.get('id')
                         
                         matches.append({
                             'name': name,
-                            'entity_id': item.get('id'),
-                            'confidence': confidence,
+                            'entity_id': entity_id,
+                            'confidence': self._calculate_confidence(normalized_query, name),
                             'entity_type': 'pep',
-                            'country': properties.get('country', []),
-                            'position': properties.get('position', []),
-                            'topics': item.get('topics', []),
-                            'source_url': f"https://opensanctions.org/entities/{item.get('id')}"
+                            'country': properties.get('country') or _EMPTY,
+                            'position': properties.get('position') or _EMPTY,
+                            'topics': item.get('topics') or _EMPTY,
+                            'source_url': f"https://opensanctions.org/entities/{entity_id}"
                         })
                     
                     return {
@@ -406,6 +865,28 @@ class WikiDataPEPSource(BaseDataSource):
     WikiData SPARQL for PEP information
     """
     
+    __slots__ = ()
+    
+    # SPARQL query to find politicians; only $name varies, so the query text is
+    # stable for identical names and WDQS can serve it from its result cache
+    QUERY_TEMPLATE = Template("""
+        SELECT ?person ?personLabel ?positionLabel ?countryLabel WHERE {
+          ?person wdt:P31 wd:Q5 .
+          ?person wdt:P39 ?position .
+          ?position wdt:P279* wd:Q4164871 .
+          ?person rdfs:label ?personLabel .
+          FILTER(CONTAINS(LCASE(?personLabel), "$name"))
+          OPTIONAL { ?person wdt:P27 ?country }
+          SERVICE wikibase:label { bd:serviceParam wikibase:language "en" }
+        }
+        LIMIT 20
+        """)
+    
+    # SPARQL string literal escapes
+    LITERAL_ESCAPES = str.maketrans({
+        '\\': '\\\\', '"': '\\"', "'": "\\'", '\n': '\\n', '\r': '\\r', '\t': '\\t',
+    })
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'pep'
@@ -413,23 +894,15 @@ class WikiDataPEPSource(BaseDataSource):
         self.code = 'wikidata_pep'
         self.base_url = 'https://query.wikidata.org/sparql'
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search WikiData for politicians and officials
         """
-        # SPARQL query to find politicians
-        sparql_query = f"""
-        SELECT ?person ?personLabel ?positionLabel ?countryLabel WHERE {{
-          ?person wdt:P31 wd:Q5 .
-          ?person wdt:P39 ?position .
-          ?position wdt:P279* wd:Q4164871 .
-          ?person rdfs:label ?personLabel .
-          FILTER(CONTAINS(LCASE(?personLabel), LCASE("{query_name}")))
-          OPTIONAL {{ ?person wdt:P27 ?country }}
-          SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en" }}
-        }}
-        LIMIT 20
-        """
+        normalized_query = normalized_query or normalize_query_name(query_name)
+        # Lower-case and escape the name in Python rather than in the query
+        name_literal = query_name.strip().lower().translate(self.LITERAL_ESCAPES)
+        sparql_query = self.QUERY_TEMPLATE.substitute(name=name_literal)
         
         params = {
             'query': sparql_query,
@@ -439,12 +912,12 @@ class WikiDataPEPSource(BaseDataSource):
         try:
             async with session.get(self.base_url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await read_json(response)
                     matches = []
                     
                     for binding in data.get('results', {}).get('bindings', []):
                         name = binding.get('personLabel', {}).get('value', '')
-                        confidence = self._calculate_confidence(query_name, name)
+                        confidence = self._calculate_confidence(normalized_query, name)
                         
                         matches.append({
                             'name': name,
@@ -475,6 +948,8 @@ class WikiDataPEPSource(BaseDataSource):
 
 # Additional PEP sources (simplified)
 class IPUParlineSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'pep'
@@ -482,6 +957,8 @@ class IPUParlineSource(BaseDataSource):
         self.code = 'ipu_parline'
 
 class ParlGovSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'pep'
@@ -489,6 +966,8 @@ class ParlGovSource(BaseDataSource):
         self.code = 'parlgov'
 
 class G20OfficialsSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'pep'
@@ -496,6 +975,8 @@ class G20OfficialsSource(BaseDataSource):
         self.code = 'g20_officials'
 
 class WorldBankSOESource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'pep'
@@ -503,6 +984,8 @@ class WorldBankSOESource(BaseDataSource):
         self.code = 'world_bank_soe'
 
 class OpenOwnershipSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'corporate'
@@ -515,6 +998,8 @@ class OpenCorporatesSource(BaseDataSource):
     OpenCorporates API
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'corporate'
@@ -522,10 +1007,12 @@ class OpenCorporatesSource(BaseDataSource):
         self.code = 'opencorporates'
         self.base_url = 'https://api.opencorporates.com/v0.4'
     
-    async def search(self, query_name: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def search(self, query_name: str, session: aiohttp.ClientSession,
+                     normalized_query: Optional[str] = None) -> Dict[str, Any]:
         """
         Search OpenCorporates for companies and officers
         """
+        normalized_query = normalized_query or normalize_query_name(query_name)
         # Search for companies
         search_url = f"{self.base_url}/companies/search"
         params = {
@@ -537,13 +1024,13 @@ class OpenCorporatesSource(BaseDataSource):
         try:
             async with session.get(search_url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await read_json(response)
                     matches = []
                     
                     for company in data.get('results', {}).get('companies', []):
                         company_data = company.get('company', {})
                         name = company_data.get('name', '')
-                        confidence = self._calculate_confidence(query_name, name)
+                        confidence = self._calculate_confidence(normalized_query, name)
                         
                         matches.append({
                             'name': name,
@@ -575,6 +1062,8 @@ class OpenCorporatesSource(BaseDataSource):
 
 # Additional corporate sources (simplified)
 class GLEIFLEISource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'corporate'
@@ -582,6 +1071,8 @@ class GLEIFLEISource(BaseDataSource):
         self.code = 'gleif_lei'
 
 class SECEdgarSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'corporate'
@@ -589,6 +1080,8 @@ class SECEdgarSource(BaseDataSource):
         self.code = 'sec_edgar'
 
 class CompaniesHouseUKSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'corporate'
@@ -596,6 +1089,8 @@ class CompaniesHouseUKSource(BaseDataSource):
         self.code = 'companies_house_uk'
 
 class ReceitaCNPJSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'corporate'
@@ -604,6 +1099,8 @@ class ReceitaCNPJSource(BaseDataSource):
 
 # Media Sources
 class GDELTSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'media'
@@ -611,6 +1108,8 @@ class GDELTSource(BaseDataSource):
         self.code = 'gdelt'
 
 class CommonCrawlNewsSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'media'
@@ -618,6 +1117,8 @@ class CommonCrawlNewsSource(BaseDataSource):
         self.code = 'common_crawl_news'
 
 class NewscatcherSource(BaseDataSource):
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__()
         self.source_type = 'media'
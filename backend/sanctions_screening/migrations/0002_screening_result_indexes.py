@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='screeningresult',
+            name='screening_r_match_f_d26192_idx',
+        ),
+        migrations.AddIndex(
+            model_name='screeningresult',
+            index=models.Index(fields=['match_found', '-confidence_score'], name='sr_match_conf_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='screeningresult',
+            index=models.Index(fields=['customer', '-created_at'], name='sr_cust_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='screeningresult',
+            index=models.Index(condition=models.Q(('match_found', True)), fields=['customer', 'source'], name='sr_matched_cust_src'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+import json
+
+from django.db import migrations
+
+
+LIST_FIELDS = ('categories', 'sanctions_programs')
+
+
+def encode_text_as_json(apps, schema_editor):
+    """Rewrite every stored value as a JSON list so the column can be cast"""
+    ScreeningResult = apps.get_model('sanctions_screening', 'ScreeningResult')
+    batch = []
+    for result in ScreeningResult.objects.only(*LIST_FIELDS).iterator(chunk_size=1000):
+        for field in LIST_FIELDS:
+            value = getattr(result, field)
+            try:
+                decoded = json.loads(value) if value else []
+            except ValueError:
+                decoded = [value]
+            if not isinstance(decoded, list):
+                decoded = [decoded]
+            setattr(result, field, json.dumps(decoded))
+        batch.append(result)
+        if len(batch) >= 1000:
+            ScreeningResult.objects.bulk_update(batch, LIST_FIELDS)
+            batch = []
+    if batch:
+        ScreeningResult.objects.bulk_update(batch, LIST_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0002_screening_result_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(encode_text_as_json, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+# GIN indexes back containment lookups such as categories__contains=['SDN'];
+# they are PostgreSQL-only, so other backends (SQLite in development) skip them
+GIN_INDEXES = (
+    ('sr_categories_gin', 'categories'),
+    ('sr_programs_gin', 'sanctions_programs'),
+)
+
+
+def create_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in GIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "screening_results" USING gin ("{column}")'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in GIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0003_encode_screening_result_lists'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='screeningresult',
+            name='categories',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='screeningresult',
+            name='sanctions_programs',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
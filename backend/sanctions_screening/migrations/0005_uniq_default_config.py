@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+def keep_latest_default(apps, schema_editor):
+    """Leave a single default configuration before the constraint is added"""
+    ScreeningConfiguration = apps.get_model('sanctions_screening', 'ScreeningConfiguration')
+    defaults = ScreeningConfiguration.objects.filter(is_default=True).order_by('-updated_at')
+    latest = defaults.values_list('pk', flat=True).first()
+    if latest is not None:
+        defaults.exclude(pk=latest).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0004_screening_result_json_lists'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_default, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='screeningconfiguration',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('is_default',), name='uniq_default_config'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+# The trigram index and the pg_trgm extension it needs are PostgreSQL-only;
+# other backends (SQLite in development) skip them
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS "sanctions_entity_name_trgm" '
+        'ON "sanctions_entities" USING gin ("name" gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "sanctions_entity_name_trgm"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0005_uniq_default_config'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SanctionsEntity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_code', models.CharField(max_length=50)),
+                ('entity_id', models.CharField(max_length=200)),
+                ('name', models.CharField(max_length=500)),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'sanctions_entities',
+                'indexes': [models.Index(fields=['source_code', 'entity_id'], name='sanctions_e_source__bf37f0_idx')],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
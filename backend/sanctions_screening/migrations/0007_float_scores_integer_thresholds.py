@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0006_sanctionsentity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='screeningresult',
+            name='confidence_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='screeningresult',
+            name='processing_time',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='screeningconfiguration',
+            name='exact_match_threshold',
+            field=models.PositiveSmallIntegerField(default=100, validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='screeningconfiguration',
+            name='fuzzy_match_threshold',
+            field=models.PositiveSmallIntegerField(default=85, validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='screeningconfiguration',
+            name='semantic_match_threshold',
+            field=models.PositiveSmallIntegerField(default=80, validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='screeningconfiguration',
+            name='phonetic_match_threshold',
+            field=models.PositiveSmallIntegerField(default=75, validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='screeningconfiguration',
+            name='high_risk_threshold',
+            field=models.PositiveSmallIntegerField(default=90, validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='screeningconfiguration',
+            name='medium_risk_threshold',
+            field=models.PositiveSmallIntegerField(default=70, validators=[django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
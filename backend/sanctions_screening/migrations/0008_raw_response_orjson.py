@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-16 09:00
+
+import ceres_project.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions_screening', '0007_float_scores_integer_thresholds'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='screeningresult',
+            name='raw_response',
+            field=models.JSONField(blank=True, decoder=ceres_project.utils.ORJSONDecoder, default=dict, encoder=ceres_project.utils.ORJSONEncoder),
+        ),
+    ]
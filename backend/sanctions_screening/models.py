@@ -2,7 +2,11 @@
 Sanctions Screening Models
 """
 import uuid
-from django.db import models
+from decimal import Decimal
+from django.core.validators import MaxValueValidator
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Round
+from ceres_project.utils import ORJSONDecoder, ORJSONEncoder
 from customer_enrollment.models import Customer
 
 class ScreeningSource(models.Model):
@@ -17,6 +21,13 @@ class ScreeningSource(models.Model):
         ('law_enforcement', 'Law Enforcement'),
     ]
     
+    # Columns exposed by ScreeningSourceSerializer; API/data URLs are omitted
+    SUMMARY_FIELDS = (
+        'id', 'name', 'code', 'source_type', 'jurisdiction', 'authority',
+        'license_type', 'reliability_score', 'is_active', 'is_available',
+        'last_updated', 'created_at', 'updated_at',
+    )
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200, unique=True)
     code = models.CharField(max_length=50, unique=True)
@@ -52,6 +63,28 @@ class ScreeningSource(models.Model):
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+class ScreeningResultQuerySet(models.QuerySet):
+    """
+    QuerySet for screening results
+    """
+    
+    def for_serialization(self):
+        """Join the relations read by ScreeningResultSerializer"""
+        return self.select_related('source', 'customer')
+    
+    def bulk_record(self, results, batch_size=1000):
+        """
+        Insert unsaved ScreeningResult instances with multi-row INSERTs
+        
+        Rows whose primary key already exists are skipped.
+        """
+        return self.bulk_create(results, batch_size=batch_size, ignore_conflicts=True)
+    
+    def bulk_refresh(self, results, fields=('confidence_score', 'matched_name', 'raw_response'),
+                     batch_size=1000):
+        """Write re-screened values back for existing results in batches"""
+        return self.bulk_update(results, fields, batch_size=batch_size)
+
 class ScreeningResult(models.Model):
     """
     Model for storing screening results
@@ -74,7 +107,7 @@ class ScreeningResult(models.Model):
     # Match information
     match_found = models.BooleanField(default=False)
     match_type = models.CharField(max_length=50, choices=MATCH_TYPE_CHOICES, blank=True)
-    confidence_score = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    confidence_score = models.FloatField(default=0)
     
     # Match details
     matched_name = models.CharField(max_length=300, blank=True)
@@ -83,29 +116,108 @@ class ScreeningResult(models.Model):
     
     # Additional data
     entity_type = models.CharField(max_length=100, blank=True)  # individual, entity, vessel, etc.
-    categories = models.TextField(blank=True)  # JSON stored as text
-    sanctions_programs = models.TextField(blank=True)  # JSON stored as text
+    # Lists of strings; GIN-indexed on PostgreSQL for __contains lookups
+    categories = models.JSONField(default=list, blank=True)
+    sanctions_programs = models.JSONField(default=list, blank=True)
     
     # Raw response
-    raw_response = models.JSONField(default=dict, blank=True)
+    raw_response = models.JSONField(
+        default=dict, blank=True, encoder=ORJSONEncoder, decoder=ORJSONDecoder
+    )
     
     # Processing metadata
-    processing_time = models.DecimalField(max_digits=8, decimal_places=3, default=0)
+    processing_time = models.FloatField(default=0)  # seconds
     api_version = models.CharField(max_length=50, blank=True)
     
     # Audit fields
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ScreeningResultQuerySet.as_manager()
+    
     class Meta:
         db_table = 'screening_results'
         indexes = [
             models.Index(fields=['customer', 'source']),
-            models.Index(fields=['match_found', 'confidence_score']),
+            models.Index(fields=['match_found', '-confidence_score'], name='sr_match_conf_desc'),
             models.Index(fields=['created_at']),
+            models.Index(fields=['customer', '-created_at'], name='sr_cust_created_idx'),
+            models.Index(
+                fields=['customer', 'source'],
+                condition=models.Q(match_found=True),
+                name='sr_matched_cust_src',
+            ),
         ]
     
     def __str__(self):
         return f"Screening result for {self.customer} in {self.source.name}"
+    
+    @classmethod
+    def summary_for_customer(cls, customer_id):
+        """
+        Screening summary for a customer in the ScreeningSummarySerializer shape
+        
+        Counts and scores come from a single conditional aggregate query.
+        """
+        matched = models.Q(match_found=True)
+        summary = cls.objects.filter(customer_id=customer_id).aggregate(
+            total_sources_checked=models.Count('source', distinct=True),
+            matches_found=models.Count('id', filter=matched),
+            high_risk_matches=models.Count('id', filter=matched & models.Q(confidence_score__gte=90)),
+            medium_risk_matches=models.Count(
+                'id', filter=matched & models.Q(confidence_score__gte=70, confidence_score__lt=90)
+            ),
+            low_risk_matches=models.Count('id', filter=matched & models.Q(confidence_score__lt=70)),
+            overall_risk_score=Coalesce(
+                models.Max('confidence_score', filter=matched), models.Value(0.0)
+            ),
+            last_screened=models.Max('created_at'),
+        )
+        
+        overall_risk_score = summary['overall_risk_score']
+        if overall_risk_score >= 90:
+            risk_level = 'high'
+        elif overall_risk_score >= 70:
+            risk_level = 'medium'
+        elif overall_risk_score > 0:
+            risk_level = 'low'
+        else:
+            risk_level = 'none'
+        
+        summary.update(
+            customer_id=customer_id,
+            risk_level=risk_level,
+            alerts_count=ScreeningAlert.objects.filter(
+                customer_id=customer_id, status='active'
+            ).count(),
+        )
+        return summary
+
+class ScreeningBatchQuerySet(models.QuerySet):
+    """
+    QuerySet for screening batches
+    """
+    
+    def with_progress(self):
+        """Annotate progress_percentage (0-100, two decimals) computed in SQL"""
+        return self.annotate(progress_percentage=models.Case(
+            models.When(total_customers=0, then=models.Value(Decimal('0'))),
+            default=Round(
+                models.ExpressionWrapper(
+                    models.F('processed_customers') * models.Value(Decimal('100.0'))
+                    / models.F('total_customers'),
+                    output_field=models.DecimalField(),
+                ),
+                2,
+            ),
+            output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        ))
+    
+    def for_serialization(self):
+        """Prefetch the sources and annotate the progress read by ScreeningBatchSerializer"""
+        return self.with_progress().prefetch_related(models.Prefetch(
+            'sources',
+            queryset=ScreeningSource.objects.only(*ScreeningSource.SUMMARY_FIELDS),
+        ))
 
 class ScreeningBatch(models.Model):
     """
@@ -145,6 +257,8 @@ class ScreeningBatch(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True)
     
+    objects = ScreeningBatchQuerySet.as_manager()
+    
     class Meta:
         db_table = 'screening_batches'
         indexes = [
@@ -154,6 +268,22 @@ class ScreeningBatch(models.Model):
     
     def __str__(self):
         return f"Screening batch: {self.name}"
+    
+    def record_progress(self, processed=1, matches=0):
+        """Atomically advance the progress counters without a read-modify-write"""
+        ScreeningBatch.objects.filter(pk=self.pk).update(
+            processed_customers=models.F('processed_customers') + processed,
+            matches_found=models.F('matches_found') + matches,
+        )
+
+class ScreeningAlertQuerySet(models.QuerySet):
+    """
+    QuerySet for screening alerts
+    """
+    
+    def for_serialization(self):
+        """Join the relations read by ScreeningAlertSerializer"""
+        return self.select_related('source', 'customer')
 
 class ScreeningAlert(models.Model):
     """
@@ -206,6 +336,8 @@ class ScreeningAlert(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ScreeningAlertQuerySet.as_manager()
+    
     class Meta:
         db_table = 'screening_alerts'
         indexes = [
@@ -218,6 +350,9 @@ class ScreeningAlert(models.Model):
     def __str__(self):
         return f"{self.alert_type} alert for {self.customer}"
 
+# Thresholds are whole percentages (0-100)
+PERCENTAGE_VALIDATORS = [MaxValueValidator(100)]
+
 class ScreeningConfiguration(models.Model):
     """
     Model for storing screening configuration and thresholds
@@ -227,17 +362,17 @@ class ScreeningConfiguration(models.Model):
     description = models.TextField(blank=True)
     
     # Threshold configuration
-    exact_match_threshold = models.DecimalField(max_digits=5, decimal_places=2, default=100.0)
-    fuzzy_match_threshold = models.DecimalField(max_digits=5, decimal_places=2, default=85.0)
-    semantic_match_threshold = models.DecimalField(max_digits=5, decimal_places=2, default=80.0)
-    phonetic_match_threshold = models.DecimalField(max_digits=5, decimal_places=2, default=75.0)
+    exact_match_threshold = models.PositiveSmallIntegerField(default=100, validators=PERCENTAGE_VALIDATORS)
+    fuzzy_match_threshold = models.PositiveSmallIntegerField(default=85, validators=PERCENTAGE_VALIDATORS)
+    semantic_match_threshold = models.PositiveSmallIntegerField(default=80, validators=PERCENTAGE_VALIDATORS)
+    phonetic_match_threshold = models.PositiveSmallIntegerField(default=75, validators=PERCENTAGE_VALIDATORS)
     
     # Source weights
     source_weights = models.JSONField(default=dict, blank=True)
     
     # Alert thresholds
-    high_risk_threshold = models.DecimalField(max_digits=5, decimal_places=2, default=90.0)
-    medium_risk_threshold = models.DecimalField(max_digits=5, decimal_places=2, default=70.0)
+    high_risk_threshold = models.PositiveSmallIntegerField(default=90, validators=PERCENTAGE_VALIDATORS)
+    medium_risk_threshold = models.PositiveSmallIntegerField(default=70, validators=PERCENTAGE_VALIDATORS)
     
     # Processing configuration
     max_concurrent_requests = models.PositiveIntegerField(default=10)
@@ -261,13 +396,78 @@ class ScreeningConfiguration(models.Model):
     
     class Meta:
         db_table = 'screening_configurations'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_default'],
+                condition=models.Q(is_default=True),
+                name='uniq_default_config',
+            ),
+        ]
     
     def save(self, *args, **kwargs):
-        # Ensure only one default configuration
-        if self.is_default:
-            ScreeningConfiguration.objects.filter(is_default=True).update(is_default=False)
-        super().save(*args, **kwargs)
+        # Ensure only one default configuration; uniq_default_config rejects a
+        # concurrent promotion that commits first
+        with transaction.atomic():
+            if self.is_default:
+                ScreeningConfiguration.objects.filter(
+                    is_default=True
+                ).exclude(pk=self.pk).update(is_default=False)
+            super().save(*args, **kwargs)
     
     def __str__(self):
         return self.name
 
+class SanctionsEntityQuerySet(models.QuerySet):
+    """
+    QuerySet for indexed sanctions list names
+    """
+    
+    def trigram_candidates(self, name):
+        """
+        Names sharing enough trigrams with `name` to be worth scoring, most similar first
+        
+        Uses the trigram_similar lookup (pg_trgm.similarity_threshold, 0.3 by
+        default) only as a prefilter, so PostgreSQL can use the gin_trgm_ops
+        index; callers score the candidates themselves. Requires PostgreSQL with
+        the pg_trgm extension.
+        """
+        from django.contrib.postgres.search import TrigramSimilarity
+        return self.filter(name__trigram_similar=name).annotate(
+            similarity=TrigramSimilarity('name', name)
+        ).order_by('-similarity', 'pk')
+    
+    def replace_source(self, source_code, rows, batch_size=1000):
+        """Atomically replace every indexed name of a source with `rows`"""
+        with transaction.atomic():
+            self.filter(source_code=source_code).delete()
+            return self.bulk_create(
+                (SanctionsEntity(source_code=source_code, **row) for row in rows),
+                batch_size=batch_size,
+            )
+
+class SanctionsEntity(models.Model):
+    """
+    One searchable name (primary name or alias) of a sanctions list entity
+    
+    Rows are refreshed per source by the update_screening_source task; pg_trgm
+    narrows a search to candidate names instead of scanning lists in Python.
+    """
+    source_code = models.CharField(max_length=50)
+    entity_id = models.CharField(max_length=200)
+    name = models.CharField(max_length=500)
+    
+    # Match fields returned by the source's search(), shared by all names of an entity
+    details = models.JSONField(default=dict, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = SanctionsEntityQuerySet.as_manager()
+    
+    class Meta:
+        db_table = 'sanctions_entities'
+        indexes = [
+            models.Index(fields=['source_code', 'entity_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.source_code} {self.entity_id})"
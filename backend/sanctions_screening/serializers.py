@@ -20,6 +20,9 @@ class ScreeningSourceSerializer(serializers.ModelSerializer):
 class ScreeningResultSerializer(serializers.ModelSerializer):
     """
     Serializer for screening results
+    
+    List views must pass ScreeningResult.objects.for_serialization() so the
+    nested source is joined instead of fetched per row.
     """
     source = ScreeningSourceSerializer(read_only=True)
     
@@ -36,9 +39,13 @@ class ScreeningResultSerializer(serializers.ModelSerializer):
 class ScreeningBatchSerializer(serializers.ModelSerializer):
     """
     Serializer for screening batches
+    
+    List views must pass ScreeningBatch.objects.for_serialization() so the
+    sources are prefetched in one query instead of one per batch and
+    progress_percentage is annotated by the database.
     """
     sources = ScreeningSourceSerializer(many=True, read_only=True)
-    progress_percentage = serializers.SerializerMethodField()
+    progress_percentage = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
     
     class Meta:
         model = ScreeningBatch
@@ -52,16 +59,13 @@ class ScreeningBatchSerializer(serializers.ModelSerializer):
             'id', 'total_customers', 'processed_customers', 'matches_found',
             'started_at', 'completed_at', 'estimated_completion', 'created_at'
         ]
-    
-    def get_progress_percentage(self, obj):
-        """Calculate progress percentage"""
-        if obj.total_customers == 0:
-            return 0
-        return round((obj.processed_customers / obj.total_customers) * 100, 2)
 
 class ScreeningAlertSerializer(serializers.ModelSerializer):
     """
     Serializer for screening alerts
+    
+    List views must pass ScreeningAlert.objects.for_serialization() so the
+    customer and source are joined instead of fetched per row.
     """
     customer_name = serializers.SerializerMethodField()
     source_name = serializers.SerializerMethodField()
@@ -79,9 +83,7 @@ class ScreeningAlertSerializer(serializers.ModelSerializer):
     
     def get_customer_name(self, obj):
         """Get customer name if available"""
-        if obj.customer and hasattr(obj.customer, 'personal_data'):
-            return obj.customer.personal_data.full_name
-        return None
+        return obj.customer.full_name if obj.customer else None
     
     def get_source_name(self, obj):
         """Get source name if available"""
@@ -148,7 +150,7 @@ class ScreeningSummarySerializer(serializers.Serializer):
     medium_risk_matches = serializers.IntegerField()
     low_risk_matches = serializers.IntegerField()
     last_screened = serializers.DateTimeField()
-    overall_risk_score = serializers.DecimalField(max_digits=5, decimal_places=2)
+    overall_risk_score = serializers.FloatField()
     risk_level = serializers.CharField()
     alerts_count = serializers.IntegerField()
     
@@ -159,7 +161,7 @@ class ScreeningMatchSerializer(serializers.Serializer):
     source_name = serializers.CharField()
     source_code = serializers.CharField()
     matched_name = serializers.CharField()
-    confidence_score = serializers.DecimalField(max_digits=5, decimal_places=2)
+    confidence_score = serializers.FloatField()
     match_type = serializers.CharField()
     entity_type = serializers.CharField()
     categories = serializers.ListField(child=serializers.CharField())
@@ -3,7 +3,10 @@ Unified Data Source Manager for CERES Screening
 Manages all screening sources and provides unified search interface
 """
 import asyncio
+import copy
 import logging
+import time
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
@@ -11,9 +14,51 @@ from .ofac_source import OFACScreeningSource
 from .un_source import UNScreeningSource
 from .eu_source import EUScreeningSource
 from .opensanctions_source import OpenSanctionsSource
+from .normalization import normalize_query
 
 logger = logging.getLogger('ceres.screening.manager')
 
+# Source names searched for each requested source type
+_SOURCE_TYPE_MAP: Dict[str, tuple] = {
+    'sanctions': ('ofac', 'un', 'eu'),
+    'pep': ('opensanctions',),
+    'corporate': ('opensanctions',),
+}
+
+@dataclass(slots=True)
+class SourceSearchResult:
+    """
+    Outcome of searching a single source
+    
+    Convert with dataclasses.asdict() where a plain dict is needed, e.g. when
+    handing results to a serializer.
+    """
+    success: bool
+    matches: List[Dict[str, Any]]
+    processing_time: float
+    source: str
+    error: Optional[str] = None
+
+# Source classes by name, in initialization order
+SOURCE_CLASSES = {
+    'ofac': OFACScreeningSource,
+    'un': UNScreeningSource,
+    'eu': EUScreeningSource,
+    'opensanctions': OpenSanctionsSource,
+}
+
+def build_source(source_name: str, config: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Instantiate a single screening source by name
+    
+    The source still has to be entered with ``async with`` before use.
+    """
+    config = config or {}
+    kwargs = {'cache_duration_hours': config.get(f'{source_name}_cache_hours', 24)}
+    if source_name == 'opensanctions':
+        kwargs['api_key'] = config.get('opensanctions_api_key')
+    return SOURCE_CLASSES[source_name](**kwargs)
+
 class DataSourceManager:
     """
     Unified manager for all screening data sources
@@ -24,35 +69,24 @@ class DataSourceManager:
         self.config = config or {}
         self.sources = {}
         self.source_status = {}
+        self._semaphore = asyncio.Semaphore(self.config.get('max_concurrent_requests', 10))
+        self.request_timeout = self.config.get('request_timeout', 30)
+        # Recent search results and in-flight searches, keyed by
+        # (source_name, normalized query, threshold)
+        self.search_cache_ttl = self.config.get('search_cache_ttl_s', 300)
+        self.search_cache_size = self.config.get('search_cache_size', 1024)
+        self._search_cache: Dict[tuple, tuple] = {}
+        self._inflight_searches: Dict[tuple, asyncio.Future] = {}
+        # (time.monotonic() timestamp, statistics) from get_source_statistics
+        self.stats_cache_ttl = self.config.get('stats_cache_ttl_s', 10)
+        self._stats_cache: Optional[tuple] = None
     
     async def __aenter__(self):
         """Initialize all data sources"""
         try:
-            # Initialize OFAC source
-            self.sources['ofac'] = OFACScreeningSource(
-                cache_duration_hours=self.config.get('ofac_cache_hours', 24)
-            )
-            await self.sources['ofac'].__aenter__()
-            
-            # Initialize UN source
-            self.sources['un'] = UNScreeningSource(
-                cache_duration_hours=self.config.get('un_cache_hours', 24)
-            )
-            await self.sources['un'].__aenter__()
-            
-            # Initialize EU source
-            self.sources['eu'] = EUScreeningSource(
-                cache_duration_hours=self.config.get('eu_cache_hours', 24)
-            )
-            await self.sources['eu'].__aenter__()
-            
-            # Initialize OpenSanctions source
-            opensanctions_api_key = self.config.get('opensanctions_api_key')
-            self.sources['opensanctions'] = OpenSanctionsSource(
-                api_key=opensanctions_api_key,
-                cache_duration_hours=self.config.get('opensanctions_cache_hours', 24)
-            )
-            await self.sources['opensanctions'].__aenter__()
+            for source_name in SOURCE_CLASSES:
+                self.sources[source_name] = build_source(source_name, self.config)
+                await self.sources[source_name].__aenter__()
             
             logger.info("All screening sources initialized")
             return self
@@ -90,14 +124,19 @@ class DataSourceManager:
         for source_name, source in self.sources.items():
             try:
                 logger.info(f"Updating {source_name} source...")
+                start_time = time.perf_counter()
                 success = await source.update_data(force_refresh=force_refresh)
                 results[source_name] = success
                 self.source_status[source_name] = {
                     'status': 'active' if success else 'error',
                     'last_update': datetime.now().isoformat(),
+                    'update_time': time.perf_counter() - start_time,
                     'error': None if success else 'Update failed'
                 }
-                logger.info(f"{source_name} update: {'success' if success else 'failed'}")
+                logger.info(
+                    f"{source_name} update: {'success' if success else 'failed'} "
+                    f"in {self.source_status[source_name]['update_time']:.2f}s"
+                )
                 
             except Exception as e:
                 logger.error(f"Failed to update {source_name}: {e}")
@@ -108,10 +147,14 @@ class DataSourceManager:
                     'error': str(e)
                 }
         
+        # Cached matches and statistics may be stale now that the lists are refreshed
+        self._search_cache.clear()
+        self._stats_cache = None
+        
         return results
     
     async def search_all_sources(self, query: str, source_types: Optional[List[str]] = None, 
-                                threshold: int = 80) -> Dict[str, Dict[str, Any]]:
+                                threshold: int = 80) -> Dict[str, SourceSearchResult]:
         """
         Search across all or specified sources
         
@@ -124,79 +167,136 @@ class DataSourceManager:
             Dict mapping source names to search results
         """
         results = {}
+        normalized_query = normalize_query(query)
         
         # Determine which sources to search
         sources_to_search = self.sources.keys()
         if source_types:
-            # Map source types to actual sources
-            type_mapping = {
-                'sanctions': ['ofac', 'un', 'eu'],
-                'pep': ['opensanctions'],
-                'corporate': ['opensanctions']
-            }
-            
-            sources_to_search = set()
-            for source_type in source_types:
-                sources_to_search.update(type_mapping.get(source_type, []))
+            # Map source types to actual sources, de-duplicated in request order
+            sources_to_search = dict.fromkeys(
+                name
+                for source_type in source_types
+                for name in _SOURCE_TYPE_MAP.get(source_type, ())
+            )
         
-        # Search each source
+        # Search each source, keeping the dispatched names in the same order
+        # as the tasks so results are attributed to the right source
+        dispatched_names = []
         search_tasks = []
         for source_name in sources_to_search:
             if source_name in self.sources:
-                task = self._search_source_with_error_handling(
-                    source_name, self.sources[source_name], query, threshold
-                )
-                search_tasks.append(task)
-        
+                dispatched_names.append(source_name)
+                search_tasks.append(self._search_source_with_error_handling(
+                    source_name, self.sources[source_name], query, threshold,
+                    normalized_query
+                ))
+
         # Execute searches concurrently
         if search_tasks:
             search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
-            
+
             # Process results
-            for i, (source_name, result) in enumerate(zip(sources_to_search, search_results)):
-                if isinstance(result, Exception):
-                    logger.error(f"Search failed for {source_name}: {result}")
-                    results[source_name] = {
-                        'success': False,
-                        'error': str(result),
-                        'matches': [],
-                        'processing_time': 0
-                    }
+            for source_name, result in zip(dispatched_names, search_results):
+                # BaseException also catches a search's CancelledError
+                if isinstance(result, BaseException):
+                    error = str(result) or type(result).__name__
+                    logger.error(f"Search failed for {source_name}: {error}")
+                    results[source_name] = SourceSearchResult(
+                        success=False,
+                        error=error,
+                        matches=[],
+                        processing_time=0,
+                        source=source_name
+                    )
                 else:
                     results[source_name] = result
         
         return results
     
     async def _search_source_with_error_handling(self, source_name: str, source: Any, 
-                                               query: str, threshold: int) -> Dict[str, Any]:
+                                               query: str, threshold: int,
+                                               normalized_query: Optional[str] = None) -> SourceSearchResult:
+        """
+        Search individual source, reusing recent and in-flight identical searches
+        
+        Successful results are cached for search_cache_ttl seconds; concurrent
+        identical searches share a single request to the source. If the search
+        making that request is cancelled, the others search again.
+        """
+        if normalized_query is None:
+            normalized_query = normalize_query(query)
+        key = (source_name, normalized_query, threshold)
+        
+        cached = self._search_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.search_cache_ttl:
+            return copy.deepcopy(cached[1])
+        
+        inflight = self._inflight_searches.get(key)
+        if inflight is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                # Only the search that owned the request was cancelled; run it again
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            return await self._search_source_with_error_handling(
+                source_name, source, query, threshold, normalized_query
+            )
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_searches[key] = future
+        try:
+            result = await self._search_source(source_name, source, query, threshold, normalized_query)
+            if result.success:
+                self._cache_search_result(key, result)
+            future.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            del self._inflight_searches[key]
+            if not future.done():
+                future.cancel()
+    
+    def _cache_search_result(self, key: tuple, result: SourceSearchResult):
+        """Store a search result, evicting the oldest entries beyond search_cache_size"""
+        self._search_cache.pop(key, None)
+        self._search_cache[key] = (time.monotonic(), result)
+        while len(self._search_cache) > self.search_cache_size:
+            del self._search_cache[next(iter(self._search_cache))]
+    
+    async def _search_source(self, source_name: str, source: Any, query: str,
+                             threshold: int, normalized_query: str) -> SourceSearchResult:
         """Search individual source with error handling and timing"""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
-            matches = await source.search(query, threshold=threshold)
-            processing_time = (datetime.now() - start_time).total_seconds()
+            async with self._semaphore:
+                matches = await asyncio.wait_for(
+                    source.search(query, threshold=threshold, normalized_query=normalized_query),
+                    timeout=self.request_timeout
+                )
+            processing_time = time.perf_counter() - start_time
             
-            return {
-                'success': True,
-                'matches': matches,
-                'processing_time': processing_time,
-                'source': source_name
-            }
+            return SourceSearchResult(
+                success=True,
+                matches=matches,
+                processing_time=processing_time,
+                source=source_name
+            )
             
         except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             logger.error(f"Search failed for {source_name}: {e}")
             
-            return {
-                'success': False,
-                'error': str(e),
-                'matches': [],
-                'processing_time': processing_time,
-                'source': source_name
-            }
+            return SourceSearchResult(
+                success=False,
+                error=str(e),
+                matches=[],
+                processing_time=processing_time,
+                source=source_name
+            )
     
     async def search_specific_source(self, source_name: str, query: str, 
-                                   threshold: int = 80) -> Dict[str, Any]:
+                                   threshold: int = 80) -> SourceSearchResult:
         """
         Search specific source
         
@@ -209,19 +309,24 @@ class DataSourceManager:
             Search results from specified source
         """
         if source_name not in self.sources:
-            return {
-                'success': False,
-                'error': f'Source {source_name} not available',
-                'matches': [],
-                'processing_time': 0
-            }
+            return SourceSearchResult(
+                success=False,
+                error=f'Source {source_name} not available',
+                matches=[],
+                processing_time=0,
+                source=source_name
+            )
         
         return await self._search_source_with_error_handling(
             source_name, self.sources[source_name], query, threshold
         )
     
     def get_source_statistics(self) -> Dict[str, Any]:
-        """Get statistics for all sources"""
+        """Get statistics for all sources, reusing results up to stats_cache_ttl seconds old"""
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache[0] < self.stats_cache_ttl:
+            return copy.deepcopy(self._stats_cache[1])
+        
         stats = {
             'sources': {},
             'total_sources': len(self.sources),
@@ -246,7 +351,8 @@ class DataSourceManager:
                     'status': self.source_status.get(source_name, {})
                 }
         
-        return stats
+        self._stats_cache = (now, stats)
+        return copy.deepcopy(stats)
     
     def get_available_sources(self) -> List[str]:
         """Get list of available source names"""
@@ -283,12 +389,12 @@ async def test_data_source_manager():
         search_results = await manager.search_all_sources("Vladimir Putin")
         
         for source_name, result in search_results.items():
-            if result['success']:
-                print(f"{source_name}: {len(result['matches'])} matches in {result['processing_time']:.2f}s")
-                for match in result['matches'][:2]:  # Show top 2 matches
+            if result.success:
+                print(f"{source_name}: {len(result.matches)} matches in {result.processing_time:.2f}s")
+                for match in result.matches[:2]:  # Show top 2 matches
                     print(f"  - {match['name']} ({match['confidence']}%)")
             else:
-                print(f"{source_name}: Error - {result['error']}")
+                print(f"{source_name}: Error - {result.error}")
 
 if __name__ == "__main__":
     asyncio.run(test_data_source_manager())
@@ -4,17 +4,23 @@ European Union Consolidated Financial Sanctions List
 """
 import requests
 import logging
+import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from dataclasses import dataclass
-from fuzzywuzzy import fuzz
 import asyncio
 import aiohttp
-import xml.etree.ElementTree as ET
+
+from .indexed_search import search_indexed
+from .name_index import NameIndex
+from .normalization import normalize_query
+from .xml_parsing import CHUNK_SIZE, ET, ElementStream, default_namespace
 
 logger = logging.getLogger('ceres.screening.eu')
 
-@dataclass
+EU_NAMESPACE = 'http://eu.europa.ec/fpi/fsd/export'
+
+@dataclass(slots=True)
 class EUEntity:
     """EU entity data structure"""
     logical_id: str
@@ -44,6 +50,7 @@ class EUScreeningSource:
     def __init__(self, cache_duration_hours: int = 24):
         self.cache_duration = timedelta(hours=cache_duration_hours)
         self.entities: Dict[str, EUEntity] = {}
+        self.name_index = NameIndex({})
         self.last_updated: Optional[datetime] = None
         self.session: Optional[aiohttp.ClientSession] = None
     
@@ -87,6 +94,7 @@ class EUScreeningSource:
             
             if entities:
                 self.entities = entities
+                self.name_index = NameIndex(self.entities)
                 self.last_updated = datetime.now()
                 logger.info(f"EU data updated successfully: {len(self.entities)} entities")
                 return True
@@ -105,36 +113,34 @@ class EUScreeningSource:
                 if response.status != 200:
                     raise Exception(f"HTTP {response.status} for {url}")
                 
-                xml_content = await response.text()
+                # Parse entities as the body arrives rather than after the download
+                entities = {}
+                stream = ElementStream('sanctionEntity')
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    entities.update(self._parse_eu_xml(stream.feed(chunk)))
+                entities.update(self._parse_eu_xml(stream.close()))
                 
-            # Parse XML
-            root = ET.fromstring(xml_content)
-            return self._parse_eu_xml(root)
+            logger.info(f"Parsed {len(entities)} EU entities")
+            return entities
             
         except Exception as e:
             logger.error(f"Failed to download/parse EU XML: {e}")
             return {}
     
-    def _parse_eu_xml(self, root: ET.Element) -> Dict[str, EUEntity]:
-        """Parse EU sanctions XML"""
+    def _parse_eu_xml(self, entity_elems: Iterable[ET.Element]) -> Dict[str, EUEntity]:
+        """Parse the sanctionEntity elements of EU sanctions XML"""
         entities = {}
         
         # Define namespace
-        ns = {'': 'http://eu.europa.ec/fpi/fsd/export'}
+        ns = default_namespace(EU_NAMESPACE)
         
-        try:
-            # Parse sanctioned entities
-            for entity_elem in root.findall('.//sanctionEntity', ns):
-                entity = self._parse_entity_element(entity_elem, ns)
-                if entity:
-                    entities[entity.logical_id] = entity
-            
-            logger.info(f"Parsed {len(entities)} EU entities")
-            return entities
-            
-        except Exception as e:
-            logger.error(f"Failed to parse EU XML: {e}")
-            return {}
+        # Parse sanctioned entities
+        for entity_elem in entity_elems:
+            entity = self._parse_entity_element(entity_elem, ns)
+            if entity:
+                entities[entity.logical_id] = entity
+        
+        return entities
     
     def _parse_entity_element(self, entity_elem: ET.Element, ns: Dict[str, str]) -> Optional[EUEntity]:
         """Parse individual entity element"""
@@ -145,7 +151,7 @@ class EUScreeningSource:
                 return None
             
             # Get entity type
-            entity_type = entity_elem.get('entityType', 'Unknown')
+            entity_type = sys.intern(entity_elem.get('entityType', 'Unknown'))
             
             # Get regulation info
             regulation_elem = entity_elem.find('regulation', ns)
@@ -154,8 +160,8 @@ class EUScreeningSource:
             regulation_entry_date = ''
             
             if regulation_elem is not None:
-                regulation_type = regulation_elem.get('regulationType', '')
-                regulation_programme = regulation_elem.get('programme', '')
+                regulation_type = sys.intern(regulation_elem.get('regulationType', ''))
+                regulation_programme = sys.intern(regulation_elem.get('programme', ''))
                 regulation_entry_date = regulation_elem.get('entryIntoForceDate', '')
             
             # Get names and aliases
@@ -185,7 +191,7 @@ class EUScreeningSource:
                 for field in ['street', 'city', 'zipCode', 'region', 'countryIso2Code']:
                     value = address_elem.get(field, '').strip()
                     if value:
-                        address[field] = value
+                        address[field] = sys.intern(value) if field == 'countryIso2Code' else value
                 
                 if address:
                     addresses.append(address)
@@ -194,7 +200,7 @@ class EUScreeningSource:
             identifiers = []
             for identification in entity_elem.findall('.//identification', ns):
                 identifier = {
-                    'type': identification.get('identificationTypeCode', ''),
+                    'type': sys.intern(identification.get('identificationTypeCode', '')),
                     'number': identification.get('number', ''),
                     'diplomatic': identification.get('diplomatic', ''),
                     'latin_script': identification.get('latinScript', '')
@@ -222,7 +228,7 @@ class EUScreeningSource:
             for citizenship in entity_elem.findall('.//citizenship', ns):
                 citizenship_value = citizenship.get('countryIso2Code', '').strip()
                 if citizenship_value:
-                    citizenships.append(citizenship_value)
+                    citizenships.append(sys.intern(citizenship_value))
             
             # Get design details (reasons for listing)
             design_details = ''
@@ -250,20 +256,28 @@ class EUScreeningSource:
             logger.warning(f"Failed to parse EU entity: {e}")
             return None
     
-    async def search(self, query: str, threshold: int = 80) -> List[Dict[str, Any]]:
+    async def search(self, query: str, threshold: int = 80,
+                     normalized_query: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search EU entities for matches
         
         Args:
             query: Search query (name)
             threshold: Minimum fuzzy match score (0-100)
+            normalized_query: Query already passed through normalize_query
             
         Returns:
             List of matching entities with confidence scores
         """
         try:
-            # Ensure data is loaded
+            query_lower = normalized_query if normalized_query is not None else normalize_query(query)
+            
+            # Ensure data is loaded; prefer the database index kept current by
+            # the update_screening_source task over downloading the list here
             if not self.entities:
+                indexed = await search_indexed('eu', query_lower, threshold)
+                if indexed is not None:
+                    return indexed
                 await self.update_data()
             
             if not self.entities:
@@ -271,44 +285,12 @@ class EUScreeningSource:
                 return []
             
             matches = []
-            query_lower = query.lower().strip()
             
-            for logical_id, entity in self.entities.items():
-                # Check primary name
-                name_score = fuzz.ratio(query_lower, entity.name.lower())
-                
-                # Check aliases
-                alias_scores = []
-                for alias in entity.aliases:
-                    alias_score = fuzz.ratio(query_lower, alias.lower())
-                    alias_scores.append(alias_score)
-                
-                # Get best score
-                best_score = max([name_score] + alias_scores) if alias_scores else name_score
-                
-                if best_score >= threshold:
-                    match = {
-                        'entity_id': logical_id,
-                        'name': entity.name,
-                        'matched_name': entity.name if name_score == best_score else 
-                                      max(entity.aliases, key=lambda x: fuzz.ratio(query_lower, x.lower())),
-                        'confidence': best_score,
-                        'entity_type': entity.entity_type,
-                        'programs': [entity.regulation_programme] if entity.regulation_programme else [],
-                        'list_type': 'EU_SANCTIONS',
-                        'regulation_type': entity.regulation_type,
-                        'entry_into_force_date': entity.regulation_entry_into_force_date,
-                        'addresses': entity.addresses,
-                        'identifiers': entity.identifiers,
-                        'aliases': entity.aliases,
-                        'birth_dates': entity.birth_dates,
-                        'birth_places': entity.birth_places,
-                        'citizenships': entity.citizenships,
-                        'design_details': entity.design_details,
-                        'match_type': 'fuzzy',
-                        'source': 'EU'
-                    }
-                    matches.append(match)
+            for entity_id, matched_name, score in self.name_index.search(query_lower, threshold):
+                match = self._entity_payload(entity_id, self.entities[entity_id])
+                match['matched_name'] = matched_name
+                match['confidence'] = score
+                matches.append(match)
             
             # Sort by confidence score (highest first)
             matches.sort(key=lambda x: x['confidence'], reverse=True)
@@ -320,6 +302,35 @@ class EUScreeningSource:
             logger.error(f"EU search failed: {e}")
             return []
     
+    def _entity_payload(self, entity_id: str, entity: EUEntity) -> Dict[str, Any]:
+        """Match fields describing an entity, without the per-query score"""
+        return {
+            'entity_id': entity_id,
+            'name': entity.name,
+            'entity_type': entity.entity_type,
+            'programs': [entity.regulation_programme] if entity.regulation_programme else [],
+            'list_type': 'EU_SANCTIONS',
+            'regulation_type': entity.regulation_type,
+            'entry_into_force_date': entity.regulation_entry_into_force_date,
+            'addresses': entity.addresses,
+            'identifiers': entity.identifiers,
+            'aliases': entity.aliases,
+            'birth_dates': entity.birth_dates,
+            'birth_places': entity.birth_places,
+            'citizenships': entity.citizenships,
+            'design_details': entity.design_details,
+            'match_type': 'fuzzy',
+            'source': 'EU'
+        }
+    
+    def iter_index_rows(self):
+        """Yield one searchable row per entity name and alias for SanctionsEntity"""
+        for entity_id, entity in self.entities.items():
+            details = self._entity_payload(entity_id, entity)
+            for name in dict.fromkeys([entity.name, *entity.aliases]):
+                if name:
+                    yield {'entity_id': entity_id, 'name': name, 'details': details}
+    
     def _is_cache_valid(self) -> bool:
         """Check if cached data is still valid"""
         if not self.last_updated or not self.entities:
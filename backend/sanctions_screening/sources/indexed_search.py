@@ -0,0 +1,75 @@
+"""
+Database-backed name search for list screening sources
+Narrows the SanctionsEntity table with pg_trgm, then scores like the in-memory lists
+"""
+import logging
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+
+from .name_index import NameIndex
+
+logger = logging.getLogger('ceres.screening.indexed')
+
+async def search_indexed(source_code: str, normalized_query: str, threshold: int = 80,
+                         limit: int = 500) -> Optional[List[Dict[str, Any]]]:
+    """
+    Search the indexed names of a source
+
+    Trigram similarity only selects candidate names; they are scored with
+    the same NameIndex ratio as the source's in-memory search, so threshold
+    and confidence mean the same on both paths. Names below the trigram
+    prefilter are never scored, so at thresholds well under the default 80
+    the index can return fewer matches than a full scan.
+
+    Args:
+        source_code: Source name the rows were stored under (ofac, un, eu)
+        normalized_query: Search query passed through normalize_query
+        threshold: Minimum fuzzy match score (0-100)
+        limit: Maximum number of candidate names to score
+
+    Returns:
+        Matches in the source's search() format, best first, or None when
+        the index cannot be used (not PostgreSQL, or the source has no rows)
+    """
+    return await sync_to_async(_search_indexed)(source_code, normalized_query, threshold, limit)
+
+def _search_indexed(source_code: str, normalized_query: str, threshold: int,
+                    limit: int) -> Optional[List[Dict[str, Any]]]:
+    from django.db import connection
+    from sanctions_screening.models import SanctionsEntity
+
+    if connection.vendor != 'postgresql':
+        return None
+
+    entities = SanctionsEntity.objects.filter(source_code=source_code)
+    rows = list(
+        entities.trigram_candidates(normalized_query)
+        .values_list('pk', 'entity_id', 'name', 'details')[:limit]
+    )
+    if not rows and not entities.exists():
+        return None
+
+    # Rebuild each candidate entity's names in stored order (primary name
+    # first, as iter_index_rows writes them) so ties resolve as in memory
+    candidates: Dict[str, SimpleNamespace] = {}
+    for _, entity_id, name, details in sorted(rows):
+        candidate = candidates.get(entity_id)
+        if candidate is None:
+            candidates[entity_id] = SimpleNamespace(name=name, aliases=[], details=details)
+        else:
+            candidate.aliases.append(name)
+
+    matches = []
+    for entity_id, matched_name, score in NameIndex(candidates).search(normalized_query, threshold):
+        match = dict(candidates[entity_id].details)
+        match['matched_name'] = matched_name
+        match['confidence'] = score
+        matches.append(match)
+
+    # Sort by confidence score (highest first)
+    matches.sort(key=lambda x: x['confidence'], reverse=True)
+
+    logger.info(f"Indexed {source_code} search for '{normalized_query}' returned {len(matches)} matches")
+    return matches
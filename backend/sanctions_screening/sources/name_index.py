@@ -0,0 +1,101 @@
+"""
+Flat name index for batch fuzzy scoring of list screening sources
+"""
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+    from rapidfuzz import fuzz, process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+
+def indel_ratio(s1: str, s2: str) -> float:
+    """
+    Normalized Indel similarity (0-100), the same score as rapidfuzz's fuzz.ratio
+    """
+    total = len(s1) + len(s2)
+    if not total:
+        return 100.0
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(s2) + 1)
+    for char in s1:
+        current = [0]
+        for j, other in enumerate(s2):
+            current.append(previous[j] + 1 if char == other else max(previous[j + 1], current[j]))
+        previous = current
+    distance = total - 2 * previous[-1]
+    return 100 * (1 - distance / total)
+
+
+class NameIndex:
+    """
+    Every primary name and alias of a source's entities in flat parallel arrays
+
+    Built once per list refresh so a search scores the query against all
+    names in a single rapidfuzz cdist call instead of one call per name.
+    Names are lowercased here, never per query, and each name maps to its
+    entity by position in entity_ids so per-entity bests reduce in numpy.
+    Without rapidfuzz and numpy, names are scored one by one with indel_ratio.
+    """
+
+    def __init__(self, entities: Dict[str, object]):
+        labels: List[str] = []
+        owners: List[int] = []
+        for position, entity in enumerate(entities.values()):
+            # Primary name first, so it wins ties against its aliases
+            for name in dict.fromkeys([entity.name, *entity.aliases]):
+                if name:
+                    labels.append(name)
+                    owners.append(position)
+        self.entity_ids = list(entities)
+        self.labels = labels
+        self.names = [name.lower() for name in labels]
+        self.owners = np.asarray(owners, dtype=np.int32) if HAS_RAPIDFUZZ else owners
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, normalized_query: str, threshold: int) -> List[Tuple[str, str, float]]:
+        """
+        Best-scoring name of each entity scoring at least threshold
+
+        Returns:
+            (entity_id, matched_name, score) tuples, in index order
+        """
+        if not self.names:
+            return []
+        if not HAS_RAPIDFUZZ:
+            return self._search_names(normalized_query, threshold)
+
+        scores = process.cdist(
+            [normalized_query], self.names,
+            scorer=fuzz.ratio, score_cutoff=threshold, workers=-1
+        )[0]
+
+        entity_scores = np.zeros(len(self.entity_ids), dtype=scores.dtype)
+        np.maximum.at(entity_scores, self.owners, scores)
+
+        # Names holding their entity's best score; owners are grouped in
+        # index order, so np.unique picks the earliest such name per entity
+        hits = np.flatnonzero((scores >= threshold) & (scores == entity_scores[self.owners]))
+        hit_owners, first = np.unique(self.owners[hits], return_index=True)
+
+        return [
+            (self.entity_ids[owner], self.labels[i], round(float(scores[i]), 2))
+            for owner, i in zip(hit_owners, hits[first])
+        ]
+
+    def _search_names(self, normalized_query: str, threshold: int) -> List[Tuple[str, str, float]]:
+        best: Dict[int, Tuple[float, int]] = {}
+        for i, (name, owner) in enumerate(zip(self.names, self.owners)):
+            score = indel_ratio(normalized_query, name)
+            # Strictly greater, so the earliest of equal names is kept
+            if score >= threshold and (owner not in best or score > best[owner][0]):
+                best[owner] = (score, i)
+
+        return [
+            (self.entity_ids[owner], self.labels[i], round(score, 2))
+            for owner, (score, i) in sorted(best.items())
+        ]
@@ -0,0 +1,12 @@
+"""
+Query normalization shared by the screening sources
+"""
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a search query, as compared against lowercased list names
+
+    DataSourceManager normalizes once per search and passes the result to
+    every source; sources fall back to calling this themselves.
+    """
+    return query.lower().strip()
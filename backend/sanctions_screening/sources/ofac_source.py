@@ -2,19 +2,23 @@
 OFAC Consolidated Screening Source Implementation
 Office of Foreign Assets Control - US Treasury Department
 """
-import xml.etree.ElementTree as ET
 import requests
 import logging
+import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from dataclasses import dataclass
-from fuzzywuzzy import fuzz
 import asyncio
 import aiohttp
 
+from .indexed_search import search_indexed
+from .name_index import NameIndex
+from .normalization import normalize_query
+from .xml_parsing import CHUNK_SIZE, ET, ElementStream, parse_xml, xml_namespace
+
 logger = logging.getLogger('ceres.screening.ofac')
 
-@dataclass
+@dataclass(slots=True)
 class OFACEntity:
     """OFAC entity data structure"""
     uid: str
@@ -45,6 +49,7 @@ class OFACScreeningSource:
     def __init__(self, cache_duration_hours: int = 24):
         self.cache_duration = timedelta(hours=cache_duration_hours)
         self.entities: Dict[str, OFACEntity] = {}
+        self.name_index = NameIndex({})
         self.last_updated: Optional[datetime] = None
         self.session: Optional[aiohttp.ClientSession] = None
     
@@ -93,6 +98,7 @@ class OFACScreeningSource:
             
             if all_entities:
                 self.entities = all_entities
+                self.name_index = NameIndex(self.entities)
                 self.last_updated = datetime.now()
                 logger.info(f"OFAC data updated successfully: {len(self.entities)} total entities")
                 return True
@@ -113,18 +119,21 @@ class OFACScreeningSource:
                 if response.status != 200:
                     raise Exception(f"HTTP {response.status} for {url}")
                 
-                xml_content = await response.text()
+                # Entity lists are parsed entry by entry as the body arrives
+                if list_type in ['consolidated', 'sectoral', 'non_sdn']:
+                    stream = ElementStream('sdnEntry')
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        entities.update(self._parse_sdn_xml(stream.feed(chunk), list_type))
+                    entities.update(self._parse_sdn_xml(stream.close(), list_type))
+                    return entities
+                
+                xml_content = await response.read()
                 
-            # Parse XML
-            root = ET.fromstring(xml_content)
-            
             # Parse based on list type
-            if list_type in ['consolidated', 'sectoral', 'non_sdn']:
-                entities = self._parse_sdn_xml(root, list_type)
-            elif list_type == 'consolidated_add':
-                entities = self._parse_address_xml(root)
+            if list_type == 'consolidated_add':
+                entities = self._parse_address_xml(parse_xml(xml_content))
             elif list_type == 'consolidated_alt':
-                entities = self._parse_alt_xml(root)
+                entities = self._parse_alt_xml(parse_xml(xml_content))
             
             return entities
             
@@ -132,71 +141,73 @@ class OFACScreeningSource:
             logger.error(f"Failed to download/parse {url}: {e}")
             return {}
     
-    def _parse_sdn_xml(self, root: ET.Element, list_type: str) -> Dict[str, OFACEntity]:
-        """Parse SDN-style XML (main entity lists)"""
+    def _parse_sdn_xml(self, entries: Iterable[ET.Element], list_type: str) -> Dict[str, OFACEntity]:
+        """Parse the sdnEntry elements of SDN-style XML (main entity lists)"""
         entities = {}
         
-        for entry in root.findall('.//sdnEntry'):
+        for entry in entries:
             try:
-                uid = entry.get('uid', '')
+                # Published feeds declare a default namespace; match it in lookups
+                ns = xml_namespace(entry)
+                uid = entry.get('uid') or entry.findtext(f'{ns}uid', '').strip()
                 if not uid:
                     continue
                 
                 # Basic entity info
-                first_name = entry.findtext('firstName', '').strip()
-                last_name = entry.findtext('lastName', '').strip()
+                first_name = entry.findtext(f'{ns}firstName', '').strip()
+                last_name = entry.findtext(f'{ns}lastName', '').strip()
                 full_name = f"{first_name} {last_name}".strip()
                 
                 if not full_name:
-                    full_name = entry.findtext('title', '').strip()
+                    full_name = entry.findtext(f'{ns}title', '').strip()
                 
-                entity_type = entry.findtext('sdnType', 'Individual')
+                entity_type = sys.intern(entry.findtext(f'{ns}sdnType', 'Individual'))
                 
                 # Programs
                 programs = []
-                for program in entry.findall('.//program'):
+                for program in entry.findall(f'.//{ns}program'):
                     prog_text = program.text
                     if prog_text:
-                        programs.append(prog_text.strip())
+                        programs.append(sys.intern(prog_text.strip()))
                 
                 # Addresses
                 addresses = []
-                for address in entry.findall('.//address'):
+                for address in entry.findall(f'.//{ns}address'):
                     addr_dict = {}
                     for field in ['address1', 'address2', 'city', 'stateOrProvince', 'postalCode', 'country']:
-                        value = address.findtext(field, '').strip()
+                        value = address.findtext(f'{ns}{field}', '').strip()
                         if value:
-                            addr_dict[field] = value
+                            addr_dict[field] = sys.intern(value) if field == 'country' else value
                     if addr_dict:
                         addresses.append(addr_dict)
                 
                 # Identifiers (IDs, passports, etc.)
                 identifiers = []
-                for id_elem in entry.findall('.//id'):
+                for id_elem in entry.findall(f'.//{ns}id'):
                     id_dict = {
-                        'type': id_elem.get('idType', ''),
+                        'type': sys.intern(id_elem.get('idType', '')),
                         'number': id_elem.get('idNumber', ''),
-                        'country': id_elem.get('idCountry', '')
+                        'country': sys.intern(id_elem.get('idCountry', ''))
                     }
                     if id_dict['number']:
                         identifiers.append(id_dict)
                 
                 # Aliases
                 aliases = []
-                for aka in entry.findall('.//aka'):
+                for aka in entry.findall(f'.//{ns}aka'):
                     aka_type = aka.get('type', '')
-                    aka_first = aka.findtext('firstName', '').strip()
-                    aka_last = aka.findtext('lastName', '').strip()
+                    aka_first = aka.findtext(f'{ns}firstName', '').strip()
+                    aka_last = aka.findtext(f'{ns}lastName', '').strip()
                     aka_name = f"{aka_first} {aka_last}".strip()
                     
                     if not aka_name:
-                        aka_name = aka.findtext('title', '').strip()
+                        aka_name = aka.findtext(f'{ns}title', '').strip()
                     
                     if aka_name:
                         aliases.append(aka_name)
                 
                 # Remarks
-                remarks = entry.findtext('remarks', '').strip()
+                remarks = entry.findtext(f'{ns}remarks', '').strip()
                 
                 # Create entity
                 entity = OFACEntity(
@@ -231,20 +242,28 @@ class OFACScreeningSource:
         # For now, return empty dict as aliases are parsed in main XML
         return {}
     
-    async def search(self, query: str, threshold: int = 80) -> List[Dict[str, Any]]:
+    async def search(self, query: str, threshold: int = 80,
+                     normalized_query: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search OFAC entities for matches
         
         Args:
             query: Search query (name)
             threshold: Minimum fuzzy match score (0-100)
+            normalized_query: Query already passed through normalize_query
             
         Returns:
             List of matching entities with confidence scores
         """
         try:
-            # Ensure data is loaded
+            query_lower = normalized_query if normalized_query is not None else normalize_query(query)
+            
+            # Ensure data is loaded; prefer the database index kept current by
+            # the update_screening_source task over downloading the list here
             if not self.entities:
+                indexed = await search_indexed('ofac', query_lower, threshold)
+                if indexed is not None:
+                    return indexed
                 await self.update_data()
             
             if not self.entities:
@@ -252,39 +271,12 @@ class OFACScreeningSource:
                 return []
             
             matches = []
-            query_lower = query.lower().strip()
             
-            for uid, entity in self.entities.items():
-                # Check primary name
-                name_score = fuzz.ratio(query_lower, entity.name.lower())
-                
-                # Check aliases
-                alias_scores = []
-                for alias in entity.aliases:
-                    alias_score = fuzz.ratio(query_lower, alias.lower())
-                    alias_scores.append(alias_score)
-                
-                # Get best score
-                best_score = max([name_score] + alias_scores) if alias_scores else name_score
-                
-                if best_score >= threshold:
-                    match = {
-                        'entity_id': uid,
-                        'name': entity.name,
-                        'matched_name': entity.name if name_score == best_score else 
-                                      max(entity.aliases, key=lambda x: fuzz.ratio(query_lower, x.lower())),
-                        'confidence': best_score,
-                        'entity_type': entity.entity_type,
-                        'programs': entity.programs,
-                        'list_type': entity.list_type,
-                        'addresses': entity.addresses,
-                        'identifiers': entity.identifiers,
-                        'aliases': entity.aliases,
-                        'remarks': entity.remarks,
-                        'match_type': 'fuzzy',
-                        'source': 'OFAC'
-                    }
-                    matches.append(match)
+            for entity_id, matched_name, score in self.name_index.search(query_lower, threshold):
+                match = self._entity_payload(entity_id, self.entities[entity_id])
+                match['matched_name'] = matched_name
+                match['confidence'] = score
+                matches.append(match)
             
             # Sort by confidence score (highest first)
             matches.sort(key=lambda x: x['confidence'], reverse=True)
@@ -296,6 +288,30 @@ class OFACScreeningSource:
             logger.error(f"OFAC search failed: {e}")
             return []
     
+    def _entity_payload(self, entity_id: str, entity: OFACEntity) -> Dict[str, Any]:
+        """Match fields describing an entity, without the per-query score"""
+        return {
+            'entity_id': entity_id,
+            'name': entity.name,
+            'entity_type': entity.entity_type,
+            'programs': entity.programs,
+            'list_type': entity.list_type,
+            'addresses': entity.addresses,
+            'identifiers': entity.identifiers,
+            'aliases': entity.aliases,
+            'remarks': entity.remarks,
+            'match_type': 'fuzzy',
+            'source': 'OFAC'
+        }
+    
+    def iter_index_rows(self):
+        """Yield one searchable row per entity name and alias for SanctionsEntity"""
+        for entity_id, entity in self.entities.items():
+            details = self._entity_payload(entity_id, entity)
+            for name in dict.fromkeys([entity.name, *entity.aliases]):
+                if name:
+                    yield {'entity_id': entity_id, 'name': name, 'details': details}
+    
     def _is_cache_valid(self) -> bool:
         """Check if cached data is still valid"""
         if not self.last_updated or not self.entities:
@@ -12,6 +12,8 @@ import asyncio
 import aiohttp
 import json
 
+from .normalization import normalize_query
+
 logger = logging.getLogger('ceres.screening.opensanctions')
 
 @dataclass
@@ -122,23 +124,26 @@ class OpenSanctionsSource:
             logger.warning(f"API connectivity test failed: {e}")
             return False
     
-    async def search(self, query: str, threshold: int = 80) -> List[Dict[str, Any]]:
+    async def search(self, query: str, threshold: int = 80,
+                     normalized_query: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search OpenSanctions for matches
         
         Args:
             query: Search query (name)
             threshold: Minimum fuzzy match score (0-100)
+            normalized_query: Query already passed through normalize_query
             
         Returns:
             List of matching entities with confidence scores
         """
         try:
             matches = []
+            query_lower = normalized_query if normalized_query is not None else normalize_query(query)
             
             # Search across different datasets
             for dataset in self.PEP_DATASETS:
-                dataset_matches = await self._search_dataset(query, dataset, threshold)
+                dataset_matches = await self._search_dataset(query, query_lower, dataset, threshold)
                 matches.extend(dataset_matches)
             
             # Remove duplicates based on entity ID
@@ -161,7 +166,8 @@ class OpenSanctionsSource:
             logger.error(f"OpenSanctions search failed: {e}")
             return []
     
-    async def _search_dataset(self, query: str, dataset: str, threshold: int) -> List[Dict[str, Any]]:
+    async def _search_dataset(self, query: str, query_lower: str, dataset: str,
+                              threshold: int) -> List[Dict[str, Any]]:
         """Search specific dataset"""
         try:
             params = {
@@ -181,7 +187,7 @@ class OpenSanctionsSource:
             results = data.get('results', [])
             
             for result in results:
-                match = await self._process_search_result(result, query, dataset, threshold)
+                match = await self._process_search_result(result, query_lower, dataset, threshold)
                 if match:
                     matches.append(match)
             
@@ -191,7 +197,7 @@ class OpenSanctionsSource:
             logger.warning(f"Failed to search dataset {dataset}: {e}")
             return []
     
-    async def _process_search_result(self, result: Dict, query: str, dataset: str, threshold: int) -> Optional[Dict[str, Any]]:
+    async def _process_search_result(self, result: Dict, query_lower: str, dataset: str, threshold: int) -> Optional[Dict[str, Any]]:
         """Process individual search result"""
         try:
             entity_id = result.get('id', '')
@@ -208,12 +214,12 @@ class OpenSanctionsSource:
             if not name:
                 return None
             
-            confidence = fuzz.ratio(query.lower(), name.lower())
+            confidence = fuzz.ratio(query_lower, name.lower())
             
             # Check aliases for better match
             aliases = entity_details.get('properties', {}).get('alias', [])
             for alias in aliases:
-                alias_score = fuzz.ratio(query.lower(), alias.lower())
+                alias_score = fuzz.ratio(query_lower, alias.lower())
                 confidence = max(confidence, alias_score)
             
             if confidence < threshold:
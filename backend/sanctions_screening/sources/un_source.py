@@ -7,11 +7,14 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
-from fuzzywuzzy import fuzz
 import asyncio
 import aiohttp
 import json
 
+from .indexed_search import search_indexed
+from .name_index import NameIndex
+from .normalization import normalize_query
+
 logger = logging.getLogger('ceres.screening.un')
 
 @dataclass
@@ -43,6 +46,7 @@ class UNScreeningSource:
     def __init__(self, cache_duration_hours: int = 24):
         self.cache_duration = timedelta(hours=cache_duration_hours)
         self.entities: Dict[str, UNEntity] = {}
+        self.name_index = NameIndex({})
         self.last_updated: Optional[datetime] = None
         self.session: Optional[aiohttp.ClientSession] = None
     
@@ -86,6 +90,7 @@ class UNScreeningSource:
             
             if entities:
                 self.entities = entities
+                self.name_index = NameIndex(self.entities)
                 self.last_updated = datetime.now()
                 logger.info(f"UN data updated successfully: {len(self.entities)} entities")
                 return True
@@ -329,20 +334,28 @@ class UNScreeningSource:
         logger.warning("XML parsing not implemented, use JSON API")
         return {}
     
-    async def search(self, query: str, threshold: int = 80) -> List[Dict[str, Any]]:
+    async def search(self, query: str, threshold: int = 80,
+                     normalized_query: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search UN entities for matches
         
         Args:
             query: Search query (name)
             threshold: Minimum fuzzy match score (0-100)
+            normalized_query: Query already passed through normalize_query
             
         Returns:
             List of matching entities with confidence scores
         """
         try:
-            # Ensure data is loaded
+            query_lower = normalized_query if normalized_query is not None else normalize_query(query)
+            
+            # Ensure data is loaded; prefer the database index kept current by
+            # the update_screening_source task over downloading the list here
             if not self.entities:
+                indexed = await search_indexed('un', query_lower, threshold)
+                if indexed is not None:
+                    return indexed
                 await self.update_data()
             
             if not self.entities:
@@ -350,42 +363,12 @@ class UNScreeningSource:
                 return []
             
             matches = []
-            query_lower = query.lower().strip()
             
-            for dataid, entity in self.entities.items():
-                # Check primary name
-                name_score = fuzz.ratio(query_lower, entity.name.lower())
-                
-                # Check aliases
-                alias_scores = []
-                for alias in entity.aliases:
-                    alias_score = fuzz.ratio(query_lower, alias.lower())
-                    alias_scores.append(alias_score)
-                
-                # Get best score
-                best_score = max([name_score] + alias_scores) if alias_scores else name_score
-                
-                if best_score >= threshold:
-                    match = {
-                        'entity_id': dataid,
-                        'name': entity.name,
-                        'matched_name': entity.name if name_score == best_score else 
-                                      max(entity.aliases, key=lambda x: fuzz.ratio(query_lower, x.lower())),
-                        'confidence': best_score,
-                        'entity_type': entity.entity_type,
-                        'programs': [entity.un_list_type],
-                        'list_type': entity.list_type,
-                        'reference_number': entity.reference_number,
-                        'listed_on': entity.listed_on,
-                        'addresses': entity.addresses,
-                        'identifiers': entity.identifiers,
-                        'aliases': entity.aliases,
-                        'nationalities': entity.nationalities,
-                        'comments': entity.comments,
-                        'match_type': 'fuzzy',
-                        'source': 'UN'
-                    }
-                    matches.append(match)
+            for entity_id, matched_name, score in self.name_index.search(query_lower, threshold):
+                match = self._entity_payload(entity_id, self.entities[entity_id])
+                match['matched_name'] = matched_name
+                match['confidence'] = score
+                matches.append(match)
             
             # Sort by confidence score (highest first)
             matches.sort(key=lambda x: x['confidence'], reverse=True)
@@ -397,6 +380,33 @@ class UNScreeningSource:
             logger.error(f"UN search failed: {e}")
             return []
     
+    def _entity_payload(self, entity_id: str, entity: UNEntity) -> Dict[str, Any]:
+        """Match fields describing an entity, without the per-query score"""
+        return {
+            'entity_id': entity_id,
+            'name': entity.name,
+            'entity_type': entity.entity_type,
+            'programs': [entity.un_list_type],
+            'list_type': entity.list_type,
+            'reference_number': entity.reference_number,
+            'listed_on': entity.listed_on,
+            'addresses': entity.addresses,
+            'identifiers': entity.identifiers,
+            'aliases': entity.aliases,
+            'nationalities': entity.nationalities,
+            'comments': entity.comments,
+            'match_type': 'fuzzy',
+            'source': 'UN'
+        }
+    
+    def iter_index_rows(self):
+        """Yield one searchable row per entity name and alias for SanctionsEntity"""
+        for entity_id, entity in self.entities.items():
+            details = self._entity_payload(entity_id, entity)
+            for name in dict.fromkeys([entity.name, *entity.aliases]):
+                if name:
+                    yield {'entity_id': entity_id, 'name': name, 'details': details}
+    
     def _is_cache_valid(self) -> bool:
         """Check if cached data is still valid"""
         if not self.last_updated or not self.entities:
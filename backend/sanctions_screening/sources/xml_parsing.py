@@ -0,0 +1,115 @@
+"""
+XML parsing backend for list screening sources
+Uses lxml's libxml2 parser when installed, otherwise the standard library
+"""
+from typing import Dict, Iterator, Optional
+
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+# Bytes passed to each ElementStream.feed()
+CHUNK_SIZE = 64 * 1024
+
+def parse_xml(content: bytes) -> ET.Element:
+    """
+    Parse a downloaded list file into its root element
+    
+    Pass the raw response bytes: lxml rejects str input that carries an XML
+    encoding declaration.
+    """
+    if HAS_LXML:
+        parser = ET.XMLParser(
+            huge_tree=True, collect_ids=False, remove_blank_text=True,
+            resolve_entities=False
+        )
+        return ET.fromstring(content, parser)
+    return ET.fromstring(content)
+
+def default_namespace(uri: str) -> Dict[Optional[str], str]:
+    """
+    Namespace map for findall() that applies uri to unprefixed tags
+    
+    lxml expects the default namespace under None, ElementTree under ''.
+    """
+    return {None if HAS_LXML else '': uri}
+
+def local_name(tag: str) -> str:
+    """Tag name without its '{uri}' namespace"""
+    return tag.rpartition('}')[2]
+
+def xml_namespace(elem: ET.Element) -> str:
+    """Namespace prefix ('{uri}' or '') of an element's tag"""
+    tag = elem.tag
+    return tag[:tag.index('}') + 1] if tag.startswith('{') else ''
+
+def iter_xml_records(content: bytes, *tags: str) -> Iterator[ET.Element]:
+    """
+    Stream-parse a downloaded document, yielding its elements named in tags
+    
+    The content is fed to an ElementStream in CHUNK_SIZE slices, so records
+    are released as they are handled rather than building the whole tree.
+    """
+    stream = ElementStream(*tags)
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield from stream.feed(content[start:start + CHUNK_SIZE])
+    yield from stream.close()
+
+class ElementStream:
+    """
+    Incremental parser producing the record elements of a document fed in chunks
+    
+    Records are matched on their local tag name, so they are found whether or
+    not the document declares a namespace. feed() each chunk as it arrives and
+    then close(). Both return the records completed so far. Each record is
+    cleared and detached from the tree when the caller asks for the next one,
+    so only a single entry is held in memory at a time. Consume the returned
+    records before the next feed().
+    """
+    
+    def __init__(self, *tags: str):
+        self.tags = tags
+        if HAS_LXML:
+            self._parser = ET.XMLPullParser(
+                events=('end',), tag=[f'{{*}}{tag}' for tag in tags], huge_tree=True,
+                remove_blank_text=True, resolve_entities=False
+            )
+        else:
+            self._parser = ET.XMLPullParser(events=('start', 'end'))
+            # ElementTree elements do not know their parent, so track the open ones
+            self._open_elems = []
+    
+    def feed(self, data: bytes) -> Iterator[ET.Element]:
+        self._parser.feed(data)
+        return self._read_elements()
+    
+    def close(self) -> Iterator[ET.Element]:
+        self._parser.close()
+        return self._read_elements()
+    
+    def _read_elements(self) -> Iterator[ET.Element]:
+        if HAS_LXML:
+            for _, elem in self._parser.read_events():
+                yield elem
+                elem.clear()
+                # Drop this entry along with any siblings left before it
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+                    parent.remove(elem)
+            return
+        
+        for event, elem in self._parser.read_events():
+            if event == 'start':
+                self._open_elems.append(elem)
+                continue
+            self._open_elems.pop()
+            if local_name(elem.tag) in self.tags:
+                yield elem
+                elem.clear()
+                if self._open_elems:
+                    self._open_elems[-1].remove(elem)
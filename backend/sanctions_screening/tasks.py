@@ -3,22 +3,37 @@ Celery tasks for sanctions screening.
 Production-ready async task processing with proper error handling.
 """
 
-from celery import shared_task
+from celery import shared_task, group
 from celery.exceptions import Retry
 from django.core.cache import cache
 from django.utils import timezone
 from typing import Dict, List, Any, Optional
+import asyncio
 import logging
 import requests
 import time
 from datetime import datetime, timedelta
 
-from .models import Customer, ScreeningResult, ScreeningAlert
-from .sources.data_source_manager import DataSourceManager
+from .models import (
+    Customer, ScreeningResult, ScreeningAlert, ScreeningBatch, ScreeningSource, SanctionsEntity
+)
+from .sources.data_source_manager import DataSourceManager, SOURCE_CLASSES, build_source
 from core.monitoring import track_performance, log_audit_event
 
 logger = logging.getLogger(__name__)
 
+# Each source list is refreshed on its own queue so a slow download (OFAC)
+# does not hold up the others
+SOURCE_UPDATE_QUEUES = {
+    'ofac': 'ofac_q',
+    'un': 'un_q',
+    'eu': 'eu_q',
+    'opensanctions': 'opensanctions_q',
+}
+
+# A source refreshed more recently than this is skipped unless forced
+SOURCE_UPDATE_INTERVAL = timedelta(hours=24)
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def screen_customer(self, customer_id: int, screening_sources: List[str] = None) -> Dict[str, Any]:
     """
@@ -147,46 +162,53 @@ def screen_customer(self, customer_id: int, screening_sources: List[str] = None)
         }
 
 @shared_task(bind=True, max_retries=2)
-def batch_screen_customers(self, customer_ids: List[int], screening_sources: List[str] = None) -> Dict[str, Any]:
+def batch_screen_customers(self, batch_id: str, screening_sources: List[str] = None) -> Dict[str, Any]:
     """
-    Screen multiple customers in batch.
+    Screen the customers of a ScreeningBatch.
+    
+    Customer IDs are streamed from the database in chunks, so memory use
+    does not grow with the size of the batch.
     
     Args:
-        customer_ids: List of customer IDs to screen
+        batch_id: ID of the ScreeningBatch to process
         screening_sources: List of sources to check
         
     Returns:
         Dict containing batch screening results
     """
     try:
-        batch_id = f"batch_{int(time.time())}"
+        batch = ScreeningBatch.objects.get(id=batch_id)
+        customers = batch.customers.values_list('id', flat=True)
+        total_customers = customers.count()
+        
+        ScreeningBatch.objects.filter(pk=batch.pk).update(
+            status='processing',
+            total_customers=total_customers,
+            started_at=timezone.now()
+        )
         
         log_audit_event(
             'batch_screening_started',
             user_id=None,
             metadata={
                 'batch_id': batch_id,
-                'customer_count': len(customer_ids),
+                'customer_count': total_customers,
                 'sources': screening_sources
             }
         )
         
-        results = []
+        queued_count = 0
         failed_customers = []
         
-        for customer_id in customer_ids:
+        for customer_id in customers.iterator(chunk_size=500):
             try:
                 # Queue individual screening task
-                result = screen_customer.delay(customer_id, screening_sources)
-                results.append({
-                    'customer_id': customer_id,
-                    'task_id': result.id,
-                    'status': 'queued'
-                })
+                screen_customer.delay(str(customer_id), screening_sources)
+                queued_count += 1
             except Exception as e:
                 logger.error(f"Failed to queue screening for customer {customer_id}: {e}")
                 failed_customers.append({
-                    'customer_id': customer_id,
+                    'customer_id': str(customer_id),
                     'error': str(e)
                 })
         
@@ -195,19 +217,27 @@ def batch_screen_customers(self, customer_ids: List[int], screening_sources: Lis
             user_id=None,
             metadata={
                 'batch_id': batch_id,
-                'queued_count': len(results),
+                'queued_count': queued_count,
                 'failed_count': len(failed_customers)
             }
         )
         
         return {
             'batch_id': batch_id,
-            'queued_screenings': results,
+            'queued_count': queued_count,
             'failed_customers': failed_customers,
-            'total_customers': len(customer_ids),
+            'total_customers': total_customers,
             'status': 'queued'
         }
         
+    except ScreeningBatch.DoesNotExist:
+        logger.error(f"Screening batch {batch_id} not found")
+        return {
+            'batch_id': batch_id,
+            'status': 'failed',
+            'error': 'Batch not found'
+        }
+        
     except Exception as exc:
         logger.error(f"Error in batch screening: {exc}")
         
@@ -217,7 +247,7 @@ def batch_screen_customers(self, customer_ids: List[int], screening_sources: Lis
         return {
             'status': 'failed',
             'error': str(exc),
-            'customer_ids': customer_ids
+            'batch_id': batch_id
         }
 
 @shared_task(bind=True, max_retries=3)
@@ -329,57 +359,101 @@ def send_high_risk_notification(self, alert_id: int) -> Dict[str, Any]:
             'error': str(exc)
         }
 
+@shared_task(bind=True, max_retries=3)
+def update_screening_source(self, source_name: str, force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    Refresh a single screening source list.
+    
+    Idempotent: a source whose ScreeningSource.last_updated falls within
+    SOURCE_UPDATE_INTERVAL is skipped unless force_refresh is set.
+    
+    Args:
+        source_name: Source name (ofac, un, eu, opensanctions)
+        force_refresh: Download even if the source was refreshed recently
+        
+    Returns:
+        Dict containing update status
+    """
+    source_record = ScreeningSource.objects.filter(code__iexact=source_name).first()
+    if (not force_refresh and source_record and source_record.last_updated
+            and timezone.now() - source_record.last_updated < SOURCE_UPDATE_INTERVAL):
+        return {'source': source_name, 'status': 'skipped'}
+    
+    async def run_update():
+        async with build_source(source_name) as source:
+            success = await source.update_data(force_refresh=force_refresh)
+            # List sources expose their names for the trigram index
+            rows = None
+            if success and hasattr(source, 'iter_index_rows'):
+                rows = list(source.iter_index_rows())
+            return success, rows
+    
+    start_time = time.perf_counter()
+    success, index_rows = asyncio.run(run_update())
+    update_time = time.perf_counter() - start_time
+    
+    if index_rows is not None:
+        SanctionsEntity.objects.replace_source(source_name, index_rows)
+    
+    if not success and self.request.retries < self.max_retries:
+        logger.info(f"Retrying update for source {source_name} (attempt {self.request.retries + 1})")
+        raise self.retry(countdown=60 * (2 ** self.request.retries))
+    
+    if source_record:
+        fields = {'is_available': success}
+        if success:
+            fields['last_updated'] = timezone.now()
+        ScreeningSource.objects.filter(pk=source_record.pk).update(**fields)
+    
+    # Clear cached screenings for this source
+    if success:
+        cache.delete_pattern(f"screening_{source_name}_*")
+    
+    logger.info(f"Source {source_name} update: {'success' if success else 'failed'} in {update_time:.2f}s")
+    return {
+        'source': source_name,
+        'status': 'updated' if success else 'failed',
+        'update_time': update_time
+    }
+
 @shared_task(bind=True)
-def update_screening_sources(self) -> Dict[str, Any]:
+def update_screening_sources(self, force_refresh: bool = False) -> Dict[str, Any]:
     """
     Periodic task to update screening data sources.
     
+    Dispatches one update_screening_source task per source, each on the
+    source's own queue, and returns without waiting for them.
+    
     Returns:
-        Dict containing update status
+        Dict containing dispatch status
     """
     try:
-        source_manager = DataSourceManager()
-        
-        update_results = {}
-        
-        # Update each source
-        sources = ['ofac', 'un', 'eu', 'opensanctions']
-        
-        for source in sources:
-            try:
-                result = source_manager.update_source(source)
-                update_results[source] = result
-                
-                # Clear cache for this source
-                cache_pattern = f"screening_{source}_*"
-                cache.delete_pattern(cache_pattern)
-                
-            except Exception as e:
-                logger.error(f"Failed to update source {source}: {e}")
-                update_results[source] = {
-                    'status': 'failed',
-                    'error': str(e)
-                }
+        job = group(
+            update_screening_source.s(source_name, force_refresh).set(
+                queue=SOURCE_UPDATE_QUEUES.get(source_name)
+            )
+            for source_name in SOURCE_CLASSES
+        ).apply_async()
         
         log_audit_event(
-            'screening_sources_updated',
+            'screening_sources_update_dispatched',
             user_id=None,
             metadata={
-                'update_results': update_results,
-                'updated_at': timezone.now().isoformat()
+                'group_id': job.id,
+                'sources': list(SOURCE_CLASSES),
+                'dispatched_at': timezone.now().isoformat()
             }
         )
         
         return {
-            'status': 'completed',
-            'update_results': update_results,
-            'updated_at': timezone.now().isoformat()
+            'status': 'dispatched',
+            'group_id': job.id,
+            'sources': list(SOURCE_CLASSES)
         }
         
     except Exception as exc:
-        logger.error(f"Error updating screening sources: {exc}")
+        logger.error(f"Error dispatching screening source updates: {exc}")
         return {
             'status': 'failed',
             'error': str(exc)
         }
-
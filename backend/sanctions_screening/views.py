@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.db import transaction
 from django.db.models import Count, Q
 import logging
+from decimal import Decimal
 
 from customer_enrollment.models import Customer
 from .models import (
@@ -101,7 +102,7 @@ class ScreeningResultViewSet(viewsets.ReadOnlyModelViewSet):
     ViewSet for viewing screening results
     """
 
-    queryset = ScreeningResult.objects.select_related("customer", "source").all()
+    queryset = ScreeningResult.objects.for_serialization()
     serializer_class = ScreeningResultSerializer
     permission_classes = [IsAuthenticated]
 
@@ -274,65 +275,11 @@ class ScreeningViewSet(viewsets.ViewSet):
                 meta={"error": "Customer not found"},
             )
 
-        # Get screening results
-        results = ScreeningResult.objects.filter(customer=customer)
-
-        # Calculate summary statistics
-        total_sources_checked = results.values("source").distinct().count()
-        matches_found = results.filter(match_found=True).count()
-
-        # Risk level breakdown
-        high_risk_matches = results.filter(
-            match_found=True, confidence_score__gte=90
-        ).count()
-
-        medium_risk_matches = results.filter(
-            match_found=True, confidence_score__gte=70, confidence_score__lt=90
-        ).count()
-
-        low_risk_matches = results.filter(
-            match_found=True, confidence_score__lt=70
-        ).count()
-
-        # Overall risk score (highest confidence match)
-        highest_match = (
-            results.filter(match_found=True).order_by("-confidence_score").first()
+        summary = ScreeningSummarySerializer(
+            instance=ScreeningResult.summary_for_customer(customer.id)
         )
-        overall_risk_score = highest_match.confidence_score if highest_match else 0
-
-        # Risk level
-        if overall_risk_score >= 90:
-            risk_level = "high"
-        elif overall_risk_score >= 70:
-            risk_level = "medium"
-        elif overall_risk_score > 0:
-            risk_level = "low"
-        else:
-            risk_level = "none"
-
-        # Alerts count
-        alerts_count = ScreeningAlert.objects.filter(
-            customer=customer, status="active"
-        ).count()
-
-        # Last screened
-        last_result = results.order_by("-created_at").first()
-        last_screened = last_result.created_at if last_result else None
-
-        summary_data = {
-            "customer_id": customer_id,
-            "total_sources_checked": total_sources_checked,
-            "matches_found": matches_found,
-            "high_risk_matches": high_risk_matches,
-            "medium_risk_matches": medium_risk_matches,
-            "low_risk_matches": low_risk_matches,
-            "last_screened": last_screened,
-            "overall_risk_score": overall_risk_score,
-            "risk_level": risk_level,
-            "alerts_count": alerts_count,
-        }
 
-        return success_response(summary_data)
+        return success_response(summary.data)
 
     @action(detail=False, methods=["get"])
     def customer_matches(self, request):
@@ -379,7 +326,7 @@ class ScreeningBatchViewSet(viewsets.ModelViewSet):
     ViewSet for managing screening batches
     """
 
-    queryset = ScreeningBatch.objects.all()
+    queryset = ScreeningBatch.objects.for_serialization()
     serializer_class = ScreeningBatchSerializer
     permission_classes = [IsAuthenticated]
 
@@ -398,13 +345,18 @@ class ScreeningBatchViewSet(viewsets.ModelViewSet):
         queryset = self.filter_queryset(self.get_queryset())
         return paginated_response(queryset, self.get_serializer_class(), request)
 
+    def perform_create(self, serializer):
+        """Create a batch; a new batch has no customers processed yet"""
+        batch = serializer.save()
+        batch.progress_percentage = Decimal("0")
+
 
 class ScreeningAlertViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing screening alerts
     """
 
-    queryset = ScreeningAlert.objects.select_related("customer", "source").all()
+    queryset = ScreeningAlert.objects.for_serialization()
     serializer_class = ScreeningAlertSerializer
     permission_classes = [IsAuthenticated]
 
@@ -0,0 +1,157 @@
+"""
+Tests for document processing
+"""
+import hashlib
+import mmap
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import types
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from customer_enrollment.models import Customer
+from document_processing.models import CustomerDocument
+from document_processing.ocr_service import OCRService
+
+
+def _ocr_scanned_pdf(file_path, results):
+    """OCR a scanned PDF with rasterizing and Tesseract stubbed, reporting the result"""
+    def convert_from_path(path, first_page, last_page, output_folder, **kwargs):
+        page_paths = []
+        for page in range(first_page, last_page + 1):
+            page_path = os.path.join(output_folder, f'page-{page}.png')
+            open(page_path, 'wb').close()
+            page_paths.append(page_path)
+        return page_paths
+
+    def ocr_page_list(list_path, page_count):
+        return [('scanned page', 90.0)] * page_count
+
+    pdf2image = types.ModuleType('pdf2image')
+    pdf2image.pdfinfo_from_path = lambda path: {'Pages': 6}
+    pdf2image.convert_from_path = convert_from_path
+
+    # No PyPDF2 forces the OCR fallback
+    with patch.dict(sys.modules, {'pdf2image': pdf2image, 'PyPDF2': None}), \
+            patch('document_processing.ocr_service._ocr_page_list', side_effect=ocr_page_list), \
+            override_settings(OCR_MAX_WORKERS=4):
+        with open(file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            results.put(OCRService()._extract_from_pdf(file_path, content))
+
+
+class BinaryFileHashMigrationTestCase(TransactionTestCase):
+    """Test the hex to binary file_hash migration in both directions"""
+
+    migrate_from = [('document_processing', '0002_document_filter_indexes')]
+    migrate_to = [('document_processing', '0003_binary_file_hash')]
+
+    def setUp(self):
+        self.content_digest = hashlib.sha256(b'passport scan').digest()
+        self.customer = Customer.objects.create(first_name='Ana', last_name='Silva')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        old_apps = executor.loader.project_state(self.migrate_from).apps
+        OldCustomerDocument = old_apps.get_model('document_processing', 'CustomerDocument')
+        self.document_id = OldCustomerDocument.objects.create(
+            customer_id=self.customer.pk,
+            document_type='passport',
+            file='documents/passport.pdf',
+            file_name='passport.pdf',
+            file_size=13,
+            file_hash=self.content_digest.hex(),
+            mime_type='application/pdf',
+        ).pk
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def test_hex_hash_becomes_digest(self):
+        """Existing hex hashes are stored as the raw 32-byte digest"""
+        new_apps = self._migrate(self.migrate_to)
+        NewCustomerDocument = new_apps.get_model('document_processing', 'CustomerDocument')
+
+        document = NewCustomerDocument.objects.get(pk=self.document_id)
+        self.assertEqual(bytes(document.file_hash), self.content_digest)
+
+    def test_reverse_restores_hex_hash(self):
+        """Migrating back restores the original hex text"""
+        self._migrate(self.migrate_to)
+        old_apps = self._migrate(self.migrate_from)
+        OldCustomerDocument = old_apps.get_model('document_processing', 'CustomerDocument')
+
+        document = OldCustomerDocument.objects.get(pk=self.document_id)
+        self.assertEqual(document.file_hash, self.content_digest.hex())
+
+
+class CustomerDocumentFileHashTestCase(TestCase):
+    """Test the stored file hash of uploaded documents"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.customer = Customer.objects.create(first_name='Ana', last_name='Silva')
+
+    def test_file_hash_round_trip(self):
+        """The SHA-256 digest survives a database round trip and renders as hex"""
+        content = b'%PDF-1.4 passport scan'
+        with override_settings(MEDIA_ROOT=self.media_root):
+            document = CustomerDocument.objects.create(
+                customer=self.customer,
+                document_type='passport',
+                file=SimpleUploadedFile('passport.pdf', content),
+                mime_type='application/pdf',
+            )
+
+        expected = hashlib.sha256(content)
+        self.assertEqual(bytes(document.file_hash), expected.digest())
+
+        reloaded = CustomerDocument.objects.get(pk=document.pk)
+        self.assertEqual(bytes(reloaded.file_hash), expected.digest())
+        self.assertEqual(reloaded.file_hash_hex, expected.hexdigest())
+        self.assertEqual(
+            CustomerDocument.objects.get(file_hash=expected.digest()).pk, document.pk
+        )
+
+    def test_missing_hash_renders_empty(self):
+        """Documents without a hash report an empty hex string"""
+        self.assertEqual(CustomerDocument(file_hash=b'').file_hash_hex, '')
+
+
+class ScannedPDFOCRTestCase(TestCase):
+    """Test OCR of scanned PDFs inside worker processes"""
+
+    def setUp(self):
+        handle, self.file_path = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(handle, 'wb') as file:
+            file.write(b'%PDF-1.4 scanned')
+        self.addCleanup(os.remove, self.file_path)
+
+    def test_extract_from_pdf_in_daemonic_process(self):
+        """Daemonic processes, like Celery prefork children, OCR pages serially"""
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        process = context.Process(
+            target=_ocr_scanned_pdf, args=(self.file_path, results), daemon=True
+        )
+        process.start()
+        result = results.get(timeout=60)
+        process.join(timeout=60)
+
+        self.assertEqual(result['method'], 'tesseract_pdf')
+        self.assertEqual(result['text'].count('scanned page'), 6)
+        self.assertAlmostEqual(result['confidence'], 0.9)
@@ -0,0 +1,137 @@
+"""
+Tests for sanctions screening models and indexed search
+"""
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from sanctions_screening.models import SanctionsEntity, ScreeningConfiguration
+from sanctions_screening.sources.indexed_search import search_indexed
+from sanctions_screening.sources.name_index import NameIndex
+from sanctions_screening.sources.normalization import normalize_query
+from sanctions_screening.sources.ofac_source import OFACEntity, OFACScreeningSource
+
+
+class ScreeningConfigurationDefaultTestCase(TestCase):
+    """Test that exactly one screening configuration stays the default"""
+
+    def setUp(self):
+        self.default = ScreeningConfiguration.objects.create(name='Standard', is_default=True)
+        self.other = ScreeningConfiguration.objects.create(name='Enhanced')
+
+    def assertDefault(self, config):
+        self.assertEqual(
+            list(ScreeningConfiguration.objects.filter(is_default=True).values_list('pk', flat=True)),
+            [config.pk],
+        )
+
+    def test_promoting_demotes_previous_default(self):
+        """Saving a non-default configuration as default demotes the old one"""
+        self.other.is_default = True
+        self.other.save()
+
+        self.assertDefault(self.other)
+        self.default.refresh_from_db()
+        self.assertFalse(self.default.is_default)
+
+    def test_creating_default_demotes_previous_default(self):
+        """A new configuration created as default takes over"""
+        strict = ScreeningConfiguration.objects.create(name='Strict', is_default=True)
+
+        self.assertDefault(strict)
+
+    def test_resaving_default_keeps_it(self):
+        """Re-saving the current default leaves it the only default"""
+        self.default.description = 'Baseline thresholds'
+        self.default.save()
+
+        self.assertDefault(self.default)
+
+    def test_resaving_default_loaded_from_database(self):
+        """A default loaded from the database stays default when saved again"""
+        config = ScreeningConfiguration.objects.get(pk=self.default.pk)
+        config.fuzzy_match_threshold = 90
+        config.save()
+
+        self.assertDefault(self.default)
+
+    def test_promoting_with_is_default_deferred(self):
+        """Promotion works on an instance loaded without is_default"""
+        config = ScreeningConfiguration.objects.only('name').get(pk=self.other.pk)
+        self.assertNotIn('is_default', config.__dict__)
+
+        config.is_default = True
+        config.save()
+
+        self.assertDefault(self.other)
+
+    def test_saving_default_with_is_default_deferred(self):
+        """Saving the default loaded without is_default keeps it default"""
+        config = ScreeningConfiguration.objects.only('name').get(pk=self.default.pk)
+        config.name = 'Standard (2026)'
+        config.save()
+
+        self.assertDefault(self.default)
+
+    def test_demoting_default(self):
+        """Clearing is_default leaves no default configuration"""
+        self.default.is_default = False
+        self.default.save()
+
+        self.assertFalse(ScreeningConfiguration.objects.filter(is_default=True).exists())
+
+    def test_constraint_rejects_second_default(self):
+        """uniq_default_config rejects writes that bypass save()"""
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ScreeningConfiguration.objects.filter(pk=self.other.pk).update(is_default=True)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ScreeningConfiguration.objects.bulk_create([
+                ScreeningConfiguration(name='Bulk', is_default=True),
+            ])
+
+        self.assertDefault(self.default)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Indexed search requires PostgreSQL with pg_trgm')
+class IndexedSearchParityTestCase(TestCase):
+    """Test that the database index and the in-memory list agree"""
+
+    NAMES = {
+        '1001': ('Vladimir Petrov', ['Vladimir Petrow', 'V. Petrov']),
+        '1002': ('Ivan Petrova', []),
+        '1003': ('Acme Trading LLC', ['Acme Trading Company']),
+        '1004': ('Olga Ivanova', ['Olga Ivanovna']),
+    }
+
+    def setUp(self):
+        self.source = OFACScreeningSource()
+        self.source.entities = {
+            uid: OFACEntity(
+                uid=uid, name=name, entity_type='Individual', programs=['RUSSIA-EO14024'],
+                addresses=[], identifiers=[], aliases=aliases, remarks='', list_type='consolidated',
+            )
+            for uid, (name, aliases) in self.NAMES.items()
+        }
+        self.source.name_index = NameIndex(self.source.entities)
+        SanctionsEntity.objects.replace_source('ofac', self.source.iter_index_rows())
+
+    def _scores(self, matches):
+        return {
+            match['entity_id']: (match['matched_name'], match['confidence'])
+            for match in matches
+        }
+
+    def test_same_matches_for_same_query(self):
+        """Both paths return the same entities, matched names and confidences"""
+        for query in ('Vladimir Petrov', 'ivan petrov', 'ACME Trading LLC', 'Olga Ivanova'):
+            for threshold in (70, 80, 90):
+                with self.subTest(query=query, threshold=threshold):
+                    in_memory = async_to_sync(self.source.search)(query, threshold)
+                    indexed = async_to_sync(search_indexed)('ofac', normalize_query(query), threshold)
+
+                    self.assertEqual(self._scores(indexed), self._scores(in_memory))
+                    if threshold == 70:
+                        self.assertTrue(in_memory)
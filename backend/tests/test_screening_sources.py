@@ -0,0 +1,322 @@
+"""
+Tests for list screening source helpers
+"""
+import asyncio
+import xml.etree.ElementTree
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from sanctions_screening.data_sources import UNConsolidatedSource
+from sanctions_screening.sources import name_index, xml_parsing
+from sanctions_screening.sources.data_source_manager import DataSourceManager, SourceSearchResult
+from sanctions_screening.sources.eu_source import EU_NAMESPACE, EUScreeningSource
+from sanctions_screening.sources.name_index import NameIndex, indel_ratio
+from sanctions_screening.sources.ofac_source import OFACScreeningSource
+from sanctions_screening.sources.xml_parsing import ElementStream, iter_xml_records
+
+
+def _entities(names):
+    return {
+        entity_id: SimpleNamespace(name=name, aliases=aliases)
+        for entity_id, (name, aliases) in names.items()
+    }
+
+
+class NameIndexTestCase(SimpleTestCase):
+    """Test NameIndex.search with the installed scorer"""
+
+    NAMES = {
+        '1001': ('Vladimir Petrov', ['Vladimir Petrow', 'V. Petrov']),
+        '1002': ('Ivan Petrov', ['IVAN PETROV']),
+        '1003': ('Acme Trading LLC', []),
+    }
+
+    def setUp(self):
+        self.index = NameIndex(_entities(self.NAMES))
+
+    def test_best_name_per_entity(self):
+        """Each entity is reported once, under its best-scoring name"""
+        results = self.index.search('vladimir petrow', 60)
+
+        self.assertEqual([entity_id for entity_id, _, _ in results], ['1001', '1002'])
+        self.assertEqual(results[0], ('1001', 'Vladimir Petrow', 100.0))
+
+    def test_primary_name_wins_ties(self):
+        """A primary name and an alias with the same score report the primary"""
+        results = self.index.search('ivan petrov', 90)
+
+        self.assertEqual(results, [('1002', 'Ivan Petrov', 100.0)])
+
+    def test_empty_index(self):
+        """An index without names returns no matches"""
+        index = NameIndex(_entities({'2001': ('', [])}))
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.search('ivan petrov', 0), [])
+        self.assertEqual(NameIndex({}).search('ivan petrov', 0), [])
+
+    def test_threshold_is_inclusive_cutoff(self):
+        """Names scoring exactly the threshold match, lower scores do not"""
+        index = NameIndex(_entities({'3001': ('abcd', []), '3002': ('abce', ['wxyz'])}))
+
+        self.assertEqual(index.search('abcd', 75), [('3001', 'abcd', 100.0), ('3002', 'abce', 75.0)])
+        self.assertEqual(index.search('abcd', 76), [('3001', 'abcd', 100.0)])
+        for _, _, score in self.index.search('vladimir petrov', 80):
+            self.assertGreaterEqual(score, 80)
+
+    def test_indel_ratio(self):
+        """The fallback scorer computes rapidfuzz's normalized Indel similarity"""
+        self.assertEqual(indel_ratio('abcd', 'abce'), 75.0)
+        self.assertEqual(indel_ratio('', ''), 100.0)
+        self.assertEqual(indel_ratio('abc', ''), 0.0)
+        self.assertAlmostEqual(indel_ratio('vladimir petrov', 'ivan petrova'), 200 * 9 / 27)
+
+
+class PurePythonNameIndexTestCase(NameIndexTestCase):
+    """Test NameIndex.search without rapidfuzz and numpy"""
+
+    def setUp(self):
+        patcher = patch.object(name_index, 'HAS_RAPIDFUZZ', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+SDN_LIST = b"""<?xml version="1.0" encoding="utf-8"?>
+<sdnList>
+  <publshInformation><Publish_Date>10/01/2026</Publish_Date></publshInformation>
+  <sdnEntry uid="1001">
+    <firstName>Vladimir</firstName><lastName>Petrov</lastName><sdnType>Individual</sdnType>
+    <programList><program>RUSSIA-EO14024</program></programList>
+    <akaList><aka type="a.k.a."><firstName>V.</firstName><lastName>Petrov</lastName></aka></akaList>
+  </sdnEntry>
+  <sdnEntry uid="1002">
+    <lastName>ACME TRADING LLC</lastName><sdnType>Entity</sdnType>
+    <programList><program>SDGT</program></programList>
+  </sdnEntry>
+  <sdnEntry uid="1003">
+    <firstName>Olga</firstName><lastName>Ivanova</lastName><sdnType>Individual</sdnType>
+    <programList><program>RUSSIA-EO14024</program><program>UKRAINE-EO13660</program></programList>
+  </sdnEntry>
+</sdnList>
+"""
+
+SDN_LIST_NAMESPACED = b"""<?xml version="1.0" standalone="yes"?>
+<sdnList xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns="http://tempuri.org/sdnList.xsd">
+  <publshInformation><Publish_Date>10/01/2026</Publish_Date><Record_Count>2</Record_Count></publshInformation>
+  <sdnEntry>
+    <uid>36</uid><lastName>AEROCARIBBEAN AIRLINES</lastName><sdnType>Entity</sdnType>
+    <programList><program>CUBA</program></programList>
+  </sdnEntry>
+  <sdnEntry>
+    <uid>173</uid><firstName>Ivan</firstName><lastName>Petrov</lastName><sdnType>Individual</sdnType>
+    <programList><program>RUSSIA-EO14024</program></programList>
+    <akaList><aka><uid>174</uid><type>a.k.a.</type><firstName>Ivan</firstName><lastName>Petrow</lastName></aka></akaList>
+  </sdnEntry>
+</sdnList>
+"""
+
+EU_EXPORT = f"""<?xml version="1.0" encoding="UTF-8"?>
+<export xmlns="{EU_NAMESPACE}" generationDate="2026-10-01T00:00:00">
+  <globalFileMetadata sourceLanguage="EN"/>
+  <sanctionEntity logicalId="13" designationDate="2014-03-17">
+    <regulation regulationType="regulation" programme="UKR" entryIntoForceDate="2014-03-17"/>
+    <subjectType code="person"/>
+    <nameAlias wholeName="Sergey Aksyonov" strong="true"/>
+    <nameAlias wholeName="Sergei Aksenov" strong="false"/>
+    <citizenship countryIso2Code="RU"/>
+  </sanctionEntity>
+  <sanctionEntity logicalId="14" designationDate="2014-03-17">
+    <regulation regulationType="regulation" programme="UKR" entryIntoForceDate="2014-03-17"/>
+    <nameAlias wholeName="Vladimir Konstantinov" strong="true"/>
+    <birthdate birthdate="1956-11-19"/>
+  </sanctionEntity>
+</export>
+""".encode()
+
+
+class ElementStreamTestCase(SimpleTestCase):
+    """Test ElementStream on list files fed in small chunks"""
+
+    CHUNK_SIZE = 16
+
+    def _stream(self, tag, document, parse):
+        """Feed document through an ElementStream, parsing the elements of each chunk"""
+        stream = ElementStream(tag)
+        yielded = []
+        entities = {}
+        for start in range(0, len(document), self.CHUNK_SIZE):
+            chunk = document[start:start + self.CHUNK_SIZE]
+            entities.update(parse(self._detached(stream, stream.feed(chunk), yielded)))
+        entities.update(parse(self._detached(stream, stream.close(), yielded)))
+
+        # Every element handed out was cleared once the next was requested
+        for elem in yielded:
+            self.assertEqual((len(elem), dict(elem.attrib)), (0, {}))
+        return entities, yielded
+
+    def _detached(self, stream, elems, yielded):
+        """Pass elems through, checking the records before each one left the tree"""
+        for elem in elems:
+            if xml_parsing.HAS_LXML:
+                root = elem.getroottree().getroot()
+            else:
+                root = stream._open_elems[0]
+            self.assertEqual(len(root.findall(elem.tag)), 1)
+            yielded.append(elem)
+            yield elem
+
+    def test_sdn_list(self):
+        """sdnEntry records stream out of an OFAC sdnList document"""
+        source = OFACScreeningSource()
+        entities, yielded = self._stream(
+            'sdnEntry', SDN_LIST, lambda elems: source._parse_sdn_xml(elems, 'consolidated')
+        )
+
+        self.assertEqual(len(yielded), 3)
+        self.assertEqual(list(entities), ['1001', '1002', '1003'])
+        self.assertEqual(entities['1001'].name, 'Vladimir Petrov')
+        self.assertEqual(entities['1001'].aliases, ['V. Petrov'])
+        self.assertEqual(entities['1002'].entity_type, 'Entity')
+        self.assertEqual(entities['1003'].programs, ['RUSSIA-EO14024', 'UKRAINE-EO13660'])
+
+    def test_namespaced_sdn_list(self):
+        """sdnEntry records are matched by local name in a namespaced sdnList"""
+        source = OFACScreeningSource()
+        entities, yielded = self._stream(
+            'sdnEntry', SDN_LIST_NAMESPACED, lambda elems: source._parse_sdn_xml(elems, 'consolidated')
+        )
+
+        self.assertEqual(len(yielded), 2)
+        self.assertEqual(list(entities), ['36', '173'])
+        self.assertEqual(entities['36'].name, 'AEROCARIBBEAN AIRLINES')
+        self.assertEqual(entities['36'].programs, ['CUBA'])
+        self.assertEqual(entities['173'].name, 'Ivan Petrov')
+        self.assertEqual(entities['173'].aliases, ['Ivan Petrow'])
+
+    def test_iter_xml_records(self):
+        """iter_xml_records yields every record named in tags, in document order"""
+        records = [
+            (elem.tag.rpartition('}')[2], elem.findtext('{http://tempuri.org/sdnList.xsd}uid'))
+            for elem in iter_xml_records(SDN_LIST_NAMESPACED, 'sdnEntry', 'publshInformation')
+        ]
+
+        self.assertEqual(records, [('publshInformation', None), ('sdnEntry', '36'), ('sdnEntry', '173')])
+
+    def test_namespaced_eu_export(self):
+        """Namespaced sanctionEntity records stream out of an EU export document"""
+        source = EUScreeningSource()
+        entities, yielded = self._stream(
+            'sanctionEntity', EU_EXPORT, source._parse_eu_xml
+        )
+
+        self.assertEqual(len(yielded), 2)
+        self.assertEqual(list(entities), ['13', '14'])
+        self.assertEqual(entities['13'].name, 'Sergey Aksyonov')
+        self.assertEqual(entities['13'].aliases, ['Sergei Aksenov'])
+        self.assertEqual(entities['13'].citizenships, ['RU'])
+        self.assertEqual(entities['14'].regulation_programme, 'UKR')
+        self.assertEqual(entities['14'].birth_dates, ['1956-11-19'])
+
+
+class ElementTreeStreamTestCase(ElementStreamTestCase):
+    """Test ElementStream on the standard library parser"""
+
+    def setUp(self):
+        for name, value in (('HAS_LXML', False), ('ET', xml.etree.ElementTree)):
+            patcher = patch.object(xml_parsing, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class InFlightSearchTestCase(SimpleTestCase):
+    """Test sharing of identical concurrent searches"""
+
+    def setUp(self):
+        self.manager = DataSourceManager()
+        self.calls = []
+
+    async def _search_source(self, source_name, source, query, threshold, normalized_query):
+        self.calls.append(query)
+        if len(self.calls) == 1:
+            # The first request hangs until its caller is cancelled
+            await asyncio.sleep(3600)
+        return SourceSearchResult(success=True, matches=[], processing_time=0, source=source_name)
+
+    def test_waiter_searches_again_when_owner_is_cancelled(self):
+        """Cancelling the search that owns the request does not cancel its waiters"""
+        self.manager._search_source = self._search_source
+
+        async def scenario():
+            search = self.manager._search_source_with_error_handling
+            owner = asyncio.create_task(search('ofac', None, 'Ivan Petrov', 80))
+            waiter = asyncio.create_task(search('ofac', None, 'Ivan Petrov', 80))
+            await asyncio.sleep(0)
+            owner.cancel()
+            return owner, await waiter
+
+        owner, result = asyncio.run(scenario())
+
+        self.assertTrue(owner.cancelled())
+        self.assertTrue(result.success)
+        self.assertEqual(self.calls, ['Ivan Petrov', 'Ivan Petrov'])
+
+    def test_cancelled_source_reported_as_failure(self):
+        """A source search ending in CancelledError fails alone, not the whole search"""
+        self.manager.sources = {'ofac': None, 'un': None}
+
+        async def search(source_name, source, query, threshold, normalized_query=None):
+            if source_name == 'ofac':
+                raise asyncio.CancelledError()
+            return SourceSearchResult(success=True, matches=[], processing_time=0, source=source_name)
+
+        self.manager._search_source_with_error_handling = search
+        results = asyncio.run(self.manager.search_all_sources('Ivan Petrov'))
+
+        self.assertFalse(results['ofac'].success)
+        self.assertEqual(results['ofac'].error, 'CancelledError')
+        self.assertTrue(results['un'].success)
+
+
+UN_LIST = """<?xml version="1.0" encoding="UTF-8"?>
+<CONSOLIDATED_LIST{xmlns} dateGenerated="2026-10-01T00:00:00Z">
+  <INDIVIDUALS>
+    <INDIVIDUAL>
+      <DATAID>6908555</DATAID><FIRST_NAME>RI</FIRST_NAME><SECOND_NAME>WON HO</SECOND_NAME>
+      <UN_LIST_TYPE>DPRK</UN_LIST_TYPE><REFERENCE_NUMBER>KPi.001</REFERENCE_NUMBER>
+      <INDIVIDUAL_ALIAS><QUALITY>Good</QUALITY><ALIAS_NAME>RI WONHO</ALIAS_NAME></INDIVIDUAL_ALIAS>
+    </INDIVIDUAL>
+  </INDIVIDUALS>
+  <ENTITIES>
+    <ENTITY>
+      <DATAID>110407</DATAID><FIRST_NAME>AL-RASHID TRUST</FIRST_NAME>
+      <UN_LIST_TYPE>Al-Qaida</UN_LIST_TYPE><REFERENCE_NUMBER>QDe.005</REFERENCE_NUMBER>
+    </ENTITY>
+  </ENTITIES>
+</CONSOLIDATED_LIST>
+"""
+
+
+class UNConsolidatedSourceTestCase(SimpleTestCase):
+    """Test parsing of the UN consolidated list download"""
+
+    def _rows(self, xmlns=''):
+        content = UN_LIST.format(xmlns=xmlns).encode()
+        return [
+            (name, entry['entity_id'], entry['entity_type'], entry['programs'], entry['reference_number'])
+            for name, entry in UNConsolidatedSource()._parse_list(content)
+        ]
+
+    def test_parse_list(self):
+        """Individuals and entities become name rows, aliases included"""
+        self.assertEqual(self._rows(), [
+            ('RI WON HO', '6908555', 'individual', ['DPRK'], 'KPi.001'),
+            ('RI WONHO', '6908555', 'individual', ['DPRK'], 'KPi.001'),
+            ('AL-RASHID TRUST', '110407', 'entity', ['Al-Qaida'], 'QDe.005'),
+        ])
+
+    def test_parse_namespaced_list(self):
+        """A namespaced document parses to the same rows"""
+        self.assertEqual(self._rows(' xmlns="https://scsanctions.un.org/resources/xml"'), self._rows())
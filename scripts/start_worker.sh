@@ -14,6 +14,6 @@ cd /app/backend && celery -A ceres_project worker \
     --max-tasks-per-child=1000 \
     --time-limit=600 \
     --soft-time-limit=300 \
-    --queues=default,screening,documents,risk,cases \
+    --queues=default,screening,ofac_q,un_q,eu_q,opensanctions_q,documents,risk,cases \
     --hostname=worker@%h
 